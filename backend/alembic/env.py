@@ -20,7 +20,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# The API's STARTUP_MODE=migrate runs this in-process and keeps its own logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     try:
         fileConfig(config.config_file_name)
     except Exception as e:
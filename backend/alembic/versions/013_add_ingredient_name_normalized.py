@@ -0,0 +1,52 @@
+"""add_ingredient_name_normalized
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 10:00:00.000000
+
+Añade `ingredients.name_normalized`: el nombre sin tildes, en minúsculas y con los
+espacios colapsados. Las búsquedas y las comprobaciones de duplicados pasan a ser
+búsquedas por igualdad/prefijo sobre esta columna indexada en lugar de ILIKE.
+
+El backfill se hace en Python con la misma función que usa el ORM
+(`normalize_ingredient_name`) para no depender de la extensión `unaccent`.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from src.domain.nutrition import normalize_ingredient_name
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingredients', sa.Column('name_normalized', sa.String(), nullable=True))
+
+    # Backfill de las filas existentes
+    conn = op.get_bind()
+    ingredients = sa.table(
+        'ingredients',
+        sa.column('id', sa.Uuid()),
+        sa.column('name', sa.String()),
+        sa.column('name_normalized', sa.String()),
+    )
+    rows = conn.execute(sa.select(ingredients.c.id, ingredients.c.name)).fetchall()
+    for row in rows:
+        conn.execute(
+            ingredients.update()
+            .where(ingredients.c.id == row.id)
+            .values(name_normalized=normalize_ingredient_name(row.name))
+        )
+
+    op.alter_column('ingredients', 'name_normalized', existing_type=sa.String(), nullable=False)
+    op.create_index(op.f('ix_ingredients_name_normalized'), 'ingredients', ['name_normalized'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ingredients_name_normalized'), table_name='ingredients')
+    op.drop_column('ingredients', 'name_normalized')
@@ -0,0 +1,39 @@
+"""history_keyset_indexes
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18 11:00:00.000000
+
+Índices compuestos (patient_id, timestamp DESC, id) para paginar por keyset el
+historial de comidas y de glucosa. Con OFFSET, las páginas profundas de un paciente
+con CGM (100k+ lecturas) se volvían linealmente más lentas.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_meals_log_patient_timestamp_id',
+        'meals_log',
+        ['patient_id', sa.text('timestamp DESC'), 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_glucose_measurements_patient_timestamp_id',
+        'glucose_measurements',
+        ['patient_id', sa.text('timestamp DESC'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_glucose_measurements_patient_timestamp_id', table_name='glucose_measurements')
+    op.drop_index('ix_meals_log_patient_timestamp_id', table_name='meals_log')
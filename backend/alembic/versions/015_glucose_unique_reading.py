@@ -0,0 +1,103 @@
+"""glucose_unique_reading
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18 12:00:00.000000
+
+Restricción única (patient_id, timestamp, measurement_type) en glucose_measurements.
+Es el objetivo del `INSERT ... ON CONFLICT DO NOTHING` de POST /glucose/bulk: reenviar
+un backfill del CGM no duplica lecturas. A partir de aquí, POST /glucose/ responde 409
+si ya hay una lectura del mismo tipo con ese timestamp.
+
+Antes de crearla se resuelven las claves repetidas; en cada grupo se conserva la
+fila de menor id:
+- las copias exactas (mismo valor y mismas notas, comparadas ya descifradas, porque
+  Fernet cifra igual texto con bytes distintos) se eliminan;
+- las que difieren en valor o notas no se pierden: pasan a
+  glucose_measurement_conflicts, con el id de la fila conservada, para revisarlas.
+El downgrade las devuelve a glucose_measurements.
+"""
+from itertools import groupby
+from typing import List, Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from src.infrastructure.db.types import _decrypt_value
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+measurements = sa.table(
+    'glucose_measurements',
+    sa.column('id', sa.Uuid()),
+    sa.column('patient_id', sa.Uuid()),
+    sa.column('glucose_value', sa.Integer()),
+    sa.column('timestamp', sa.DateTime()),
+    sa.column('measurement_type', sa.String()),
+    sa.column('notes', sa.LargeBinary()),
+)
+
+
+def _batches(items: List) -> List[List]:
+    return [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+
+
+def upgrade() -> None:
+    conflicts = op.create_table(
+        'glucose_measurement_conflicts',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('patient_id', sa.Uuid(), nullable=False),
+        sa.Column('glucose_value', sa.Integer(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('measurement_type', sa.String(length=20), nullable=False),
+        sa.Column('notes', sa.LargeBinary(), nullable=True),
+        sa.Column('kept_id', sa.Uuid(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_glucose_measurement_conflicts_patient_id', 'glucose_measurement_conflicts', ['patient_id'])
+
+    conn = op.get_bind()
+    m = measurements.c
+    key = (m.patient_id, m.timestamp, m.measurement_type)
+    repeated = sa.select(*key).group_by(*key).having(sa.func.count() > 1).subquery()
+    rows = conn.execute(
+        sa.select(measurements)
+        .join(repeated, sa.and_(*(column == repeated.c[column.name] for column in key)))
+        .order_by(*key, m.id)
+    ).fetchall()
+
+    duplicates, conflicting = [], []
+    for _, group in groupby(rows, key=lambda r: (r.patient_id, r.timestamp, r.measurement_type)):
+        kept, *others = group
+        kept_reading = (kept.glucose_value, _decrypt_value(kept.notes))
+        for row in others:
+            duplicates.append(row.id)
+            if (row.glucose_value, _decrypt_value(row.notes)) != kept_reading:
+                conflicting.append({**row._mapping, 'kept_id': kept.id})
+
+    for batch in _batches(conflicting):
+        conn.execute(conflicts.insert(), batch)
+    for batch in _batches(duplicates):
+        conn.execute(measurements.delete().where(m.id.in_(batch)))
+
+    op.create_unique_constraint(
+        'uq_glucose_patient_timestamp_type',
+        'glucose_measurements',
+        ['patient_id', 'timestamp', 'measurement_type'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_glucose_patient_timestamp_type', 'glucose_measurements', type_='unique')
+    columns = 'id, patient_id, glucose_value, timestamp, measurement_type, notes'
+    op.execute(
+        f"INSERT INTO glucose_measurements ({columns}) SELECT {columns} FROM glucose_measurement_conflicts"
+    )
+    op.drop_index('ix_glucose_measurement_conflicts_patient_id', table_name='glucose_measurement_conflicts')
+    op.drop_table('glucose_measurement_conflicts')
@@ -0,0 +1,44 @@
+"""user_xp_balance
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18 13:00:00.000000
+
+Saldo de XP materializado por usuario. GET /users/me/xp-summary pasa de un
+SUM(amount) sobre todo xp_transactions a una lectura por clave primaria;
+XPRepository.add_xp actualiza el saldo en la misma transacción que el ledger.
+
+El saldo inicial se calcula desde el ledger existente.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_xp_balance',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('total_xp', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO user_xp_balance (user_id, total_xp, updated_at)
+        SELECT user_id, SUM(amount), CURRENT_TIMESTAMP
+        FROM xp_transactions
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_xp_balance')
@@ -0,0 +1,37 @@
+"""key_rotation_checkpoints
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18 15:00:00.000000
+
+Progreso del trabajo de re-cifrado (scripts/reencrypt_phi.py) tras rotar
+ENCRYPTION_KEY: último id procesado por tabla y clave primaria, para poder
+reanudar tras una caída sin volver a recorrer las filas ya re-cifradas.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'key_rotation_checkpoints',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('key_id', sa.String(length=16), nullable=False),
+        sa.Column('last_id', sa.Uuid(), nullable=True),
+        sa.Column('rows_scanned', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_rotated', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name', 'key_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('key_rotation_checkpoints')
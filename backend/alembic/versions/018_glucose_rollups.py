@@ -0,0 +1,70 @@
+"""glucose_rollups
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18 17:00:00.000000
+
+Agregados por paciente y hora (glucose_hourly) y por paciente y día
+(glucose_daily): número de lecturas, suma, suma de cuadrados, mínimo, máximo
+y lecturas por banda de consenso (<54, 54-69, 70-180, 181-250, >250).
+GlucoseRepository los actualiza en la misma transacción que las lecturas;
+GET /glucose/stats y GET /glucose/trend los leen para ventanas de más de un día.
+
+La carga inicial se calcula desde glucose_measurements; para regenerarlos más
+adelante, scripts/rebuild_glucose_rollups.py.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '018'
+down_revision: Union[str, None] = '017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUPS = (
+    ('glucose_hourly', sa.DateTime(), "date_trunc('hour', timestamp)"),
+    ('glucose_daily', sa.Date(), "CAST(timestamp AS date)"),
+)
+
+
+def upgrade() -> None:
+    for table, bucket_type, bucket_sql in ROLLUPS:
+        op.create_table(
+            table,
+            sa.Column('patient_id', sa.Uuid(), nullable=False),
+            sa.Column('bucket', bucket_type, nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('total_squares', sa.BigInteger(), nullable=False),
+            sa.Column('minimum', sa.Integer(), nullable=False),
+            sa.Column('maximum', sa.Integer(), nullable=False),
+            sa.Column('very_low', sa.Integer(), nullable=False),
+            sa.Column('low', sa.Integer(), nullable=False),
+            sa.Column('in_range', sa.Integer(), nullable=False),
+            sa.Column('high', sa.Integer(), nullable=False),
+            sa.Column('very_high', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('patient_id', 'bucket'),
+        )
+        op.execute(
+            f"""
+            INSERT INTO {table} (patient_id, bucket, count, total, total_squares, minimum, maximum,
+                                 very_low, low, in_range, high, very_high)
+            SELECT patient_id, {bucket_sql}, COUNT(*), SUM(glucose_value),
+                   SUM(CAST(glucose_value AS bigint) * glucose_value), MIN(glucose_value), MAX(glucose_value),
+                   SUM(CASE WHEN glucose_value < 54 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN glucose_value >= 54 AND glucose_value < 70 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN glucose_value >= 70 AND glucose_value <= 180 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN glucose_value > 180 AND glucose_value <= 250 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN glucose_value > 250 THEN 1 ELSE 0 END)
+            FROM glucose_measurements
+            GROUP BY patient_id, {bucket_sql}
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('glucose_daily')
+    op.drop_table('glucose_hourly')
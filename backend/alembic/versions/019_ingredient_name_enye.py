@@ -0,0 +1,45 @@
+"""ingredient_name_enye
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19 09:00:00.000000
+
+`normalize_ingredient_name` conserva ahora la ñ ("Año" ya no colisiona con
+"Ano"): se recalcula `name_normalized` de los nombres que la contienen.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+from src.domain.nutrition import normalize_ingredient_name
+
+# revision identifiers, used by Alembic.
+revision: str = '019'
+down_revision: Union[str, None] = '018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    ingredients = sa.table(
+        'ingredients',
+        sa.column('id', sa.Uuid()),
+        sa.column('name', sa.String()),
+        sa.column('name_normalized', sa.String()),
+    )
+    rows = conn.execute(
+        sa.select(ingredients.c.id, ingredients.c.name)
+        .where(sa.or_(ingredients.c.name.contains('ñ'), ingredients.c.name.contains('Ñ')))
+    ).fetchall()
+    for row in rows:
+        conn.execute(
+            ingredients.update()
+            .where(ingredients.c.id == row.id)
+            .values(name_normalized=normalize_ingredient_name(row.name))
+        )
+
+
+def downgrade() -> None:
+    # La clave anterior (ñ -> n) se recalcula al volver a guardar cada ingrediente
+    pass
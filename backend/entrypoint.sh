@@ -9,10 +9,52 @@ if [ "$RESET_DB" = "true" ]; then
     python src/reset_db.py
 fi
 
-# Run migrations
+# Run migrations once, before any worker starts; the app then only verifies
+# the schema revision (STARTUP_MODE=verify)
 echo "Running database migrations..."
 alembic upgrade head
 
+# CPUs available to the container: the cgroup quota when one is set, else the host's
+cpu_limit() {
+    if [ -r /sys/fs/cgroup/cpu.max ]; then
+        read -r quota period < /sys/fs/cgroup/cpu.max
+        if [ "$quota" != "max" ]; then
+            echo $(( (quota + period - 1) / period ))
+            return
+        fi
+    fi
+    nproc
+}
+
+# Worker model (see README, "Servidor en produccion"):
+#   WEB_CONCURRENCY       worker processes (default: one per available CPU); each one can open
+#                         2 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) + 1 PostgreSQL connections
+#   MAX_REQUESTS          recycle a worker after N requests, 0 = never (needs WEB_CONCURRENCY > 1)
+#   MAX_REQUESTS_JITTER   random extra requests per worker so they do not all restart together
+#   GRACEFUL_TIMEOUT      seconds to finish in-flight requests on shutdown/recycle
+#   KEEP_ALIVE            idle keep-alive timeout in seconds
+#   UVICORN_LOOP          auto (uvloop when installed) | asyncio | uvloop
+#   UVICORN_HTTP          auto (httptools when installed) | h11 | httptools
+# Exported so the workers can check their settings against it (PUBSUB_BACKEND)
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-$(cpu_limit)}"
+MAX_REQUESTS="${MAX_REQUESTS:-10000}"
+MAX_REQUESTS_JITTER="${MAX_REQUESTS_JITTER:-1000}"
+GRACEFUL_TIMEOUT="${GRACEFUL_TIMEOUT:-30}"
+KEEP_ALIVE="${KEEP_ALIVE:-5}"
+
+set -- --host 0.0.0.0 --port 8000 \
+    --workers "$WEB_CONCURRENCY" \
+    --loop "${UVICORN_LOOP:-auto}" \
+    --http "${UVICORN_HTTP:-auto}" \
+    --timeout-graceful-shutdown "$GRACEFUL_TIMEOUT" \
+    --timeout-keep-alive "$KEEP_ALIVE"
+
+# With a single process there is no supervisor to replace a recycled worker:
+# the container itself would exit, so recycling is only enabled with workers
+if [ "$WEB_CONCURRENCY" -gt 1 ] && [ "$MAX_REQUESTS" -gt 0 ]; then
+    set -- "$@" --limit-max-requests "$MAX_REQUESTS" --limit-max-requests-jitter "$MAX_REQUESTS_JITTER"
+fi
+
 # Start application
-echo "Starting application..."
-exec uvicorn src.main:app --host 0.0.0.0 --port 8000
+echo "Starting application with $WEB_CONCURRENCY worker(s)..."
+exec uvicorn src.main:app "$@"
@@ -0,0 +1,106 @@
+"""
+Benchmark: 1k escenarios con POST /bolus/calculate-batch frente a 1k POST /bolus/calculate.
+
+Se ejecuta en proceso contra SQLite en memoria (mismo montaje que tests/conftest.py),
+así que mide el coste de la aplicación (validación, consultas, cálculo), no la red.
+
+Uso (desde backend/):
+    python scripts/bench_bolus_batch.py [--scenarios 1000] [--ingredients 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from src.main import app  # noqa: E402
+from src.infrastructure.db.database import Base, get_db  # noqa: E402
+from src.infrastructure.db.models import IngredientModel  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--ingredients", type=int, default=200)
+    parser.add_argument("--items-per-scenario", type=int, default=6)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    rng = random.Random(42)
+    with Session() as db:
+        ingredients = [
+            IngredientModel(
+                name=f"Alimento {i} {uuid4().hex[:6]}",
+                glycemic_index=rng.randint(0, 100),
+                carbs_per_100g=round(rng.uniform(0, 90), 1),
+                fiber_per_100g=0.0,
+            )
+            for i in range(args.ingredients)
+        ]
+        db.add_all(ingredients)
+        db.commit()
+        ids = [str(i.id) for i in ingredients]
+
+    scenarios = [
+        {
+            "current_glucose": rng.uniform(60, 300),
+            "target_glucose": 100.0,
+            "icr": rng.choice([8.0, 10.0, 12.0]),
+            "isf": rng.choice([30.0, 50.0]),
+            "ingredients": [
+                {"ingredient_id": rng.choice(ids), "weight_grams": rng.uniform(10, 300)}
+                for _ in range(args.items_per_scenario)
+            ],
+        }
+        for _ in range(args.scenarios)
+    ]
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @asynccontextmanager
+    async def no_lifespan(_app):
+        yield
+
+    app.router.lifespan_context = no_lifespan
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestClient(app) as client:
+        client.post("/api/v1/nutrition/bolus/calculate", json=scenarios[0])  # warm-up
+
+        t0 = time.perf_counter()
+        singles = [client.post("/api/v1/nutrition/bolus/calculate", json=s).json() for s in scenarios]
+        single_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = client.post("/api/v1/nutrition/bolus/calculate-batch", json={"scenarios": scenarios}).json()
+        batch_s = time.perf_counter() - t0
+
+    mismatches = sum(
+        1 for s, b in zip(singles, batch["results"])
+        if (s["total_carbs_grams"], s["recommended_bolus_units"]) != (b["total_carbs_grams"], b["recommended_bolus_units"])
+    )
+    print(f"scenarios={args.scenarios} items/scenario={args.items_per_scenario}")
+    print(f"single calls: {single_s:.3f}s ({args.scenarios / single_s:.0f} scenarios/s)")
+    print(f"batch call:   {batch_s:.3f}s ({args.scenarios / batch_s:.0f} scenarios/s)")
+    print(f"speed-up: x{single_s / batch_s:.1f}  rounding mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
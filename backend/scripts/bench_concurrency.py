@@ -0,0 +1,150 @@
+"""
+Concurrency benchmark: requests/second with 200 concurrent clients on the
+high-traffic read routes (glucose history, meal history, ingredient search).
+
+Starts the API with uvicorn on a temporary SQLite database, or on DATABASE_URL
+when set (e.g. a disposable PostgreSQL), seeds one patient with readings and
+meals, then runs closed-loop clients for a fixed duration. --workers, --loop and
+--http mirror the production launch settings of entrypoint.sh.
+
+Usage (from backend/):
+    python scripts/bench_concurrency.py [--clients 200] [--seconds 15] [--port 8766]
+                                        [--workers 1] [--loop auto] [--http auto]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+
+def _seed(database_url: str) -> tuple[str, str]:
+    """Create tables and one guardian/patient with data. Returns (user_id, patient_id)."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.infrastructure.db.database import Base
+    from src.infrastructure.db.models import (
+        GlucoseMeasurementModel, IngredientModel, MealLogModel, PatientModel, UserModel,
+    )
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    with sessionmaker(bind=engine)() as db:
+        user = UserModel(email=f"bench_{uuid4().hex}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        patient = PatientModel(guardian_id=user.id, display_name="Bench", role="DEPENDENT")
+        db.add(patient)
+        db.flush()
+        start = datetime(2026, 1, 1)
+        db.add_all(
+            GlucoseMeasurementModel(patient_id=patient.id, glucose_value=rng.randint(60, 250),
+                                    timestamp=start + timedelta(minutes=5 * i), measurement_type="CGM")
+            for i in range(5000)
+        )
+        db.add_all(
+            MealLogModel(patient_id=patient.id, timestamp=start + timedelta(hours=6 * i),
+                         total_carbs_grams=rng.uniform(10, 90), total_glycemic_load=rng.uniform(1, 30))
+            for i in range(500)
+        )
+        db.add_all(
+            IngredientModel(name=f"{w} {i}", glycemic_index=50, carbs_per_100g=20.0, fiber_per_100g=0.0)
+            for i, w in enumerate(["Pan", "Arroz", "Manzana", "Leche", "Pasta"] * 200)
+        )
+        db.commit()
+        ids = (str(user.id), str(patient.id))
+    engine.dispose()
+    return ids
+
+
+async def _client(http: httpx.AsyncClient, paths: list[str], deadline: float, latencies: list[float], errors: list[int]):
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        resp = await http.get(rng.choice(paths))
+        latencies.append(time.perf_counter() - t0)
+        if resp.status_code != 200:
+            errors[0] += 1
+
+
+async def _run(base_url: str, token: str, patient_id: str, clients: int, seconds: float) -> None:
+    paths = [
+        f"/api/v1/glucose/history?patient_id={patient_id}&limit=50",
+        f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20",
+        "/api/v1/nutrition/ingredients?q=man",
+    ]
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits,
+                                 headers={"Authorization": f"Bearer {token}"}) as http:
+        for path in paths:  # warm-up (catalog load, first connections)
+            (await http.get(path)).raise_for_status()
+        latencies, errors = [], [0]
+        t0 = time.perf_counter()
+        await asyncio.gather(*[
+            _client(http, paths, t0 + seconds, latencies, errors) for _ in range(clients)
+        ])
+        elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000  # noqa: E731
+    print(f"clients={clients} duration={elapsed:.1f}s requests={len(latencies)} errors={errors[0]}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency ms: p50={pct(50):.0f} p95={pct(95):.0f} p99={pct(99):.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--loop", default="auto", help="auto | asyncio | uvloop")
+    parser.add_argument("--http", default="auto", help="auto | h11 | httptools")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tmpdir.name}/bench.db")
+    env.setdefault("SECRET_KEY", "bench-secret")
+    env.setdefault("STARTUP_MODE", "none")  # _seed creates the schema
+    os.environ["SECRET_KEY"] = env["SECRET_KEY"]
+    user_id, patient_id = _seed(env["DATABASE_URL"])
+
+    from src.infrastructure.security.jwt_handler import create_access_token
+    token = create_access_token({"sub": user_id}, expires_delta=timedelta(hours=1))
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port), "--log-level", "warning",
+         "--backlog", "4096", "--workers", str(args.workers), "--loop", args.loop, "--http", args.http],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        print(f"workers={args.workers} loop={args.loop} http={args.http}")
+        asyncio.run(_run(base_url, token, patient_id, args.clients, args.seconds))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Microbenchmark: decrypting 10k EncryptedString notes.
+
+Compares the eager per-row path (TypeDecorator.process_result_value, one Fernet
+decrypt per row inside the result loop) with the bulk path used by the history
+repositories (ciphertext fetched raw, decrypted by page on first read, on the
+decrypt pool when the page is large), the case where notes are never read, and
+the projection used when a history request has no include=notes.
+
+Usage (from backend/):
+    python scripts/bench_decrypt_notes.py [--rows 10000] [--workers 4] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cryptography.fernet import Fernet  # noqa: E402
+
+os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from src.infrastructure.db import types  # noqa: E402
+from src.infrastructure.db.database import Base  # noqa: E402
+from src.infrastructure.db.models import GlucoseMeasurementModel, PatientModel, UserModel  # noqa: E402
+from src.infrastructure.repositories.glucose_repository import HISTORY_SUMMARY_COLUMNS  # noqa: E402
+
+
+def _best(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        user = UserModel(email=f"bench_{uuid4().hex}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        patient = PatientModel(guardian_id=user.id, display_name="Bench", role="DEPENDENT")
+        db.add(patient)
+        db.flush()
+        start = datetime(2026, 1, 1)
+        db.add_all(
+            GlucoseMeasurementModel(patient_id=patient.id, glucose_value=100, measurement_type="CGM",
+                                    timestamp=start + timedelta(minutes=5 * i),
+                                    notes=f"Nota del sensor {i}: calibración tras comida")
+            for i in range(args.rows)
+        )
+        db.commit()
+        patient_id = patient.id
+
+    base = select(GlucoseMeasurementModel).where(GlucoseMeasurementModel.patient_id == patient_id)
+    notes = GlucoseMeasurementModel.notes
+
+    def eager():
+        with Session() as db:
+            [m.notes for m in db.scalars(base)]
+
+    def bulk(read_notes: bool):
+        def run():
+            with Session() as db:
+                rows = db.execute(types.select_encrypted_lazily(base, notes)).all()
+                entities = types.attach_lazy_decryption(rows, notes)
+                if read_notes:
+                    [m.notes for m in entities]
+        return run
+
+    def projection():
+        with Session() as db:
+            db.execute(select(*HISTORY_SUMMARY_COLUMNS).where(GlucoseMeasurementModel.patient_id == patient_id)).all()
+
+    with Session() as db:
+        ciphertexts = [row[1] for row in db.execute(types.select_encrypted_lazily(base, notes))]
+
+    print(f"rows={args.rows} cpus={os.cpu_count()} (best of {args.repeat})")
+    print(f"decrypt only, serial:            {_best(lambda: [types._decrypt_value(c) for c in ciphertexts], args.repeat) * 1000:8.1f} ms")
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    types.get_decrypt_executor = lambda: pool
+    print(f"decrypt only, decrypt_many x{args.workers}:  {_best(lambda: types.decrypt_many(ciphertexts), args.repeat) * 1000:8.1f} ms")
+    print(f"ORM eager per-row:               {_best(eager, args.repeat) * 1000:8.1f} ms")
+    print(f"ORM bulk lazy, notes read:       {_best(bulk(True), args.repeat) * 1000:8.1f} ms")
+    print(f"ORM bulk lazy, notes not read:   {_best(bulk(False), args.repeat) * 1000:8.1f} ms")
+    print(f"projection without notes:        {_best(projection, args.repeat) * 1000:8.1f} ms")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
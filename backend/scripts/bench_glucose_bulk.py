@@ -0,0 +1,95 @@
+"""
+Throughput benchmark for glucose ingestion: one create_measurement per reading
+(what a CGM backfill costs today via POST /glucose/) against
+GlucoseRepository.bulk_create_measurements (POST /glucose/bulk).
+
+Runs against BENCH_DATABASE_URL when set (e.g. a disposable PostgreSQL), otherwise a
+temporary SQLite file. Tables are created with metadata.create_all.
+
+Usage (from backend/):
+    python scripts/bench_glucose_bulk.py [--rows 5000]
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python scripts/bench_glucose_bulk.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.domain.glucose_models import GlucoseCreateRequest, GlucoseType  # noqa: E402
+from src.infrastructure.db.database import Base  # noqa: E402
+from src.infrastructure.db.models import PatientModel, UserModel  # noqa: E402
+from src.infrastructure.repositories.glucose_repository import GlucoseRepository  # noqa: E402
+
+
+def _readings(n: int, start: datetime) -> list[GlucoseCreateRequest]:
+    return [
+        GlucoseCreateRequest(value=80 + (i % 150), timestamp=start + timedelta(minutes=5 * i), measurement_type=GlucoseType.CGM)
+        for i in range(n)
+    ]
+
+
+def _new_patient(Session) -> UUID:
+    with Session() as db:
+        user = UserModel(email=f"bench_{uuid4().hex}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        patient = PatientModel(guardian_id=user.id, display_name="Bench", role="DEPENDENT")
+        db.add(patient)
+        db.commit()
+        return patient.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    tmpdir = None
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{tmpdir.name}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    readings = _readings(args.rows, datetime(2026, 1, 1))
+
+    patient_id = _new_patient(Session)
+    with Session() as db:
+        repo = GlucoseRepository(db)
+        t0 = time.perf_counter()
+        for reading in readings:
+            repo.create_measurement(patient_id, reading)
+        single_s = time.perf_counter() - t0
+
+    patient_id = _new_patient(Session)
+    with Session() as db:
+        repo = GlucoseRepository(db)
+        t0 = time.perf_counter()
+        inserted = repo.bulk_create_measurements(patient_id, readings)
+        bulk_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        again = repo.bulk_create_measurements(patient_id, readings)
+        replay_s = time.perf_counter() - t0
+
+    print(f"backend={engine.dialect.name} rows={args.rows}")
+    print(f"per-row create:  {single_s:.2f}s  {args.rows / single_s:,.0f} rows/s")
+    print(f"bulk insert:     {bulk_s:.2f}s  {inserted / bulk_s:,.0f} rows/s (inserted={inserted})")
+    print(f"bulk replay:     {replay_s:.2f}s  {args.rows / replay_s:,.0f} rows/s (inserted={again}, all duplicates)")
+
+    engine.dispose()
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Live glucose stream benchmark: server memory per idle GET /glucose/stream
+connection, and the time for one POST /glucose/ to reach every subscriber.
+
+Starts the API with uvicorn (one worker) on a temporary SQLite database, opens
+--connections SSE streams on the same patient with raw sockets, and reads the
+server's resident memory (VmRSS, Linux only) before and after.
+
+Usage (from backend/):
+    python scripts/bench_glucose_stream.py [--connections 2000] [--port 8767]
+                                           [--loop auto] [--http auto]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import httpx
+
+from bench_concurrency import BACKEND_DIR, _seed
+
+
+def _rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+async def _open_stream(port: int, patient_id: str, token: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET /api/v1/glucose/stream?patient_id={patient_id} HTTP/1.1\r\n"
+        f"Host: localhost\r\nAuthorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    await reader.readuntil(b"retry:")  # headers and the first frame
+    return reader, writer
+
+
+async def _wait_for_measurement(reader: asyncio.StreamReader) -> float:
+    await reader.readuntil(b"event: measurement")
+    return time.perf_counter()
+
+
+async def _run(port: int, pid: int, token: str, patient_id: str, connections: int) -> None:
+    base_url = f"http://127.0.0.1:{port}"
+    headers = {"Authorization": f"Bearer {token}"}
+    # Warm-up: first stream (imports, route compilation) opened and closed
+    _, writer = await _open_stream(port, patient_id, token)
+    writer.close()
+    await asyncio.sleep(0.5)
+    rss_before = _rss_kb(pid)
+
+    streams = []
+    for i in range(0, connections, 200):
+        streams += await asyncio.gather(*[
+            _open_stream(port, patient_id, token) for _ in range(min(200, connections - i))
+        ])
+    await asyncio.sleep(1)
+    rss_after = _rss_kb(pid)
+    per_conn = (rss_after - rss_before) * 1024 / connections
+    print(f"connections={connections} server RSS: {rss_before / 1024:.1f} MB -> {rss_after / 1024:.1f} MB")
+    print(f"memory per idle connection: {per_conn / 1024:.1f} KB")
+
+    waiters = [asyncio.ensure_future(_wait_for_measurement(reader)) for reader, _ in streams]
+    async with httpx.AsyncClient(base_url=base_url, headers=headers) as http:
+        t0 = time.perf_counter()
+        resp = await http.post(f"/api/v1/glucose/?patient_id={patient_id}",
+                               json={"value": 120, "measurement_type": "CGM"})
+        resp.raise_for_status()
+        arrivals = sorted(t - t0 for t in await asyncio.gather(*waiters))
+    print(f"fan-out ms (POST sent -> frame read): p50={statistics.median(arrivals) * 1000:.0f} "
+          f"p99={arrivals[int(0.99 * (len(arrivals) - 1))] * 1000:.0f} max={arrivals[-1] * 1000:.0f}")
+
+    for _, writer in streams:
+        writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--loop", default="auto", help="auto | asyncio | uvloop")
+    parser.add_argument("--http", default="auto", help="auto | h11 | httptools")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tmpdir.name}/bench.db")
+    env.setdefault("SECRET_KEY", "bench-secret")
+    env.setdefault("STARTUP_MODE", "none")  # _seed creates the schema
+    os.environ["SECRET_KEY"] = env["SECRET_KEY"]
+    user_id, patient_id = _seed(env["DATABASE_URL"])
+
+    from src.infrastructure.security.jwt_handler import create_access_token
+    token = create_access_token({"sub": user_id}, expires_delta=timedelta(hours=1))
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port), "--log-level", "warning",
+         "--backlog", "4096", "--loop", args.loop, "--http", args.http],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{args.port}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        print(f"loop={args.loop} http={args.http}")
+        asyncio.run(_run(args.port, server.pid, token, patient_id, args.connections))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark del catálogo de ingredientes en memoria.
+
+Construye un índice sintético de N ingredientes (por defecto 100k) y mide la latencia
+de búsqueda por pulsación, como la que genera el autocompletado de Flutter.
+
+Uso (desde backend/):
+    python scripts/bench_ingredient_search.py [--items 100000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.cache.ingredient_catalog import CatalogIngredient, _CatalogIndex  # noqa: E402
+
+_WORDS = [
+    "arroz", "pan", "pasta", "patata", "manzana", "plátano", "leche", "yogur", "queso", "pollo",
+    "ternera", "atún", "lentejas", "garbanzos", "avena", "maíz", "naranja", "fresa", "zumo",
+    "galleta", "chocolate", "integral", "blanco", "cocido", "frito", "asado", "natural", "light",
+    "desnatado", "centeno", "trigo", "quinoa", "cuscús", "tomate", "cebolla", "pimiento", "salsa",
+]
+
+
+def _synthetic_catalog(n: int, seed: int = 42) -> list[CatalogIngredient]:
+    rng = random.Random(seed)
+    return [
+        CatalogIngredient(
+            id=uuid4(),
+            name=" ".join(rng.sample(_WORDS, rng.randint(2, 4))) + f" {i}",
+            glycemic_index=rng.randint(0, 100),
+            carbs_per_100g=round(rng.uniform(0, 90), 1),
+            fiber_per_100g=round(rng.uniform(0, 10), 1),
+        )
+        for i in range(n)
+    ]
+
+
+def _keystrokes(rng: random.Random, n: int) -> list[str]:
+    queries = []
+    while len(queries) < n:
+        word = rng.choice(_WORDS)
+        # Prefijos crecientes, como el texto que llega en cada pulsación
+        queries.extend(word[:k] for k in range(2, len(word) + 1))
+    return queries[:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    items = _synthetic_catalog(args.items)
+    t0 = time.perf_counter()
+    index = _CatalogIndex(items, loaded_at=time.monotonic())
+    build_s = time.perf_counter() - t0
+
+    queries = _keystrokes(random.Random(7), args.queries)
+    timings = []
+    for q in queries:
+        t = time.perf_counter()
+        index.search(q, args.limit)
+        timings.append((time.perf_counter() - t) * 1000)
+
+    timings.sort()
+
+    print(f"items={args.items} build={build_s:.2f}s postings={len(index.postings)}")
+    print(f"queries={len(queries)} p50={statistics.median(timings):.3f}ms "
+          f"p95={timings[int(len(timings) * 0.95)]:.3f}ms p99={timings[int(len(timings) * 0.99)]:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Throughput benchmark for POST /nutrition/meals (meal + items + 10 XP award).
+
+Goes through the HTTP layer only, so the same script measures any revision of the
+endpoint. Runs against BENCH_DATABASE_URL when set (e.g. a disposable PostgreSQL),
+otherwise a temporary SQLite file, so commits pay a real fsync.
+
+Usage (from backend/):
+    python scripts/bench_meal_logging.py [--meals 1000] [--items-per-meal 4]
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python scripts/bench_meal_logging.py
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.main import app  # noqa: E402
+from src.infrastructure.api.dependencies import get_current_user_id  # noqa: E402
+from src.infrastructure.db.database import Base, get_async_db, get_db, to_async_url  # noqa: E402
+from src.infrastructure.db.models import IngredientModel, PatientModel, UserModel  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meals", type=int, default=1000)
+    parser.add_argument("--items-per-meal", type=int, default=4)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    tmpdir = None
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{tmpdir.name}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    # POST /nutrition/meals runs on the async stack; same database, asyncio driver
+    async_engine = create_async_engine(to_async_url(url))
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    rng = random.Random(42)
+    with Session() as db:
+        user = UserModel(email=f"bench_{uuid4().hex}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        patient = PatientModel(guardian_id=user.id, display_name="Bench", role="DEPENDENT")
+        ingredients = [
+            IngredientModel(name=f"Bench {uuid4().hex}", glycemic_index=rng.randint(0, 100),
+                            carbs_per_100g=round(rng.uniform(0, 90), 1), fiber_per_100g=0.0)
+            for _ in range(50)
+        ]
+        db.add(patient)
+        db.add_all(ingredients)
+        db.commit()
+        user_id, patient_id = str(user.id), str(patient.id)
+        ingredient_ids = [str(i.id) for i in ingredients]
+
+    payloads = [
+        {
+            "patient_id": patient_id,
+            "ingredients": [
+                {"ingredient_id": rng.choice(ingredient_ids), "weight_grams": rng.uniform(10, 300)}
+                for _ in range(args.items_per_meal)
+            ],
+            "notes": "Bench",
+        }
+        for _ in range(args.meals)
+    ]
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    @asynccontextmanager
+    async def no_lifespan(_app):
+        yield
+
+    app.router.lifespan_context = no_lifespan
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user_id] = lambda: user_id
+
+    stats = {"statements": 0, "commits": 0}
+    for counted in (engine, async_engine.sync_engine):
+        event.listen(counted, "before_cursor_execute", lambda *a, **k: stats.__setitem__("statements", stats["statements"] + 1))
+        event.listen(counted, "commit", lambda *a: stats.__setitem__("commits", stats["commits"] + 1))
+
+    with TestClient(app) as client:
+        client.post("/api/v1/nutrition/meals", json=payloads[0])  # warm-up
+        stats.update(statements=0, commits=0)
+
+        t0 = time.perf_counter()
+        for payload in payloads:
+            resp = client.post("/api/v1/nutrition/meals", json=payload)
+            assert resp.status_code == 200, resp.text
+        elapsed = time.perf_counter() - t0
+        client.portal.call(async_engine.dispose)
+
+    print(f"backend={engine.dialect.name} meals={args.meals} items/meal={args.items_per_meal}")
+    print(f"{args.meals / elapsed:,.0f} meals/s  ({elapsed * 1000 / args.meals:.2f} ms/meal)")
+    print(f"statements/meal={stats['statements'] / args.meals:.1f}  commits/meal={stats['commits'] / args.meals:.1f}")
+
+    engine.dispose()
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Overhead of the /metrics instrumentation (MetricsMiddleware + SQL cursor events).
+
+Runs the routes of bench_concurrency.py (glucose history, meal history,
+ingredient search) in-process through the ASGI app, alternating rounds with
+metrics enabled and disabled so that drift (CPU frequency, caches, other load)
+affects both sides equally, and reports the median time per request of each.
+
+Usage (from backend/):
+    python scripts/bench_metrics_overhead.py [--rounds 30] [--requests 90]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import httpx
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(SCRIPTS_DIR, "..")))
+sys.path.append(SCRIPTS_DIR)
+
+
+async def _round(http: httpx.AsyncClient, paths: list[str], requests: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(requests):
+        (await http.get(paths[i % len(paths)])).raise_for_status()
+    return (time.perf_counter() - t0) / requests
+
+
+async def _run(token: str, patient_id: str, rounds: int, requests: int) -> None:
+    from src.infrastructure.api.metrics import get_request_metrics
+    from src.main import app
+
+    metrics = get_request_metrics()
+    paths = [
+        f"/api/v1/glucose/history?patient_id={patient_id}&limit=50",
+        f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20",
+        "/api/v1/nutrition/ingredients?q=man",
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Authorization": f"Bearer {token}"}) as http:
+        await _round(http, paths, requests)  # warm-up: catalog, connections, caches
+        timings = {True: [], False: []}
+        for i in range(rounds):
+            for enabled in ((True, False) if i % 2 else (False, True)):
+                metrics.enabled = enabled
+                timings[enabled].append(await _round(http, paths, requests))
+        metrics.enabled = True
+
+    off, on = statistics.median(timings[False]), statistics.median(timings[True])
+    print(f"rounds={rounds} requests/round={requests}")
+    print(f"metrics off: {off * 1e6:8.0f} us/request")
+    print(f"metrics on:  {on * 1e6:8.0f} us/request")
+    print(f"overhead:    {(on - off) / off * 100:+7.2f} %  ({(on - off) * 1e6:+.0f} us/request)")
+    print(f"statements/request: {metrics.db_statements / max(1, sum(metrics.responses.values())):.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=90)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmpdir.name}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("STARTUP_MODE", "none")
+
+    from bench_concurrency import _seed
+    from src.infrastructure.security.jwt_handler import create_access_token
+
+    user_id, patient_id = _seed(os.environ["DATABASE_URL"])
+    token = create_access_token({"sub": user_id}, expires_delta=timedelta(hours=1))
+    try:
+        asyncio.run(_run(token, patient_id, args.rounds, args.requests))
+    finally:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
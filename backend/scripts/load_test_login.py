@@ -0,0 +1,112 @@
+"""
+Load test: /health latency while 50 clients hammer POST /auth/login.
+
+Starts the API with uvicorn on a temporary SQLite database (or DATABASE_URL when
+set), registers one user, then measures /health at a fixed rate twice: idle, and
+during the login spike. A healthy server keeps /health p99 flat because bcrypt
+runs on its own bounded pool instead of the shared request threadpool.
+
+Usage (from backend/):
+    python scripts/load_test_login.py [--logins 50] [--seconds 10] [--port 8765]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+EMAIL, PASSWORD = "loadtest@example.com", "loadtest-pass-1"
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def _probe_health(client: httpx.AsyncClient, seconds: float, rate_hz: float) -> list[float]:
+    samples, deadline = [], time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        resp = await client.get("/health")
+        resp.raise_for_status()
+        samples.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(max(0.0, 1 / rate_hz - (time.perf_counter() - t0)))
+    return samples
+
+
+async def _login_loop(client: httpx.AsyncClient, stop: asyncio.Event, done: list[int]) -> None:
+    while not stop.is_set():
+        resp = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+        resp.raise_for_status()
+        done[0] += 1
+
+
+async def _run(base_url: str, logins: int, seconds: float) -> None:
+    limits = httpx.Limits(max_connections=logins + 5)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        api = httpx.AsyncClient(base_url=f"{base_url}/api/v1", timeout=60, limits=limits)
+        resp = await api.post("/users/register", json={
+            "email": EMAIL, "password": PASSWORD, "full_name": "Load Test",
+            "health_profile": {"diabetes_type": "T1", "insulin_sensitivity": 50, "carb_ratio": 10, "target_glucose": 100},
+        })
+        assert resp.status_code in (201, 409), resp.text
+
+        idle = await _probe_health(client, seconds / 2, rate_hz=20)
+
+        stop, done = asyncio.Event(), [0]
+        workers = [asyncio.create_task(_login_loop(api, stop, done)) for _ in range(logins)]
+        t0 = time.perf_counter()
+        spike = await _probe_health(client, seconds, rate_hz=20)
+        stop.set()
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - t0
+        resp = await client.get("/health/password-pool")
+        pool = resp.json() if resp.status_code == 200 else None
+        await api.aclose()
+
+    print(f"{'':14}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for label, samples in (("/health idle", idle), ("/health spike", spike)):
+        print(f"{label:14}{statistics.median(samples):9.1f}{_pct(samples, 99):9.1f}{max(samples):9.1f}")
+    print(f"logins: {done[0]} in {elapsed:.1f}s ({done[0] / elapsed:.1f}/s) with {logins} concurrent clients")
+    if pool:
+        print(f"password pool after spike: {pool}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tmpdir.name}/loadtest.db")
+    env.setdefault("STARTUP_MODE", "migrate")  # fresh database: let the app create the schema
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        asyncio.run(_run(base_url, args.logins, args.seconds))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
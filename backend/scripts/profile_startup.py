@@ -0,0 +1,142 @@
+"""
+Cold-start profile of the API: import time, time to first /health, resident memory.
+
+1. Import time of `src.main` in a fresh interpreter, with a per-module breakdown
+   parsed from `python -X importtime` (self and cumulative time).
+2. Time from spawning `uvicorn src.main:app` to the first successful GET /health
+   (imports + lifespan + socket bind), and the server's RSS at that point.
+
+Each measurement is repeated and the median is reported. Uses a temporary SQLite
+database with STARTUP_MODE=migrate unless DATABASE_URL/STARTUP_MODE are set.
+
+Usage (from backend/):
+    python scripts/profile_startup.py [--runs 5] [--top 25] [--port 8767]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _env(tmpdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tmpdir}/startup.db")
+    env.setdefault("STARTUP_MODE", "migrate")
+    env.setdefault("SECRET_KEY", "profile-secret")
+    env.setdefault("ENCRYPTION_KEY", "TXlTdXBlclNlY3JldEtleTMyYnl0ZXM9PT09PT09PT0=")
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for each line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, module = line.split("|", 2)
+        self_us = int(self_part.split(":")[1])
+        cumulative_us = int(cumulative_part)
+        depth = (len(module) - len(module.lstrip())) // 2
+        rows.append((module.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def measure_imports(env: Dict[str, str], runs: int) -> Tuple[float, Dict[str, int], Dict[str, int]]:
+    """Median wall import time (s), median cumulative us per module, median self us per top-level package."""
+    walls, cumulative, packages = [], defaultdict(list), defaultdict(list)
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import src.main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        walls.append(time.perf_counter() - t0)
+        per_package = defaultdict(int)
+        for module, self_us, cum_us, _ in parse_importtime(proc.stderr):
+            cumulative[module].append(cum_us)
+            top = module.split(".")[0] if not module.startswith("src.") else ".".join(module.split(".")[:4])
+            per_package[top] += self_us
+        for top, us in per_package.items():
+            packages[top].append(us)
+    return (
+        statistics.median(walls),
+        {m: int(statistics.median(v)) for m, v in cumulative.items()},
+        {p: int(statistics.median(v)) for p, v in packages.items()},
+    )
+
+
+def _rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def measure_first_health(env: Dict[str, str], port: int, runs: int) -> Tuple[float, float]:
+    """Median seconds from spawn to first 200 on /health, and median RSS (MB) at that point."""
+    url = f"http://127.0.0.1:{port}/health"
+    times, rss = [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        try:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                try:
+                    if httpx.get(url, timeout=1).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            times.append(time.perf_counter() - t0)
+            rss.append(_rss_mb(server.pid))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    return statistics.median(times), statistics.median(rss)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = _env(tmpdir)
+        wall, cumulative, packages = measure_imports(env, args.runs)
+        first_health, rss = measure_first_health(env, args.port, args.runs)
+
+    print(f"import src.main (fresh interpreter, wall): {wall * 1000:7.0f} ms")
+    print(f"spawn -> first /health 200:               {first_health * 1000:7.0f} ms")
+    print(f"RSS after startup:                        {rss:7.1f} MB")
+
+    print(f"\nSelf time by package (src.* by module), top {args.top}:")
+    for name, us in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    print(f"\nCumulative time of modules imported by src.*, top {args.top}:")
+    src_children = {m: us for m, us in cumulative.items() if m.startswith("src.") or m in packages}
+    for name, us in sorted(src_children.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
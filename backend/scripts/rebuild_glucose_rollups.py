@@ -0,0 +1,41 @@
+"""
+Regenerate glucose_hourly and glucose_daily from glucose_measurements.
+
+Usage (from backend/, with DATABASE_URL set):
+    python scripts/rebuild_glucose_rollups.py                  # every patient
+    python scripts/rebuild_glucose_rollups.py --patient-id ID  # one patient
+
+Runs in one transaction per call: readers see the old rollups until the commit.
+"""
+import argparse
+import os
+import sys
+import time
+from uuid import UUID
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.db.database import SessionLocal  # noqa: E402
+from src.infrastructure.repositories.glucose_repository import GlucoseRepository  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patient-id", type=UUID, help="Rebuild only this patient's buckets")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        GlucoseRepository(db).rebuild_rollups(args.patient_id)
+        elapsed = time.perf_counter() - t0
+    finally:
+        db.close()
+
+    scope = f"patient {args.patient_id}" if args.patient_id else "all patients"
+    print(f"✅ Glucose rollups rebuilt for {scope} in {elapsed:.2f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Rebuild user_xp_balance from the xp_transactions ledger and report drift.
+
+Usage (from backend/, with DATABASE_URL set):
+    python scripts/reconcile_xp_balances.py            # report and fix
+    python scripts/reconcile_xp_balances.py --dry-run  # report only
+
+Exit code is 1 when drift was found, so it can run as a scheduled check.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.db.database import SessionLocal  # noqa: E402
+from src.infrastructure.db.xp_repository import XPRepository  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without fixing it")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drifts = XPRepository(db).reconcile_balances(fix=not args.dry_run)
+    finally:
+        db.close()
+
+    if not drifts:
+        print("✅ XP balances match the ledger.")
+        return 0
+
+    for d in sorted(drifts, key=lambda d: abs(d.drift), reverse=True):
+        stored = "missing" if d.stored_total is None else d.stored_total
+        print(f"⚠️  user={d.user_id} stored={stored} ledger={d.ledger_total} drift={d.drift:+d}")
+    action = "reported" if args.dry_run else "fixed"
+    print(f"{len(drifts)} balance(s) {action}.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Re-encrypt PHI columns under the primary ENCRYPTION_KEY after a key rotation.
+
+Run with the new key in ENCRYPTION_KEY and the previous one(s) in
+ENCRYPTION_KEYS_RETIRED, while the API keeps serving traffic. Safe to stop and
+re-run: progress is checkpointed per chunk and the job resumes where it left off.
+
+Usage (from backend/, with DATABASE_URL set):
+    python scripts/reencrypt_phi.py [--chunk-size 500] [--max-rows-per-second 2000]
+                                    [--table meals_log --table glucose_measurements]
+
+Exit code is 1 when some values could not be decrypted with any configured key.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.db.database import SessionLocal  # noqa: E402
+from src.infrastructure.security.key_rotation import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    ReencryptionJob,
+    ReencryptionProgress,
+)
+
+
+def _report(p: ReencryptionProgress) -> None:
+    status = "done" if p.done else f"{p.rows_remaining} remaining"
+    print(
+        f"{p.table}: scanned={p.rows_scanned} rotated={p.rows_rotated} "
+        f"unreadable={p.rows_unreadable} skipped={p.rows_skipped} {p.rows_per_second:,.0f} rows/s, {status}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-rows-per-second", type=float, default=None,
+                        help="Throttle to limit the load on the primary database")
+    parser.add_argument("--table", action="append", dest="tables",
+                        help="Only these tables (repeatable); default: every table with encrypted columns")
+    args = parser.parse_args()
+
+    job = ReencryptionJob(
+        SessionLocal,
+        chunk_size=args.chunk_size,
+        max_rows_per_second=args.max_rows_per_second,
+        on_progress=_report,
+    )
+    print(f"Re-encrypting under primary key {job.crypto.primary_key_id}")
+    results = job.run(args.tables)
+
+    unreadable = sum(p.rows_unreadable for p in results)
+    if unreadable:
+        print(f"⚠️  {unreadable} value(s) could not be decrypted with any configured key and were left as is.")
+        return 1
+    print("✅ All encrypted values are under the primary key.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
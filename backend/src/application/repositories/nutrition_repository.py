@@ -1,10 +1,61 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import Row, Select, and_, or_, select
 
+from src.domain.nutrition import normalize_ingredient_name
 from src.infrastructure.db.models import IngredientModel, MealLogModel, MealItemModel
+from src.infrastructure.db.types import attach_lazy_decryption, select_encrypted_lazily
+from src.infrastructure.cache.ingredient_catalog import (
+    CatalogIngredient,
+    IngredientCatalog,
+    get_ingredient_catalog,
+)
+
+
+# Proyección del historial sin la columna cifrada `notes`: las páginas que no
+# devuelven notas no las leen de BD ni las descifran.
+MEAL_HISTORY_SUMMARY_COLUMNS = (
+    MealLogModel.id,
+    MealLogModel.patient_id,
+    MealLogModel.timestamp,
+    MealLogModel.total_carbs_grams,
+    MealLogModel.total_glycemic_load,
+    MealLogModel.bolus_units_administered,
+)
+
+
+def _meal_history_stmt(
+    patient_id: UUID,
+    limit: int,
+    offset: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    after: Optional[Tuple[datetime, UUID]],
+    include_notes: bool = True,
+) -> Select:
+    if include_notes:
+        stmt = select_encrypted_lazily(select(MealLogModel), MealLogModel.notes)
+    else:
+        stmt = select(*MEAL_HISTORY_SUMMARY_COLUMNS)
+    stmt = stmt.where(MealLogModel.patient_id == patient_id)
+    if start_date is not None:
+        stmt = stmt.where(MealLogModel.timestamp >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(MealLogModel.timestamp <= end_date)
+    stmt = stmt.order_by(MealLogModel.timestamp.desc(), MealLogModel.id)
+    if after is not None:
+        after_ts, after_id = after
+        stmt = stmt.where(or_(
+            MealLogModel.timestamp < after_ts,
+            and_(MealLogModel.timestamp == after_ts, MealLogModel.id > after_id),
+        ))
+    else:
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit)
+
 
 class NutritionRepository:
     """
@@ -12,30 +63,52 @@ class NutritionRepository:
     para la persistencia y lectura de ingredientes y comidas.
     Se comunica exclusivamente con la abstracción SQLAlchemy.
     """
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, catalog: Optional[IngredientCatalog] = None):
         self.db = db
+        self.catalog = catalog or get_ingredient_catalog()
 
-    def search_ingredients(self, query: str, limit: int = 20) -> List[IngredientModel]:
-        """Busca alimentos por coincidencias parciales en el nombre."""
-        return self.db.query(IngredientModel).filter(
-            IngredientModel.name.ilike(f"%{query}%")
-        ).limit(limit).all()
+    def search_ingredients(self, query: str, limit: int = 20) -> List[CatalogIngredient]:
+        """
+        Busca alimentos por coincidencias parciales en el nombre.
+        Se resuelve contra el catálogo en memoria (índice de trigramas): prefijos
+        primero, después por similitud. Sólo consulta BD si el catálogo está frío.
+        """
+        return self.catalog.search(self.db, query, limit=limit)
 
     def get_ingredient_by_id(self, it_id: UUID) -> Optional[IngredientModel]:
         """Obtiene un ingrediente exacto."""
         return self.db.query(IngredientModel).filter(IngredientModel.id == it_id).first()
 
-    def log_meal(self, meal: MealLogModel) -> MealLogModel:
-        """Persiste un registro de comida junto con sus items."""
+    def get_ingredients_by_ids(self, ids: Iterable[UUID]) -> Dict[UUID, IngredientModel]:
+        """
+        Resuelve varios ingredientes en una única consulta IN.
+        Devuelve {id: ingrediente}; los ids inexistentes no aparecen en el dict.
+        """
+        unique_ids = set(ids)
+        if not unique_ids:
+            return {}
+        rows = self.db.query(IngredientModel).filter(IngredientModel.id.in_(unique_ids)).all()
+        return {row.id: row for row in rows}
+
+    def log_meal(self, meal: MealLogModel, commit: bool = True) -> MealLogModel:
+        """
+        Persiste un registro de comida junto con sus items.
+        Con commit=False sólo lo añade a la sesión: el llamante lo confirma junto
+        con el resto de la unidad de trabajo (p. ej. el XP otorgado).
+        """
         self.db.add(meal)
-        self.db.commit()
-        self.db.refresh(meal)
+        if commit:
+            self.db.commit()
+            self.db.refresh(meal)
         return meal
 
     def create_ingredient(self, name: str, glycemic_index: int, carbs_per_100g: float, fiber_per_100g: float = 0.0) -> IngredientModel:
-        """Crea un nuevo ingrediente. Lanza ValueError si el nombre ya existe."""
-        existing = self.db.query(IngredientModel).filter(
-            IngredientModel.name.ilike(name)
+        """
+        Crea un nuevo ingrediente. Lanza ValueError si el nombre ya existe
+        (ignorando tildes y mayúsculas: "platano" duplica a "Plátano").
+        """
+        existing = self.db.query(IngredientModel.id).filter(
+            IngredientModel.name_normalized == normalize_ingredient_name(name)
         ).first()
         if existing:
             raise ValueError(f"El ingrediente '{name}' ya existe")
@@ -47,20 +120,30 @@ class NutritionRepository:
         )
         self.db.add(ingredient)
         self.db.commit()
+        self.catalog.invalidate()
         self.db.refresh(ingredient)
         return ingredient
 
     def bulk_create_ingredients(self, items: list[dict]) -> int:
         """Inserta ingredientes que no existan aún. Devuelve el número insertado."""
+        keys = {normalize_ingredient_name(item["name"]) for item in items}
+        # Una sola consulta IN sobre la clave indexada en vez de un ILIKE por ingrediente
+        seen = {
+            row.name_normalized
+            for row in self.db.query(IngredientModel.name_normalized).filter(
+                IngredientModel.name_normalized.in_(keys)
+            )
+        }
         inserted = 0
         for item in items:
-            exists = self.db.query(IngredientModel).filter(
-                IngredientModel.name.ilike(item["name"])
-            ).first()
-            if not exists:
+            key = normalize_ingredient_name(item["name"])
+            if key not in seen:
+                seen.add(key)
                 self.db.add(IngredientModel(**item))
                 inserted += 1
         self.db.commit()
+        if inserted:
+            self.catalog.invalidate()
         return inserted
 
     def get_meal_history(
@@ -70,14 +153,66 @@ class NutritionRepository:
         offset: int = 0,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> List[MealLogModel]:
-        """Devuelve el historial de comidas de un paciente, más reciente primero."""
-        q = (
-            self.db.query(MealLogModel)
-            .filter(MealLogModel.patient_id == patient_id)
-        )
-        if start_date is not None:
-            q = q.filter(MealLogModel.timestamp >= start_date)
-        if end_date is not None:
-            q = q.filter(MealLogModel.timestamp <= end_date)
-        return q.order_by(MealLogModel.timestamp.desc()).offset(offset).limit(limit).all()
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_notes: bool = True,
+    ) -> List[Union[MealLogModel, Row]]:
+        """
+        Devuelve el historial de comidas de un paciente, más reciente primero.
+        Con `after` (timestamp, id) de la última fila vista se pagina por keyset
+        sobre el índice (patient_id, timestamp DESC, id) y se ignora `offset`.
+        Las notas se descifran en bloque para toda la página al leerse la primera.
+        Con include_notes=False devuelve filas de MEAL_HISTORY_SUMMARY_COLUMNS
+        (mismos nombres de atributo, sin `notes`) y no se lee el texto cifrado.
+        """
+        rows = self.db.execute(
+            _meal_history_stmt(patient_id, limit, offset, start_date, end_date, after, include_notes)
+        ).all()
+        return attach_lazy_decryption(rows, MealLogModel.notes) if include_notes else list(rows)
+
+
+class AsyncNutritionRepository:
+    """
+    Versión async de NutritionRepository (AsyncSession) con las operaciones de las
+    rutas de alto tráfico: búsqueda de ingredientes, registro e historial de comidas.
+    """
+    def __init__(self, db: AsyncSession, catalog: Optional[IngredientCatalog] = None):
+        self.db = db
+        self.catalog = catalog or get_ingredient_catalog()
+
+    async def search_ingredients(self, query: str, limit: int = 20) -> List[CatalogIngredient]:
+        """Búsqueda contra el catálogo en memoria; sólo consulta BD si está frío."""
+        return await self.catalog.search_async(query, limit=limit)
+
+    async def get_ingredients_by_ids(self, ids: Iterable[UUID]) -> Dict[UUID, IngredientModel]:
+        """Resuelve varios ingredientes en una única consulta IN."""
+        unique_ids = set(ids)
+        if not unique_ids:
+            return {}
+        rows = await self.db.scalars(select(IngredientModel).where(IngredientModel.id.in_(unique_ids)))
+        return {row.id: row for row in rows}
+
+    async def log_meal(self, meal: MealLogModel, commit: bool = True) -> MealLogModel:
+        """
+        Persiste un registro de comida junto con sus items (sin refresh: las columnas
+        se asignan en memoria). Con commit=False el llamante confirma la unidad de trabajo.
+        """
+        self.db.add(meal)
+        if commit:
+            await self.db.commit()
+        return meal
+
+    async def get_meal_history(
+        self,
+        patient_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_notes: bool = True,
+    ) -> List[Union[MealLogModel, Row]]:
+        """Historial de comidas, más reciente primero (misma paginación e include_notes que la versión sync)."""
+        rows = (await self.db.execute(
+            _meal_history_stmt(patient_id, limit, offset, start_date, end_date, after, include_notes)
+        )).all()
+        return attach_lazy_decryption(rows, MealLogModel.notes) if include_notes else list(rows)
@@ -3,7 +3,7 @@ from fastapi import HTTPException
 from uuid import UUID
 
 # Domain
-from src.domain.nutrition import calculate_daily_bolus
+from src.domain.nutrition import calculate_daily_bolus, normalize_ingredient_name
 # Infra (Repository would be cleaner, but we'll use DB models here carefully for MVP speed, 
 # ideally we should have a UserRepository interface)
 from src.infrastructure.db.models import PatientModel, IngredientModel
@@ -86,7 +86,7 @@ class NutritionService:
     def search_ingredients(self, query: str, skip: int, limit: int):
         q = self.db.query(IngredientModel)
         if query:
-            q = q.filter(IngredientModel.name.ilike(f"%{query}%"))
+            q = q.filter(IngredientModel.name_normalized.contains(normalize_ingredient_name(query)))
         return q.offset(skip).limit(limit).all()
 
     def create_ingredient(self, data: dict):
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -5,10 +6,11 @@ from src.domain.user_models import UserCreate, UserPublic, HealthProfile
 from src.infrastructure.db.models import UserModel, HealthProfileModel
 from src.infrastructure.security.auth import get_password_hash
 
-def create_user(db: Session, user: UserCreate) -> UserPublic:
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> UserPublic:
     """
     Creates a new user and their associated health profile atomically.
     Passwords are hashed. Health metrics are encrypted via TypeDecorator.
+    Async callers hash on the bcrypt pool first and pass `hashed_password`.
     """
     # 1. Start atomic transaction check
     existing_user = db.query(UserModel).filter(UserModel.email == user.email).first()
@@ -19,7 +21,7 @@ def create_user(db: Session, user: UserCreate) -> UserPublic:
         )
     
     # 2. Hash Password
-    hashed_pwd = get_password_hash(user.password)
+    hashed_pwd = hashed_password or get_password_hash(user.password)
     
     # 3. Create User Model
     db_user = UserModel(
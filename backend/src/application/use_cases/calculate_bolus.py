@@ -14,11 +14,13 @@ def execute_calculate_bolus(
     [Backend Ninja] Caso de Uso: Calcula el Bolus total (Corrección + Comida).
     """
     total_carbs = 0.0
+    # Una sola consulta para todos los ingredientes (evita N+1)
+    ingredients = repo.get_ingredients_by_ids(item.get("ingredient_id") for item in ingredients_input)
     for item in ingredients_input:
         ing_id = item.get("ingredient_id")
         weight = item.get("weight_grams", 0)
         
-        ingredient = repo.get_ingredient_by_id(ing_id)
+        ingredient = ingredients.get(ing_id)
         if ingredient:
             carbs_for_weight = (ingredient.carbs_per_100g / 100.0) * weight
             total_carbs += carbs_for_weight
@@ -1,39 +1,36 @@
 from typing import List, Dict
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
-from src.application.repositories.nutrition_repository import NutritionRepository
-from src.infrastructure.db.models import MealLogModel, MealItemModel
+from src.application.repositories.nutrition_repository import AsyncNutritionRepository, NutritionRepository
+from src.infrastructure.db.models import IngredientModel, MealLogModel, MealItemModel
 from src.domain.nutrition import calculate_glycemic_load
 
-def execute_log_meal(
+def _build_meal(
     patient_id: UUID,
     ingredients_input: List[Dict],
+    ingredients: Dict[UUID, IngredientModel],
     notes: str,
-    repo: NutritionRepository,
     bolus_units_administered: float = None,
 ) -> MealLogModel:
-    """
-    [Backend Ninja] Caso de Uso: Registrar una comida en el historial del paciente.
-    """
+    """Calcula los totales y construye la comida con sus items (sin tocar BD)."""
     total_carbs = 0.0
     total_gl = 0.0
-    
+
     meal_items = []
-    
     for item in ingredients_input:
         ing_id = item.get("ingredient_id")
         weight = float(item.get("weight_grams", 0))
-        
-        ingredient = repo.get_ingredient_by_id(ing_id)
+
+        ingredient = ingredients.get(ing_id)
         if ingredient:
             # Calcular carbohidratos reales para el peso ingerido
             carbs = (ingredient.carbs_per_100g / 100.0) * weight
             total_carbs += carbs
-            
+
             # Calcular Carga Glucémica (CG) de este alimento
             gl = calculate_glycemic_load(gi=ingredient.glycemic_index, carbs_grams=carbs)
             total_gl += gl
-            
+
             meal_items.append(
                 MealItemModel(
                     ingredient_id=ingredient.id,
@@ -42,7 +39,8 @@ def execute_log_meal(
             )
 
     # Crear el MealLog (Las notas son texto en memoria; el ORM EncryptedString las cifra antes de BD)
-    meal = MealLogModel(
+    return MealLogModel(
+        id=uuid4(),
         patient_id=patient_id,
         timestamp=datetime.utcnow(),
         total_carbs_grams=total_carbs,
@@ -51,5 +49,36 @@ def execute_log_meal(
         bolus_units_administered=bolus_units_administered,
         items=meal_items
     )
-    
-    return repo.log_meal(meal)
+
+def execute_log_meal(
+    patient_id: UUID,
+    ingredients_input: List[Dict],
+    notes: str,
+    repo: NutritionRepository,
+    bolus_units_administered: float = None,
+    commit: bool = True,
+) -> MealLogModel:
+    """
+    [Backend Ninja] Caso de Uso: Registrar una comida en el historial del paciente.
+
+    Con commit=False la comida queda pendiente en la sesión con todas sus columnas
+    asignadas en memoria (id incluido), de modo que el llamante puede construir la
+    respuesta sin SELECT de refresco y confirmar en un único commit.
+    """
+    # Una sola consulta para todos los ingredientes (evita N+1)
+    ingredients = repo.get_ingredients_by_ids(item.get("ingredient_id") for item in ingredients_input)
+    meal = _build_meal(patient_id, ingredients_input, ingredients, notes, bolus_units_administered)
+    return repo.log_meal(meal, commit=commit)
+
+async def execute_log_meal_async(
+    patient_id: UUID,
+    ingredients_input: List[Dict],
+    notes: str,
+    repo: AsyncNutritionRepository,
+    bolus_units_administered: float = None,
+    commit: bool = True,
+) -> MealLogModel:
+    """execute_log_meal sobre AsyncNutritionRepository (mismo cálculo y contrato)."""
+    ingredients = await repo.get_ingredients_by_ids(item.get("ingredient_id") for item in ingredients_input)
+    meal = _build_meal(patient_id, ingredients_input, ingredients, notes, bolus_units_administered)
+    return await repo.log_meal(meal, commit=commit)
@@ -1,5 +1,5 @@
 from typing import List
-from src.application.repositories.nutrition_repository import NutritionRepository
+from src.application.repositories.nutrition_repository import AsyncNutritionRepository, NutritionRepository
 from src.infrastructure.db.models import IngredientModel
 
 def execute_search(query: str, repo: NutritionRepository, limit: int = 20) -> List[IngredientModel]:
@@ -10,3 +10,10 @@ def execute_search(query: str, repo: NutritionRepository, limit: int = 20) -> Li
         return []
     
     return repo.search_ingredients(query=query.strip(), limit=limit)
+
+async def execute_search_async(query: str, repo: AsyncNutritionRepository, limit: int = 20) -> List[IngredientModel]:
+    """execute_search sobre AsyncNutritionRepository."""
+    if not query or len(query.strip()) < 2:
+        return []
+    
+    return await repo.search_ingredients(query=query.strip(), limit=limit)
@@ -0,0 +1,68 @@
+"""
+Ambulatory Glucose Profile (AGP): glucose percentiles by time of day.
+
+Readings of the window (14 days by default, the consensus report period) are
+folded onto one day and binned into 5- or 15-minute time-of-day slots; each slot
+gets its 5th, 25th, 50th, 75th and 95th percentiles. Percentiles use linear
+interpolation between order statistics (numpy.percentile's default), computed
+for every slot at once on one sorted array instead of one call per slot.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Tuple
+
+from src.domain.glucose_models import GlucoseAgpSlot
+
+AGP_PERCENTILES = (5, 25, 50, 75, 95)
+AGP_SLOT_MINUTES = (5, 15)
+AGP_DEFAULT_DAYS = 14
+
+
+def agp_window(end_date: date, days: int = AGP_DEFAULT_DAYS) -> Tuple[datetime, datetime]:
+    """[start, end) covering the `days` whole UTC days that end on `end_date`."""
+    end = datetime.combine(end_date + timedelta(days=1), time())
+    return end - timedelta(days=days), end
+
+
+def agp_slots(readings: Iterable[Tuple[datetime, int]], slot_minutes: int = 15) -> List[GlucoseAgpSlot]:
+    """One GlucoseAgpSlot per time-of-day slot; slots without readings have no percentiles."""
+    if slot_minutes not in AGP_SLOT_MINUTES:
+        raise ValueError(f"slot_minutes must be one of {AGP_SLOT_MINUTES}")
+
+    # NumPy is imported here, not at module level: it adds ~80 ms to a cold start
+    import numpy as np
+
+    n_slots = 24 * 60 // slot_minutes
+    minutes, values = [], []
+    for timestamp, value in readings:
+        minutes.append(timestamp.hour * 60 + timestamp.minute)
+        values.append(value)
+
+    slot = np.asarray(minutes, dtype=np.intp) // slot_minutes
+    values = np.asarray(values, dtype=np.float64)
+    counts = np.bincount(slot, minlength=n_slots)
+    percentiles = np.full((n_slots, len(AGP_PERCENTILES)), np.nan)
+
+    if values.size:
+        # Sorted by slot, then value: each slot is a contiguous, ordered run
+        ordered = values[np.lexsort((values, slot))]
+        starts = np.cumsum(counts) - counts
+        filled = counts > 0
+        q = np.asarray(AGP_PERCENTILES, dtype=np.float64) / 100.0
+        # Fractional rank of each percentile inside its slot's run, for all slots at once
+        rank = starts[filled, None] + q[None, :] * (counts[filled, None] - 1)
+        below = np.floor(rank).astype(np.intp)
+        above = np.minimum(below + 1, (starts + counts - 1)[filled, None])
+        percentiles[filled] = ordered[below] + (ordered[above] - ordered[below]) * (rank - below)
+
+    rounded = np.round(percentiles, 1)
+    return [
+        GlucoseAgpSlot(
+            start=f"{i * slot_minutes // 60:02d}:{i * slot_minutes % 60:02d}",
+            count=int(counts[i]),
+            **{
+                f"p{p}": (None if np.isnan(rounded[i, j]) else float(rounded[i, j]))
+                for j, p in enumerate(AGP_PERCENTILES)
+            },
+        )
+        for i in range(n_slots)
+    ]
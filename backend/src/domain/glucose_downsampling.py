@@ -0,0 +1,109 @@
+"""
+Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013) of a glucose trace.
+
+The readings between the first and the last are split into `threshold - 2`
+buckets of equal count; from each bucket LTTB keeps the reading that forms the
+largest triangle with the reading kept from the previous bucket and the average
+of the next one. Peaks and troughs make the largest triangles, so hypo and hyper
+excursions survive where plain decimation or averaging would flatten them.
+
+LTTBDownsampler is push-based: readings are fed in timestamp order as they are
+fetched and selected points come out as soon as their bucket is decided, so a
+trace is downsampled in one pass holding at most two buckets in memory.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+Point = Tuple[datetime, int]  # (timestamp, mg/dL)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _x(point: Point) -> float:
+    return (point[0] - _EPOCH).total_seconds()
+
+
+def _average(bucket: List[Point]) -> Tuple[float, float]:
+    n = len(bucket)
+    return sum(_x(p) for p in bucket) / n, sum(p[1] for p in bucket) / n
+
+
+def _largest_triangle(previous: Point, bucket: List[Point], next_x: float, next_y: float) -> Point:
+    ax, ay = _x(previous), previous[1]
+    # Twice the triangle area; the constant factor does not change the argmax
+    return max(bucket, key=lambda p: abs((ax - next_x) * (p[1] - ay) - (ax - _x(p)) * (next_y - ay)))
+
+
+class LTTBDownsampler:
+    """
+    Downsample a stream of `total` readings to about `threshold` points.
+
+    `total` only sizes the buckets: if the stream turns out longer (a reading
+    landed between the count and the fetch) the extra readings join the last
+    bucket, if shorter the output has fewer points. Streams that already fit
+    in `threshold` points pass through unchanged.
+    """
+
+    def __init__(self, total: int, threshold: int):
+        if threshold < 3:
+            raise ValueError("threshold must be at least 3 (first, last and one bucket)")
+        self.passthrough = total <= threshold
+        self.buckets = threshold - 2
+        self.every = max(total - 2, 1) / self.buckets
+        self.count = 0
+        self._selected: Optional[Point] = None  # Last point emitted
+        self._held: Optional[Point] = None  # Latest reading; it is the last one until another arrives
+        self._pending: List[Point] = []  # Complete bucket waiting for the next one's average
+        self._filling: List[Point] = []  # Bucket being read
+        self._filling_no = 0
+
+    def add(self, point: Point) -> List[Point]:
+        """Feed the next reading; returns the points decided by it (possibly none)."""
+        self.count += 1
+        if self.passthrough:
+            return [point]
+        if self._selected is None:
+            self._selected = point
+            return [point]
+
+        held, self._held = self._held, point
+        if held is None:
+            return []
+        # `held` is a middle reading, at index count - 2 of the stream
+        bucket_no = min(int((self.count - 3) / self.every), self.buckets - 1)
+        out = []
+        if self._filling and bucket_no != self._filling_no:
+            out = self._close_pending(*_average(self._filling))
+            self._pending, self._filling = self._filling, []
+        self._filling_no = bucket_no
+        self._filling.append(held)
+        return out
+
+    def finish(self) -> List[Point]:
+        """Points still undecided once the stream is exhausted, ending with the last reading."""
+        if self.passthrough or self._held is None:
+            return []
+        last = self._held
+        out = []
+        if self._filling:
+            out = self._close_pending(*_average(self._filling))
+            self._pending, self._filling = self._filling, []
+        out += self._close_pending(_x(last), last[1])
+        out.append(last)
+        return out
+
+    def _close_pending(self, next_x: float, next_y: float) -> List[Point]:
+        if not self._pending:
+            return []
+        self._selected = _largest_triangle(self._selected, self._pending, next_x, next_y)
+        self._pending = []
+        return [self._selected]
+
+
+def lttb(points: List[Point], threshold: int) -> List[Point]:
+    """LTTB over an in-memory trace."""
+    sampler = LTTBDownsampler(len(points), threshold)
+    out = []
+    for point in points:
+        out += sampler.add(point)
+    return out + sampler.finish()
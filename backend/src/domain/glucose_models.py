@@ -1,7 +1,7 @@
 
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 class GlucoseType(str, Enum):
@@ -26,3 +26,88 @@ class GlucoseResponse(BaseModel):
     notes: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class GlucoseBulkRequest(BaseModel):
+    """Batch upload of readings (e.g. a CGM backfill after the phone was offline)."""
+    measurements: List[GlucoseCreateRequest] = Field(..., max_length=10000)
+
+
+class GlucoseBulkResponse(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int  # Already stored, or repeated within the same upload
+
+
+class GlucoseRangeBands(BaseModel):
+    """Percentage of readings per band: <54, 54 to target low, in target, target high to 250, >250 mg/dL."""
+    very_low: float
+    low: float
+    in_range: float
+    high: float
+    very_high: float
+
+
+class GlucoseStatsResponse(BaseModel):
+    patient_id: UUID
+    start: datetime = Field(serialization_alias="from")
+    end: datetime = Field(serialization_alias="to")
+    count: int
+    mean: Optional[float] = None  # mg/dL
+    sd: Optional[float] = None  # mg/dL
+    cv: Optional[float] = None  # %, SD / mean
+    gmi: Optional[float] = None  # %, Glucose Management Indicator
+    min: Optional[int] = None
+    max: Optional[int] = None
+    target_range_low: int
+    target_range_high: int
+    ranges: Optional[GlucoseRangeBands] = None  # None when there are no readings
+
+
+class GlucoseTrendPoint(BaseModel):
+    bucket: datetime  # Start of the hour or day (UTC)
+    count: int
+    mean: float  # mg/dL
+    sd: float  # mg/dL
+    min: int
+    max: int
+
+
+class GlucoseTrendResponse(BaseModel):
+    patient_id: UUID
+    start: datetime = Field(serialization_alias="from")
+    end: datetime = Field(serialization_alias="to")
+    bucket: str  # "hour" or "day"
+    points: List[GlucoseTrendPoint]
+
+
+class GlucoseSeriesPoint(BaseModel):
+    timestamp: datetime
+    value: int  # mg/dL
+
+
+class GlucoseSeriesResponse(BaseModel):
+    patient_id: UUID
+    start: datetime = Field(serialization_alias="from")
+    end: datetime = Field(serialization_alias="to")
+    count: int  # Readings in the window, before downsampling
+    points: List[GlucoseSeriesPoint]
+
+
+class GlucoseAgpSlot(BaseModel):
+    start: str  # Time of day (UTC), "HH:MM"
+    count: int
+    p5: Optional[float] = None  # mg/dL; None when the slot has no readings
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class GlucoseAgpResponse(BaseModel):
+    patient_id: UUID
+    start: datetime = Field(serialization_alias="from")
+    end: datetime = Field(serialization_alias="to")
+    slot_minutes: int
+    count: int  # Readings in the window
+    slots: List[GlucoseAgpSlot]
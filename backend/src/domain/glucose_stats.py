@@ -0,0 +1,98 @@
+"""
+Glucose summary statistics (international consensus on CGM metrics, Battelino 2019).
+
+The database returns sufficient statistics (count, sum, sum of squares, min, max
+and the number of readings per range band); everything else is derived here, so
+the same summary can be built from raw readings or from pre-aggregated rollups.
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from src.domain.glucose_models import GlucoseRangeBands, GlucoseStatsResponse, GlucoseTrendPoint
+
+# Fixed consensus thresholds (mg/dL); the in-range band comes from the HealthProfile
+VERY_LOW_MG_DL = 54
+VERY_HIGH_MG_DL = 250
+DEFAULT_TARGET_RANGE_LOW = 70
+DEFAULT_TARGET_RANGE_HIGH = 180
+
+
+@dataclass(frozen=True)
+class GlucoseAggregates:
+    count: int
+    total: int  # sum of glucose_value
+    total_squares: int  # sum of glucose_value²
+    minimum: Optional[int]
+    maximum: Optional[int]
+    very_low: int
+    low: int
+    in_range: int
+    high: int
+    very_high: int
+    target_range_low: int
+    target_range_high: int
+
+
+def gmi_percent(mean_mg_dl: float) -> float:
+    """Glucose Management Indicator (estimated HbA1c, %) from the mean glucose."""
+    return 3.31 + 0.02392 * mean_mg_dl
+
+
+def mean_and_sd(count: int, total: int, total_squares: int) -> Tuple[float, float]:
+    """Mean and sample SD from the sufficient statistics (count > 0)."""
+    # int(): PostgreSQL returns SUM over bigint as numeric (Decimal)
+    total, total_squares = int(total), int(total_squares)
+    # Sample SD from integer sums: exact up to the final division
+    sd = math.sqrt(max(count * total_squares - total ** 2, 0) / (count * (count - 1))) if count > 1 else 0.0
+    return total / count, sd
+
+
+def summarize(aggregates: GlucoseAggregates, patient_id: UUID, start: datetime, end: datetime) -> GlucoseStatsResponse:
+    n = aggregates.count
+    stats = GlucoseStatsResponse(
+        patient_id=patient_id,
+        start=start,
+        end=end,
+        count=n,
+        min=aggregates.minimum,
+        max=aggregates.maximum,
+        target_range_low=aggregates.target_range_low,
+        target_range_high=aggregates.target_range_high,
+    )
+    if n == 0:
+        return stats
+
+    mean, sd = mean_and_sd(n, aggregates.total, aggregates.total_squares)
+    pct = lambda k: round(100.0 * k / n, 1)  # noqa: E731
+    stats.mean = round(mean, 1)
+    stats.sd = round(sd, 1)
+    stats.cv = round(100.0 * sd / mean, 1)
+    stats.gmi = round(gmi_percent(mean), 1)
+    stats.ranges = GlucoseRangeBands(
+        very_low=pct(aggregates.very_low),
+        low=pct(aggregates.low),
+        in_range=pct(aggregates.in_range),
+        high=pct(aggregates.high),
+        very_high=pct(aggregates.very_high),
+    )
+    return stats
+
+
+def trend_points(rows: Iterable) -> List[GlucoseTrendPoint]:
+    """Chart points from rollup rows (bucket, count, total, total_squares, minimum, maximum)."""
+    points = []
+    for row in rows:
+        mean, sd = mean_and_sd(row.count, row.total, row.total_squares)
+        bucket = row.bucket  # datetime (hourly) or date (daily)
+        points.append(GlucoseTrendPoint(
+            bucket=bucket if isinstance(bucket, datetime) else datetime.combine(bucket, time()),
+            count=row.count,
+            mean=round(mean, 1),
+            sd=round(sd, 1),
+            min=row.minimum,
+            max=row.maximum,
+        ))
+    return points
@@ -1,5 +1,9 @@
+import unicodedata
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    import numpy as np
 
 @dataclass
 class NutritionalInfo:
@@ -9,6 +13,22 @@ class NutritionalInfo:
     fiber: float
     glycemic_index: int
 
+_COMBINING_TILDE = "\u0303"
+
+def normalize_ingredient_name(name: str) -> str:
+    """
+    Clave de búsqueda de un ingrediente: sin tildes, en minúsculas y con los
+    espacios colapsados. "Plátano  Maduro" -> "platano maduro".
+    La ñ se conserva: "Año" y "Ano" son nombres distintos.
+    """
+    kept = []
+    for ch in unicodedata.normalize("NFKD", name):
+        if unicodedata.combining(ch) and not (ch == _COMBINING_TILDE and kept and kept[-1] in "nN"):
+            continue
+        kept.append(ch)
+    unaccented = unicodedata.normalize("NFC", "".join(kept))
+    return " ".join(unaccented.casefold().split())
+
 def calculate_glycemic_load(gi: int, carbs_grams: float) -> float:
     """
     Calcula la Carga Glucémica (CG).
@@ -33,3 +53,20 @@ def calculate_daily_bolus(
     # El bolus no puede ser negativo (si tienes hipoglucemia, no te pones insulina)
     total = carb_insulin + correction_insulin
     return max(0.0, total)
+
+def calculate_daily_bolus_batch(
+    total_carbs: "np.ndarray",
+    icr: "np.ndarray",
+    current_glucose: "np.ndarray",
+    target_glucose: "np.ndarray",
+    isf: "np.ndarray"
+) -> "np.ndarray":
+    """
+    Versión vectorizada de calculate_daily_bolus (un elemento por escenario).
+    Mismas operaciones y en el mismo orden, así que el resultado es idéntico bit a bit.
+    """
+    import numpy as np  # diferido: sólo el cálculo por lotes lo usa (arranque más rápido)
+
+    carb_insulin = total_carbs / icr
+    correction_insulin = (current_glucose - target_glucose) / isf
+    return np.maximum(0.0, carb_insulin + correction_insulin)
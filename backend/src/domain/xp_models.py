@@ -176,3 +176,16 @@ class UserXPSummary(BaseModel):
             progress_percentage=xp_progress_percentage(total_xp),
             recent_transactions=recent_transactions or []
         )
+
+
+# --- XP Balance Reconciliation ---
+
+class XPBalanceDrift(BaseModel):
+    """Mismatch between a user's materialized XP balance and the sum of their ledger"""
+    user_id: UUID
+    stored_total: int | None  # None when the balance row is missing
+    ledger_total: int
+    
+    @property
+    def drift(self) -> int:
+        return (self.stored_total or 0) - self.ledger_total
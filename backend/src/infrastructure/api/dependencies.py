@@ -1,29 +1,57 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from src.infrastructure.security.jwt_handler import verify_token, TokenData
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# Sin el 401 automático: get_current_user_id lo lanza si falta el token y en
+# get_token_iat es opcional
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
-    """Dependency para proteger rutas. Devuelve el user_id del token si es válido."""
-    credentials_exception = HTTPException(
+def _credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
+        detail=detail,
         headers={"WWW-Authenticate": "Bearer"},
     )
-    token_data = verify_token(token, credentials_exception)
-    return token_data.user_id
 
+def get_token_claims(token: Optional[str] = Depends(oauth2_scheme)) -> Optional[TokenData]:
+    """
+    Claims ("sub", "iat") del token de la petición, o None si no hay token.
+    FastAPI cachea la dependencia por petición: el JWT se decodifica una sola vez
+    aunque lo pidan get_current_user_id y get_token_iat.
+    """
+    return verify_token(token, _credentials_exception()) if token else None
+
+def get_current_user_id(claims: Optional[TokenData] = Depends(get_token_claims)) -> str:
+    """Dependency para proteger rutas. Devuelve el user_id del token si es válido."""
+    if claims is None:
+        raise _credentials_exception("Not authenticated")
+    return claims.user_id
+
+def get_token_iat(claims: Optional[TokenData] = Depends(get_token_claims)) -> Optional[int]:
+    """Claim "iat" del token de la petición (None si falta). Parte de la clave de caché."""
+    return claims.issued_at if claims else None
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.infrastructure.db.database import get_db
-from src.infrastructure.db.models import UserModel
+from src.infrastructure.db.models import PatientModel, UserModel
+from src.infrastructure.cache.user_identity import CachedUser, get_user_identity_cache
 
 from uuid import UUID
 
 def get_current_user(
     user_id: str = Depends(get_current_user_id),
+    token_iat: Optional[int] = Depends(get_token_iat),
     db: Session = Depends(get_db)
 ) -> UserModel:
+    """
+    Usuario autenticado. La identidad se sirve de una caché LRU+TTL con clave
+    (user_id, iat); en caso de acierto se adjunta a la sesión sin SELECT.
+    Dentro de una petición FastAPI reutiliza el resultado para todas las
+    dependencias que lo piden, así que la BD se consulta como mucho una vez.
+    """
     try:
         user_uuid = UUID(user_id)
     except ValueError:
@@ -32,7 +60,12 @@ def get_current_user(
             detail="Invalid token subject",
             headers={"WWW-Authenticate": "Bearer"},
         )
-        
+
+    cache = get_user_identity_cache()
+    cached = cache.get((user_uuid, token_iat))
+    if cached:
+        return cached.attach(db)
+
     user = db.query(UserModel).filter(UserModel.id == user_uuid).first()
     if not user:
          raise HTTPException(
@@ -40,4 +73,16 @@ def get_current_user(
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    cache.put((user_uuid, token_iat), CachedUser.from_model(user))
     return user
+
+async def get_guarded_patient(db: AsyncSession, user_id: UUID, patient_id: UUID) -> PatientModel:
+    """Paciente `patient_id` si `user_id` es su tutor; si no, 404 (sin revelar si existe)."""
+    patient = (await db.scalars(select(PatientModel).where(
+        PatientModel.id == patient_id,
+        PatientModel.guardian_id == user_id
+    ))).first()
+
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found or unauthorized")
+    return patient
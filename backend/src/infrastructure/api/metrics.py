@@ -0,0 +1,308 @@
+"""
+Request and SQL metrics in Prometheus text format (GET /metrics).
+
+- http_request_duration_seconds{method,route}: latency histogram. `route` is the
+  path template (/api/v1/family/members/{patient_id}), never the raw path, so
+  there is one series per endpoint. Requests that match no route share
+  route="unmatched".
+- http_requests_total{method,route,status}: responses by status code.
+- http_requests_in_flight: requests currently being served.
+- http_streams_open / http_stream_duration_seconds{method,route}: streaming
+  responses (text/event-stream, e.g. /glucose/stream). They leave the in-flight
+  gauge once their headers are sent and their lifetime goes to its own histogram,
+  so long-lived connections do not skew request latency.
+- http_request_sql_statements / http_request_sql_duration_seconds{method,route}:
+  SQL statements per request and the time spent in them, collected with the
+  before/after_cursor_execute events of the attached engines.
+- db_statements_total / db_statement_duration_seconds_total: every statement,
+  including those outside a request (startup, background jobs).
+- db_pool_*: connection pool saturation (in-use and overflow gauges, checkout
+  wait histogram, timeouts), the same counters as /health/db-pool.
+
+Counters live in the worker process, like the /health/* pool and cache stats:
+with several uvicorn workers each one exposes its own. METRICS_ENABLED=false
+turns the middleware and the SQL events into pass-throughs.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.db.pool import PoolMetrics, get_pool_metrics
+
+# Upper bounds of the histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SQL_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STREAM_DURATION_BUCKETS = (1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0, 21600.0)
+
+# Responses with these content types are counted as streams, not requests
+STREAMING_CONTENT_TYPES = (b"text/event-stream",)
+
+UNMATCHED_ROUTE = "unmatched"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_QUERY_START_KEY = "metrics_query_start"
+
+
+class QueryStats:
+    """SQL statements of the current request; shared by the threads and greenlets serving it."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class _Histogram:
+    def __init__(self, name: str, help_text: str, bounds: Sequence[float], label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.bounds = tuple(bounds)
+        self.label_names = label_names
+        self.series: Dict[Tuple[str, ...], List] = {}  # labels -> [bucket counts, sum, count]
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.bounds) + 1), 0.0, 0]
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, out: List[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help_text}")
+        out.append(f"# TYPE {self.name} histogram")
+        for labels, (buckets, total, count) in sorted(self.series.items()):
+            _render_histogram_series(
+                out, self.name, _format_labels(self.label_names, labels), self.bounds, buckets, total, count)
+
+
+def _render_histogram_series(out: List[str], name: str, base: str, bounds: Sequence[float],
+                             buckets: Sequence[int], total: float, count: int) -> None:
+    cumulative = 0
+    for bound, hits in zip(tuple(bounds) + (float("inf"),), buckets):
+        cumulative += hits
+        le = "+Inf" if bound == float("inf") else repr(float(bound))
+        out.append(f'{name}_bucket{{{base + "," if base else ""}le="{le}"}} {cumulative}')
+    labels = f"{{{base}}}" if base else ""
+    out.append(f"{name}_sum{labels} {total!r}")
+    out.append(f"{name}_count{labels} {count}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestMetrics:
+    """Process-wide registry fed by MetricsMiddleware and the SQLAlchemy cursor events."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self.streams_open = 0
+            self.responses: Dict[Tuple[str, str, str], int] = {}
+            self.db_statements = 0
+            self.db_seconds = 0.0
+            labels = ("method", "route")
+            self.latency = _Histogram(
+                "http_request_duration_seconds", "Request latency by route template.", LATENCY_BUCKETS, labels)
+            self.sql_statements = _Histogram(
+                "http_request_sql_statements", "SQL statements executed per request.", SQL_STATEMENT_BUCKETS, labels)
+            self.sql_seconds = _Histogram(
+                "http_request_sql_duration_seconds", "Time spent in SQL per request.", SQL_DURATION_BUCKETS, labels)
+            self.stream_duration = _Histogram(
+                "http_stream_duration_seconds", "Lifetime of streaming responses by route template.",
+                STREAM_DURATION_BUCKETS, labels)
+
+    # --- SQL events ---
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.enabled:
+            conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get(_QUERY_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = _current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        with self._lock:
+            self.db_statements += 1
+            self.db_seconds += elapsed
+
+    def _handle_error(self, context) -> None:
+        # after_cursor_execute does not fire for a failed statement: drop its start time,
+        # or it would stay on the pooled connection and pair with a later statement
+        if context.execution_context is not None and context.connection is not None:
+            starts = context.connection.info.get(_QUERY_START_KEY)
+            if starts:
+                starts.pop()
+
+    # --- Requests ---
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def stream_started(self) -> None:
+        """The response turned out to be a stream: move it from in-flight to open streams."""
+        with self._lock:
+            self.in_flight -= 1
+            self.streams_open += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, queries: QueryStats,
+                         streaming: bool = False) -> None:
+        labels = (method, route)
+        key = (method, route, str(status))
+        with self._lock:
+            self.responses[key] = self.responses.get(key, 0) + 1
+            if streaming:
+                self.streams_open -= 1
+                self.stream_duration.observe(labels, seconds)
+            else:
+                self.in_flight -= 1
+                self.latency.observe(labels, seconds)
+            self.sql_statements.observe(labels, queries.count)
+            self.sql_seconds.observe(labels, queries.seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            out = [
+                "# HELP http_requests_in_flight Requests currently being served by this worker.",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_streams_open Streaming responses currently open on this worker.",
+                "# TYPE http_streams_open gauge",
+                f"http_streams_open {self.streams_open}",
+                "# HELP http_requests_total Responses by route template and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for labels, count in sorted(self.responses.items()):
+                out.append(f"http_requests_total{{{_format_labels(('method', 'route', 'status'), labels)}}} {count}")
+            self.latency.render(out)
+            self.sql_statements.render(out)
+            self.sql_seconds.render(out)
+            self.stream_duration.render(out)
+            out += [
+                "# HELP db_statements_total SQL statements executed, in or out of a request.",
+                "# TYPE db_statements_total counter",
+                f"db_statements_total {self.db_statements}",
+                "# HELP db_statement_duration_seconds_total Time spent executing SQL statements.",
+                "# TYPE db_statement_duration_seconds_total counter",
+                f"db_statement_duration_seconds_total {self.db_seconds!r}",
+            ]
+        _render_pool(out, get_pool_metrics())
+        return "\n".join(out) + "\n"
+
+
+def _render_pool(out: List[str], pool: PoolMetrics) -> None:
+    """Connection pool saturation (sync and async engines together), from the pool events."""
+    stats = pool.stats()
+    for name, kind, help_text, value in (
+        ("db_pool_connections_in_use", "gauge", "Connections checked out of the pools.", stats["in_use"]),
+        ("db_pool_overflow_in_use", "gauge", "Open connections beyond pool_size.", stats["overflow_in_use"]),
+        ("db_pool_checkouts_total", "counter", "Connections handed out by the pools.", stats["checkouts"]),
+        ("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up after pool_timeout.",
+         stats["checkout_timeouts"]),
+        ("db_pool_invalidations_total", "counter", "Connections discarded as broken.", stats["invalidations"]),
+    ):
+        out += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    name = "db_pool_checkout_wait_seconds"
+    out += [f"# HELP {name} Time from checkout request to usable connection.", f"# TYPE {name} histogram"]
+    _render_histogram_series(out, name, "", *pool.checkout_wait_histogram())
+
+
+def _metrics_enabled_from_env() -> bool:
+    return os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=1)
+def get_request_metrics() -> RequestMetrics:
+    return RequestMetrics(enabled=_metrics_enabled_from_env())
+
+
+def _route_template(scope) -> str:
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # Routes of a router included with a prefix may carry only their own template
+    # (recent FastAPI versions): take the static prefix (/api/v1) from the request path.
+    segments = scope["path"].split("/")
+    return "/".join(segments[:len(segments) - template.count("/")]) + template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream wrapping) so the cost
+    per request is a couple of perf_counter calls and one locked update. The route
+    template is read from scope["route"], which the router sets while matching.
+    """
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        metrics = self.metrics or get_request_metrics()
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        streaming = False
+        queries = QueryStats()
+        token = _current_query_stats.set(queries)
+
+        async def send_with_status(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers", ())).get(b"content-type", b"")
+                if content_type.startswith(STREAMING_CONTENT_TYPES):
+                    streaming = True
+                    metrics.stream_started()
+            await send(message)
+
+        metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.request_finished(
+                scope["method"], _route_template(scope), status, time.perf_counter() - start, queries,
+                streaming=streaming,
+            )
+            _current_query_stats.reset(token)
@@ -0,0 +1,70 @@
+"""
+Keyset (cursor) pagination helpers for history endpoints.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the
+(timestamp, id) of the last row on the previous page. History is ordered by
+timestamp DESC, id ASC, which matches the (patient_id, timestamp DESC, id)
+composite index, so the next page is an index range scan instead of an OFFSET.
+
+History endpoints also accept `include=` for optional, costlier fields
+(e.g. `include=notes`, which must be decrypted).
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import FrozenSet, Iterable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorKey = Tuple[datetime, UUID]
+
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_cursor_param(cursor: Optional[str]) -> Optional[CursorKey]:
+    """Decode the `cursor` query parameter, mapping malformed values to HTTP 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_include_param(include: Optional[str], allowed: Iterable[str]) -> FrozenSet[str]:
+    """Parse a comma-separated `include` query parameter, mapping unknown fields to HTTP 400."""
+    if not include:
+        return frozenset()
+    fields = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = fields - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def paginate(rows: list, limit: int, response: Response) -> list:
+    """
+    Trim a `limit + 1` result set to `limit` rows and, if there is a further
+    page, expose its cursor in the X-Next-Cursor response header.
+    """
+    page = rows[:limit]
+    if len(rows) > limit and page:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.timestamp, last.id)
+    return page
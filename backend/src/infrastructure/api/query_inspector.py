@@ -0,0 +1,205 @@
+"""
+N+1 query detection for development and test runs.
+
+Every SQL statement of a request is fingerprinted (literals, bind parameters and
+IN/VALUES lists normalized away), so a lazy load in a loop shows up as the same
+fingerprint repeated once per row. Fingerprints repeated more than `max_repeats`
+times are reported with the application frames (src/...) that issued them: the
+repository or router line to fix.
+
+- QueryInspectorMiddleware: opt-in with QUERY_INSPECTOR=true. Logs a warning per
+  offending request and adds an X-Query-Count header. Capturing stacks is slow;
+  never enable it in production.
+- QueryBudget: context manager behind the `query_budget` pytest fixture. Raises
+  QueryBudgetExceeded (an AssertionError, so pytest reports a plain failure) when
+  the block runs more statements than declared or repeats one beyond max_repeats.
+"""
+import logging
+import os
+import re
+import traceback
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MAX_REPEATS = 2
+MAX_STACKS_PER_FINGERPRINT = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+_BIND = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement with literals and parameters replaced, so N+1 repetitions compare equal."""
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _BIND.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _REPEATED_GROUPS.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _origin_stack() -> Tuple[traceback.FrameSummary, ...]:
+    """Application frames that led to the statement, outermost first."""
+    frames = traceback.extract_stack()
+    # AsyncSession runs the ORM in a child greenlet; the awaiting repository and
+    # router coroutines are on the suspended parent greenlet's stack
+    parent = getcurrent().parent
+    if parent is not None and parent.gr_frame is not None:
+        frames = traceback.extract_stack(parent.gr_frame) + frames
+    return tuple(f for f in frames if f.filename.startswith(SRC_DIR) and f.filename != __file__)
+
+
+@dataclass
+class RepeatedQuery:
+    fingerprint: str
+    count: int
+    stacks: List[Tuple[traceback.FrameSummary, ...]] = field(default_factory=list)
+
+    def describe(self) -> str:
+        lines = [f"{self.count}x {self.fingerprint}"]
+        for stack in self.stacks:
+            lines.append("  issued from:")
+            lines.extend(f"    {f.filename}:{f.lineno} in {f.name}" for f in stack)
+        return "\n".join(lines)
+
+
+class QueryRecorder:
+    """Statements executed while recording, grouped by fingerprint."""
+
+    def __init__(self, capture_stacks: bool = True):
+        self.capture_stacks = capture_stacks
+        self.statements: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._stacks: Dict[str, List[Tuple[traceback.FrameSummary, ...]]] = {}
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        self.statements.append(statement)
+        key = fingerprint(statement)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        if self.capture_stacks:
+            stacks = self._stacks.setdefault(key, [])
+            if len(stacks) < MAX_STACKS_PER_FINGERPRINT:
+                stack = _origin_stack()
+                if stack not in stacks:
+                    stacks.append(stack)
+
+    def repeated(self, max_repeats: int = DEFAULT_MAX_REPEATS) -> List[RepeatedQuery]:
+        """Fingerprints executed more than `max_repeats` times, most repeated first."""
+        return [
+            RepeatedQuery(key, count, self._stacks.get(key, []))
+            for key, count in sorted(self._counts.items(), key=lambda kv: kv[1], reverse=True)
+            if count > max_repeats
+        ]
+
+
+_current_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("current_query_recorder", default=None)
+
+
+def _record_current(conn, cursor, statement, parameters, context, executemany) -> None:
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.record(statement)
+
+
+def attach(engine: Engine) -> None:
+    """Feed the statements of `engine` to the recorder of the current request."""
+    event.listen(engine, "before_cursor_execute", _record_current)
+
+
+def detach(engine: Engine) -> None:
+    event.remove(engine, "before_cursor_execute", _record_current)
+
+
+def query_inspector_enabled() -> bool:
+    return os.getenv("QUERY_INSPECTOR", "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """
+    Records every statement of the given engines inside the block, whichever thread
+    runs it (TestClient serves requests on its own thread), and checks the budget
+    on exit.
+    """
+
+    def __init__(self, *engines: Engine, max_queries: Optional[int] = None,
+                 max_repeats: int = DEFAULT_MAX_REPEATS):
+        self.engines = engines
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.recorder = QueryRecorder()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.recorder.record(statement)
+
+    def __enter__(self) -> QueryRecorder:
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+        if exc_type is not None:
+            return
+        problems = []
+        if self.max_queries is not None and self.recorder.count > self.max_queries:
+            problems.append(f"{self.recorder.count} statements, budget is {self.max_queries}:")
+            problems.extend(f"  {s}" for s in self.recorder.statements)
+        repeated = self.recorder.repeated(self.max_repeats)
+        if repeated:
+            problems.append(f"statements repeated more than {self.max_repeats} times (N+1?):")
+            problems.extend(r.describe() for r in repeated)
+        if problems:
+            raise QueryBudgetExceeded("\n".join(problems))
+
+
+class QueryInspectorMiddleware:
+    """Pure ASGI middleware: one QueryRecorder per request, warnings for repeated statements."""
+
+    def __init__(self, app, max_repeats: Optional[int] = None):
+        self.app = app
+        self.max_repeats = max_repeats if max_repeats is not None else int(
+            os.getenv("QUERY_INSPECTOR_MAX_REPEATS", DEFAULT_MAX_REPEATS)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = _current_recorder.set(recorder)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(recorder.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current_recorder.reset(token)
+            for repeated in recorder.repeated(self.max_repeats):
+                logger.warning("N+1 in %s %s: %s", scope["method"], scope["path"], repeated.describe())
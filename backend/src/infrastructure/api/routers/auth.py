@@ -1,25 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 # Core Deps
 from src.infrastructure.db.database import get_db
 from src.infrastructure.db.models import UserModel
-from src.infrastructure.security.auth import verify_password
+from src.infrastructure.security.auth import verify_password_async
 from src.infrastructure.security.jwt_handler import create_access_token, Token, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+def _get_user_by_email(db: Session, email: str):
+    return db.query(UserModel).filter(UserModel.email == email).first()
+
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Async: bcrypt corre en el pool acotado de PasswordHasher y la consulta en el
+    # threadpool, así un pico de logins no bloquea el event loop ni al resto de rutas.
     # 1. Buscar usuario
     # NOTA: En Clean Arch estricto, esto iría en un AuthUseCase en la capa de Aplicación.
     # Dado el MVP, accedemos al repository/modelo directamente aquí por pragmatismo.
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
     
     # 2. Verificar credenciales
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
@@ -204,7 +204,8 @@ def get_patient_details(
     pid = UUID(patient_id)
     uid = UUID(user_id)
     
-    patient = db.query(PatientModel).filter(
+    # health_profile in the same query instead of a lazy load on first access
+    patient = db.query(PatientModel).options(joinedload(PatientModel.health_profile)).filter(
         PatientModel.id == pid, 
         PatientModel.guardian_id == uid
     ).first()
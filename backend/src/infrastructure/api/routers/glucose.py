@@ -1,29 +1,80 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
 from uuid import UUID
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from src.infrastructure.db.database import get_db
-from src.infrastructure.api.dependencies import get_current_user_id
-from src.infrastructure.repositories.glucose_repository import GlucoseRepository
-from src.domain.glucose_models import GlucoseCreateRequest, GlucoseResponse
-from src.infrastructure.db.models import PatientModel, UserModel
+from src.infrastructure.db.database import get_async_db
+from src.infrastructure.api.dependencies import get_current_user_id, get_guarded_patient
+from src.infrastructure.api.pagination import paginate, parse_cursor_param, parse_include_param
+from src.infrastructure.repositories.glucose_repository import AsyncGlucoseRepository
+from src.infrastructure.repositories.glucose_rollups import as_utc_naive
+from src.domain.glucose_models import GlucoseCreateRequest, GlucoseResponse, GlucoseBulkRequest, GlucoseBulkResponse, GlucoseStatsResponse, GlucoseTrendResponse, GlucoseSeriesPoint, GlucoseSeriesResponse, GlucoseAgpResponse
+from src.domain.glucose_agp import AGP_DEFAULT_DAYS, AGP_SLOT_MINUTES, agp_slots, agp_window
+from src.domain.glucose_downsampling import LTTBDownsampler
+from src.domain.glucose_stats import summarize, trend_points
+from src.infrastructure.db.models import GlucoseMeasurementModel, UserModel
+from src.infrastructure.cache.glucose_agp import get_agp_cache
+from src.infrastructure.pubsub.broker import Subscription, get_broker
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/glucose", tags=["glucose"])
 
+# Default window of the summary endpoints (the usual CGM report period)
+DEFAULT_STATS_WINDOW = timedelta(days=14)
+
+
+def _resolve_window(start: Optional[datetime], end: Optional[datetime]) -> tuple[datetime, datetime]:
+    """[start, end) in naive UTC; defaults to the DEFAULT_STATS_WINDOW ending now."""
+    end = as_utc_naive(end) if end else datetime.utcnow()
+    start = as_utc_naive(start) if start else end - DEFAULT_STATS_WINDOW
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be earlier than 'to'")
+    return start, end
+
+# Live stream (GET /stream): seconds between keep-alive comments, which stop proxies
+# from closing idle streams and reveal clients that went away, and the reconnect
+# delay suggested to EventSource clients
+STREAM_HEARTBEAT_SECONDS = 15.0
+STREAM_RETRY_MS = 5000
+
+
+def _stream_channel(patient_id: UUID) -> str:
+    return f"glucose:{patient_id}"
+
+
+async def _publish_measurement(measurement: GlucoseMeasurementModel) -> None:
+    """Push a committed measurement to the patient's live subscribers, as a ready SSE frame."""
+    # Notes stay out: they are PHI and the postgres backend would carry them in clear
+    data = GlucoseResponse.model_validate(measurement).model_dump_json(exclude={"notes"})
+    frame = f"event: measurement\nid: {measurement.id}\ndata: {data}\n\n"
+    await get_broker().publish(_stream_channel(measurement.patient_id), frame)
+
+
+async def _sse_frames(channel: str) -> AsyncIterator[str]:
+    # Subscribed inside the generator so that the subscription is released
+    # whenever the response ends, including a client gone before the first frame
+    subscription: Subscription = get_broker().subscribe(channel)
+    async with subscription:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while True:
+            frame = await subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            yield ": keep-alive\n\n" if frame is None else frame
+
 @router.post("/", response_model=GlucoseResponse, status_code=status.HTTP_201_CREATED)
-def create_glucose_measurement(
+async def create_glucose_measurement(
     request: GlucoseCreateRequest,
     patient_id: str, # Passed as validation or query param? Actually usually inside request body or separate param
     # Let's use query param for patient_id since request body is pure measurement data
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Register a new glucose measurement.
-    Verifies that the user is the guardian of the patient.
+    Verifies that the user is the guardian of the patient. A reading of the same
+    measurement_type already recorded at that timestamp is a 409.
     """
     uid = UUID(user_id)
     pid = UUID(patient_id)
@@ -31,45 +82,70 @@ def create_glucose_measurement(
     # Verify permission
     # User must be the guardian of the patient OR the patient themselves (if we had patient login)
     # For now, only guardian adds records for family
-    patient = db.query(PatientModel).filter(
-        PatientModel.id == pid,
-        PatientModel.guardian_id == uid
-    ).first()
-    
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found or unauthorized")
-    
-    repo = GlucoseRepository(db)
-    measurement = repo.create_measurement(pid, request)
+    await get_guarded_patient(db, uid, pid)
     
+    repo = AsyncGlucoseRepository(db)
+    try:
+        measurement = await repo.create_measurement(pid, request)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Measurement already recorded for this timestamp")
+
+    get_agp_cache().invalidate(pid, [as_utc_naive(request.timestamp)])
+    await _publish_measurement(measurement)
     return measurement
 
+@router.post("/bulk", response_model=GlucoseBulkResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_glucose_measurements(
+    request: GlucoseBulkRequest,
+    patient_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Register many glucose measurements at once (CGM backfill).
+    Guardian ownership is checked once for the whole batch. Readings already
+    stored for the same (timestamp, measurement_type) are skipped and counted
+    as duplicates, so re-sending a batch is safe.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    await get_guarded_patient(db, uid, pid)
+
+    repo = AsyncGlucoseRepository(db)
+    inserted = await repo.bulk_create_measurements(pid, request.measurements)
+    received = len(request.measurements)
+    if inserted:
+        get_agp_cache().invalidate(pid, (as_utc_naive(m.timestamp) for m in request.measurements))
+
+    return GlucoseBulkResponse(received=received, inserted=inserted, duplicates=received - inserted)
+
 @router.get("/history", response_model=List[GlucoseResponse])
-def get_glucose_history(
+async def get_glucose_history(
     patient_id: str,
     limit: int = 20,
     offset: int = 0,
     start_date: int = None,  # Timestamp in milliseconds
     end_date: int = None,    # Timestamp in milliseconds
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,  # Opaque cursor from X-Next-Cursor; takes precedence over offset
+    include: Optional[str] = None,  # "notes" to return the (encrypted) notes
+    response: Response = None,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Get glucose history for a patient.
+    When more rows are available, the X-Next-Cursor response header carries
+    the cursor for the next page.
+    Notes are only returned (and decrypted) with include=notes.
     """
     uid = UUID(user_id)
     pid = UUID(patient_id)
+    include_notes = "notes" in parse_include_param(include, {"notes"})
     
     # Verify permission
-    patient = db.query(PatientModel).filter(
-        PatientModel.id == pid,
-        PatientModel.guardian_id == uid
-    ).first()
+    await get_guarded_patient(db, uid, pid)
     
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found or unauthorized")
-    
-    repo = GlucoseRepository(db)
+    repo = AsyncGlucoseRepository(db)
     
     # Convert timestamps to datetime if provided
     start_dt = None
@@ -80,12 +156,158 @@ def get_glucose_history(
     if end_date:
         end_dt = datetime.fromtimestamp(end_date / 1000.0)
 
-    history = repo.get_history(
+    history = await repo.get_history(
         pid, 
-        limit=limit, 
+        limit=limit + 1, 
         offset=offset,
         start_date=start_dt,
-        end_date=end_dt
+        end_date=end_dt,
+        after=parse_cursor_param(cursor),
+        include_notes=include_notes
     )
     
-    return history
+    return paginate(history, limit, response)
+
+@router.get("/stats", response_model=GlucoseStatsResponse)
+async def get_glucose_stats(
+    patient_id: str,
+    start: Optional[datetime] = Query(None, alias="from"),  # ISO 8601 or epoch; default: 14 days before `to`
+    end: Optional[datetime] = Query(None, alias="to"),  # Exclusive; default: now
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Summary of the readings in [from, to): count, mean, SD, CV, GMI and the
+    percentage of time in each range band against the patient's target range.
+    Computed by the database in one aggregate query, whatever the window size;
+    windows longer than a day add up the hourly/daily rollups. The rollups only
+    count the consensus 70-180 bands: for a patient with a custom target range
+    every window is aggregated from the raw readings.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    await get_guarded_patient(db, uid, pid)
+    start, end = _resolve_window(start, end)
+
+    aggregates = await AsyncGlucoseRepository(db).get_stats_aggregates(pid, start, end)
+    return summarize(aggregates, pid, start, end)
+
+
+@router.get("/trend", response_model=GlucoseTrendResponse)
+async def get_glucose_trend(
+    patient_id: str,
+    start: Optional[datetime] = Query(None, alias="from"),  # Default: 14 days before `to`
+    end: Optional[datetime] = Query(None, alias="to"),  # Exclusive; default: now
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Chart series of [from, to): count, mean, SD, min and max per day for windows
+    longer than a day, per hour otherwise. Read from the rollups, so a 90-day
+    chart is 90 rows. Edge buckets are whole hours/days.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    await get_guarded_patient(db, uid, pid)
+    start, end = _resolve_window(start, end)
+
+    unit, rows = await AsyncGlucoseRepository(db).get_trend(pid, start, end)
+    return GlucoseTrendResponse(patient_id=pid, start=start, end=end, bucket=unit, points=trend_points(rows))
+
+
+# Default and maximum points of a downsampled series (a phone chart is a few hundred px wide)
+DEFAULT_SERIES_POINTS = 300
+MAX_SERIES_POINTS = 5000
+
+
+@router.get("/series", response_model=GlucoseSeriesResponse)
+async def get_glucose_series(
+    patient_id: str,
+    start: Optional[datetime] = Query(None, alias="from"),  # Default: 14 days before `to`
+    end: Optional[datetime] = Query(None, alias="to"),  # Exclusive; default: now
+    points: int = Query(DEFAULT_SERIES_POINTS, ge=3, le=MAX_SERIES_POINTS),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Chart trace of [from, to) downsampled to at most `points` readings with
+    Largest-Triangle-Three-Buckets, which keeps hypo and hyper excursions.
+    Readings are streamed from the database and downsampled in one pass.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    await get_guarded_patient(db, uid, pid)
+    start, end = _resolve_window(start, end)
+
+    repo = AsyncGlucoseRepository(db)
+    sampler = LTTBDownsampler(await repo.count_readings(pid, start, end), points)
+    kept = []
+    async for reading in repo.iter_series(pid, start, end):
+        kept += sampler.add(reading)
+    kept += sampler.finish()
+
+    return GlucoseSeriesResponse(
+        patient_id=pid, start=start, end=end, count=sampler.count,
+        points=[GlucoseSeriesPoint(timestamp=ts, value=value) for ts, value in kept],
+    )
+
+
+@router.get("/agp", response_model=GlucoseAgpResponse)
+async def get_glucose_agp(
+    patient_id: str,
+    end_date: Optional[date] = Query(None, alias="to"),  # Last day of the window (UTC); default: today
+    days: int = Query(AGP_DEFAULT_DAYS, ge=1, le=90),
+    slot_minutes: int = 15,  # 5 or 15
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Ambulatory Glucose Profile: 5th, 25th, 50th, 75th and 95th percentiles per
+    time-of-day slot over the `days` days ending on `to`. Cached per patient and
+    window; new readings inside the window invalidate the cached profile.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    if slot_minutes not in AGP_SLOT_MINUTES:
+        raise HTTPException(status_code=400, detail="'slot_minutes' must be 5 or 15")
+    await get_guarded_patient(db, uid, pid)
+    end_date = end_date or datetime.utcnow().date()
+
+    cache = get_agp_cache()
+    key = (pid, end_date, days, slot_minutes)
+    profile = cache.get(key)
+    if profile is None:
+        generation = cache.generation(pid)
+        start, end = agp_window(end_date, days)
+        readings = [reading async for reading in AsyncGlucoseRepository(db).iter_series(pid, start, end)]
+        profile = GlucoseAgpResponse(
+            patient_id=pid, start=start, end=end, slot_minutes=slot_minutes, count=len(readings),
+            slots=agp_slots(readings, slot_minutes),
+        )
+        cache.put(key, profile, generation)
+    return profile
+
+
+@router.get("/stream")
+async def stream_glucose(
+    patient_id: str,
+    # scope="function": the session is closed before streaming, so idle
+    # subscribers do not hold pooled connections
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Server-Sent Events with every new measurement of the patient as soon as it
+    is committed ("event: measurement", data as in /history without notes),
+    instead of polling /history?limit=1. A keep-alive comment is sent every
+    STREAM_HEARTBEAT_SECONDS. On reconnect, fetch /history to fill the gap.
+    """
+    uid = UUID(user_id)
+    pid = UUID(patient_id)
+    await get_guarded_patient(db, uid, pid)
+
+    return StreamingResponse(
+        _sse_frames(_stream_channel(pid)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
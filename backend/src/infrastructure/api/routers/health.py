@@ -1,11 +1,73 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from src.infrastructure.api.metrics import CONTENT_TYPE, get_request_metrics
+from src.infrastructure.cache.user_identity import get_user_identity_cache
+from src.infrastructure.db.pool import get_pool_metrics
+from src.infrastructure.security.password_hasher import get_password_hasher
+
 router = APIRouter(tags=["Health"])
 
 class HealthResponse(BaseModel):
     status: str
 
+class PasswordPoolResponse(BaseModel):
+    workers: int
+    queue_depth: int
+    in_flight: int
+    completed: int
+
+class DBPoolResponse(BaseModel):
+    in_use: int
+    overflow_in_use: int
+    connections_opened: int
+    overflow_opened: int
+    checkouts: int
+    checkout_timeouts: int
+    invalidations: int
+    checkout_wait_count: int
+    checkout_wait_sum_seconds: float
+    checkout_wait_max_seconds: float
+
+class UserCacheResponse(BaseModel):
+    size: int
+    hits: int
+    misses: int
+
+class StartupResponse(BaseModel):
+    mode: str
+    schema_seconds: float
+    catalog_seconds: float
+    total_seconds: float
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     return {"status": "healthy"}
+
+@router.get("/health/password-pool", response_model=PasswordPoolResponse)
+async def password_pool_stats():
+    """Saturation of the bcrypt pool: a growing queue_depth means logins are waiting."""
+    return get_password_hasher().stats()
+
+@router.get("/health/user-cache", response_model=UserCacheResponse)
+async def user_cache_stats():
+    """Hit/miss counters of the get_current_user identity cache (this worker)."""
+    return get_user_identity_cache().stats()
+
+@router.get("/health/db-pool", response_model=DBPoolResponse)
+async def db_pool_stats():
+    """Connection pool usage: in-use connections, overflow, checkout waits and timeouts."""
+    return get_pool_metrics().stats()
+
+@router.get("/health/startup", response_model=StartupResponse)
+async def startup_stats(request: Request):
+    """Startup time of this worker: schema check/migration, catalog warm-up and total."""
+    startup = getattr(request.app.state, "startup", None)
+    if startup is None:
+        raise HTTPException(status_code=404, detail="Startup metrics not recorded")
+    return startup
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: request latency, status codes and SQL per route (this worker)."""
+    return Response(content=get_request_metrics().render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from src.domain.user_models import UserCreate, UserPublic, HealthProfileUpdate
 from src.domain.health_models import PasswordChange
 from src.domain.xp_models import XPTransaction, UserAchievement, Achievement, UserXPSummary
@@ -7,19 +8,21 @@ from src.application.services.user_service import create_user
 from src.infrastructure.db.database import get_db
 from src.infrastructure.db.models import UserModel, HealthProfileModel
 from src.infrastructure.api.dependencies import get_current_user
-from src.infrastructure.security.auth import get_password_hash, verify_password
+from src.infrastructure.security.auth import get_password_hash_async, verify_password_async
 from src.infrastructure.db.xp_repository import XPRepository
+from src.infrastructure.cache.user_identity import get_user_identity_cache
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("/register", response_model=UserPublic, status_code=201)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user with their medical profile.
-    Passwords are hashed (Bcrypt).
+    Passwords are hashed (Bcrypt) on the bounded password pool.
     Sensitive Health Data is encrypted (Fernet).
     """
-    created_user = create_user(db, user)
+    hashed_password = await get_password_hash_async(user.password)
+    created_user = await run_in_threadpool(create_user, db, user, hashed_password)
     return created_user
 
 @router.get("/me", response_model=UserPublic)
@@ -60,6 +63,7 @@ def update_health_profile(
     
     db.commit()
     db.refresh(health_profile)
+    get_user_identity_cache().invalidate(current_user.id)
     
     # Convert back to domain model for response
     return {
@@ -72,7 +76,7 @@ def update_health_profile(
 
 
 @router.post("/me/change-password")
-def change_password(
+async def change_password(
     password_change: PasswordChange,
     current_user: UserModel = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -85,13 +89,19 @@ def change_password(
     if not password_change.passwords_match():
         raise HTTPException(status_code=400, detail="New passwords do not match")
     
+    # The cached identity has no hash: reading it may lazy-load through the sync
+    # session, so do it in the threadpool rather than on the event loop
+    hashed_password = await run_in_threadpool(getattr, current_user, "hashed_password")
+
     # Verify old password
-    if not verify_password(password_change.old_password, current_user.hashed_password):
+    if not await verify_password_async(password_change.old_password, hashed_password):
         raise HTTPException(status_code=400, detail="Old password is incorrect")
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_change.new_password)
-    db.commit()
+    user_id = current_user.id  # the commit expires current_user
+    current_user.hashed_password = await get_password_hash_async(password_change.new_password)
+    await run_in_threadpool(db.commit)
+    get_user_identity_cache().invalidate(user_id)
     
     return {"message": "Password changed successfully"}
 
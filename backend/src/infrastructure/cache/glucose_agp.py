@@ -0,0 +1,103 @@
+"""
+Caché LRU con TTL (por proceso) de los perfiles AGP ya calculados.
+
+El AGP de 14 días recorre unas 4.000 lecturas por paciente y casi nunca cambia:
+la ventana sólo recibe lecturas nuevas si termina hoy o si llega un volcado
+atrasado del sensor. Se guarda la respuesta completa con clave
+(paciente, fecha final de la ventana, días, minutos por franja).
+
+Las escrituras locales (POST /glucose/ y /glucose/bulk) invalidan las entradas
+del paciente cuya ventana contiene alguna de las lecturas nuevas; el TTL acota
+lo que puede tardar en verse una lectura registrada en otro worker. Cada
+invalidación sube además la generación del paciente: quien calcula un perfil
+la lee antes de consultar las lecturas y `put` descarta el perfil si cambió
+mientras tanto, para no guardar uno anterior a una escritura ya confirmada.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from src.domain.glucose_agp import agp_window
+from src.domain.glucose_models import GlucoseAgpResponse
+
+AGP_CACHE_TTL_SECONDS = float(os.getenv("AGP_CACHE_TTL_SECONDS", "300"))
+AGP_CACHE_MAX_ENTRIES = int(os.getenv("AGP_CACHE_MAX_ENTRIES", "512"))
+
+# (patient_id, fecha final, días, minutos por franja)
+AgpCacheKey = Tuple[UUID, date, int, int]
+
+
+class AgpCache:
+    def __init__(
+        self,
+        ttl_seconds: float = AGP_CACHE_TTL_SECONDS,
+        max_entries: int = AGP_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[AgpCacheKey, Tuple[float, GlucoseAgpResponse]]" = OrderedDict()
+        self._generations: Dict[UUID, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: AgpCacheKey) -> Optional[GlucoseAgpResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, patient_id: UUID) -> int:
+        """Se lee antes de consultar las lecturas y se pasa a `put`."""
+        with self._lock:
+            return self._generations.get(patient_id, 0)
+
+    def put(self, key: AgpCacheKey, profile: GlucoseAgpResponse, generation: int) -> None:
+        """No guarda nada si el paciente se invalidó después de leer `generation`."""
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (self._clock(), profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, patient_id: UUID, timestamps: Iterable[datetime]) -> None:
+        """Descarta los perfiles del paciente cuya ventana se solapa con [min, max] de `timestamps`."""
+        timestamps = list(timestamps)
+        if not timestamps:
+            return
+        first, last = min(timestamps), max(timestamps)
+        with self._lock:
+            self._generations[patient_id] = self._generations.get(patient_id, 0) + 1
+            for key in [k for k in self._entries if k[0] == patient_id]:
+                start, end = agp_window(key[1], key[2])
+                if first < end and last >= start:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def get_agp_cache() -> AgpCache:
+    return AgpCache()
@@ -0,0 +1,280 @@
+"""
+Catálogo de ingredientes en memoria (por proceso) con índice invertido de trigramas.
+
+El autocompletado de Flutter llama a GET /nutrition/ingredients en cada pulsación.
+En lugar de un `ILIKE '%q%'` (scan secuencial) se mantiene una instantánea inmutable
+del catálogo con un índice de n-gramas de caracteres que se reconstruye de forma
+perezosa cuando se invalida (escrituras) o cuando caduca el TTL (otros workers).
+"""
+import asyncio
+import heapq
+from bisect import bisect_left
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.domain.nutrition import normalize_ingredient_name
+from src.infrastructure.db import database
+from src.infrastructure.db.models import IngredientModel
+
+# Segundos antes de recargar aunque no haya invalidación local (escrituras en otros workers)
+CATALOG_TTL_SECONDS = float(os.getenv("INGREDIENT_CATALOG_TTL_SECONDS", "300"))
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+@dataclass(frozen=True)
+class CatalogIngredient:
+    """Instantánea inmutable de un ingrediente, desacoplada de la sesión ORM."""
+    id: UUID
+    name: str
+    glycemic_index: int
+    carbs_per_100g: float
+    fiber_per_100g: float
+    barcode: Optional[str] = None
+    name_normalized: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, m: IngredientModel) -> "CatalogIngredient":
+        return cls(
+            id=m.id,
+            name=m.name,
+            glycemic_index=m.glycemic_index,
+            carbs_per_100g=m.carbs_per_100g,
+            fiber_per_100g=m.fiber_per_100g or 0.0,
+            barcode=m.barcode,
+            name_normalized=m.name_normalized,
+        )
+
+
+def search_key(text: str) -> str:
+    """Misma clave que IngredientModel.name_normalized: sin tildes ni mayúsculas."""
+    return normalize_ingredient_name(text)
+
+
+def _ngrams(key: str, n: int) -> Iterable[str]:
+    return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+
+def _padded_trigrams(key: str) -> set:
+    """Trigramas por palabra con relleno, al estilo pg_trgm ('  pan ')."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _CatalogIndex:
+    """
+    Índice inmutable: se construye una vez y se sustituye entero al recargar.
+
+    Las posiciones siguen el orden de similitud (menos trigramas primero, luego nombre):
+    como toda coincidencia contiene la consulta, sus trigramas son (casi) un subconjunto
+    de los del nombre y la similitud |T(q)| / |T(nombre)| ordena igual para cualquier q.
+    Así las listas de postings ya están ordenadas por relevancia dentro de cada nivel
+    (prefijo del nombre, prefijo de palabra, subcadena) y la búsqueda puede parar en
+    cuanto tiene `limit` resultados.
+    """
+
+    # Por debajo de este tamaño, un rango de prefijos se ordena directamente
+    DIRECT_RANGE = 1024
+
+    def __init__(self, items: List[CatalogIngredient], loaded_at: float):
+        self.loaded_at = loaded_at
+        keyed = sorted(
+            ((len(_padded_trigrams(k)), k, item) for item in items for k in (item.name_normalized or search_key(item.name),)),
+            key=lambda t: (t[0], t[1]),
+        )
+        self.items = [item for _, _, item in keyed]
+        self.keys = [key for _, key, _ in keyed]
+
+        # Nivel 0: nombres que empiezan por q (bisect sobre claves ordenadas)
+        by_key = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self.prefix_keys = [self.keys[pos] for pos in by_key]
+        self.prefix_pos = array("I", by_key)
+
+        # Nivel 1: alguna palabra (no la primera) empieza por q
+        suffixes = sorted(
+            (key[i + 1:], pos)
+            for pos, key in enumerate(self.keys)
+            for i, ch in enumerate(key) if ch == " "
+        )
+        self.word_keys = [suffix for suffix, _ in suffixes]
+        self.word_pos = array("I", (pos for _, pos in suffixes))
+
+        # Nivel 2: subcadena arbitraria (postings de bigramas para q de 2 caracteres, trigramas si no)
+        self.postings: Dict[str, array] = {}
+        for pos, key in enumerate(self.keys):
+            for gram in _ngrams(key, 2) | _ngrams(key, 3):
+                bucket = self.postings.get(gram)
+                if bucket is None:
+                    bucket = self.postings[gram] = array("I")
+                bucket.append(pos)
+
+    @staticmethod
+    def _prefix_range(sorted_keys: List[str], q: str) -> range:
+        return range(bisect_left(sorted_keys, q), bisect_left(sorted_keys, q + _MAX_CHAR))
+
+    def _candidates(self, q: str) -> Iterable[int]:
+        n = 3 if len(q) >= 3 else 2
+        smallest = None
+        for gram in _ngrams(q, n):
+            bucket = self.postings.get(gram)
+            if bucket is None:
+                return ()
+            if smallest is None or len(bucket) < len(smallest):
+                smallest = bucket
+        return smallest if smallest is not None else range(len(self.items))
+
+    def _tier(self, key: str, q: str) -> int:
+        if key.startswith(q):
+            return 0
+        if (" " + q) in key:
+            return 1
+        return 2 if q in key else 3
+
+    def _scan(self, q: str, tier: int, need: int) -> List[int]:
+        """Recorre postings en orden de relevancia y se detiene al reunir `need` del nivel."""
+        found = []
+        keys = self.keys
+        for pos in self._candidates(q):
+            if self._tier(keys[pos], q) == tier:
+                found.append(pos)
+                if len(found) >= need:
+                    break
+        return found
+
+    def _from_range(self, q: str, tier: int, need: int, positions: array, span: range) -> List[int]:
+        if len(span) > self.DIRECT_RANGE:
+            return self._scan(q, tier, need)
+        keys = self.keys
+        matches = {positions[i] for i in span}
+        return heapq.nsmallest(need, (pos for pos in matches if self._tier(keys[pos], q) == tier))
+
+    def search(self, query: str, limit: int) -> List[CatalogIngredient]:
+        q = search_key(query)
+        if not q or limit <= 0:
+            return []
+        ranked = self._from_range(q, 0, limit, self.prefix_pos, self._prefix_range(self.prefix_keys, q))
+        if len(ranked) < limit:
+            ranked += self._from_range(
+                q, 1, limit - len(ranked), self.word_pos, self._prefix_range(self.word_keys, q)
+            )
+        if len(ranked) < limit:
+            ranked += self._scan(q, 2, limit - len(ranked))
+        return [self.items[pos] for pos in ranked]
+
+
+class IngredientCatalog:
+    """
+    Catálogo compartido por proceso. Las lecturas no toman locks: usan la instantánea
+    actual. Sólo la reconstrucción se serializa para que varias peticiones concurrentes
+    tras una invalidación no carguen el catálogo varias veces.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # Sesiones propias de la recarga async (por defecto, database.AsyncSessionLocal)
+        self._session_factory = session_factory
+        self._index: Optional[_CatalogIndex] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        # Recarga async en curso (single-flight), ver search_async
+        self._refresh: Optional[asyncio.Future] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index is not None
+
+    def _is_fresh(self, index: Optional[_CatalogIndex]) -> bool:
+        return index is not None and (self._clock() - index.loaded_at) < self.ttl_seconds
+
+    def _build(self, db: Session) -> _CatalogIndex:
+        generation = self._generation
+        return self._publish(db.scalars(select(IngredientModel)).all(), generation)
+
+    def _publish(self, rows: Iterable[IngredientModel], generation: int) -> _CatalogIndex:
+        index = _CatalogIndex([CatalogIngredient.from_model(r) for r in rows], self._clock())
+        # Si hubo una invalidación durante la carga, no se publica una instantánea ya obsoleta
+        if generation == self._generation:
+            self._index = index
+        return index
+
+    def load(self, db: Session) -> int:
+        """Carga (o recarga) el catálogo completo desde BD. Devuelve el nº de ingredientes."""
+        with self._lock:
+            return len(self._build(db).items)
+
+    def _ensure_loaded(self, db: Session) -> _CatalogIndex:
+        index = self._index
+        if self._is_fresh(index):
+            return index
+        with self._lock:
+            index = self._index
+            if self._is_fresh(index):
+                return index
+            return self._build(db)
+
+    def invalidate(self) -> None:
+        """Descarta la instantánea; la siguiente lectura recarga desde BD."""
+        self._generation += 1
+        self._index = None
+
+    def search(self, db: Session, query: str, limit: int = 20) -> List[CatalogIngredient]:
+        """Prefijos primero, luego por similitud de trigramas. No toca BD si está cargado."""
+        return self._ensure_loaded(db).search(query, limit)
+
+    async def search_async(self, query: str, limit: int = 20) -> List[CatalogIngredient]:
+        """
+        `search` para rutas async, sin bloquear el bucle de eventos: el índice se
+        construye en el threadpool y una sola recarga está en curso a la vez
+        (las peticiones concurrentes esperan esa misma tarea). Si sólo caducó el
+        TTL, las demás peticiones siguen usando la instantánea anterior mientras
+        la petición que lanzó la recarga la espera.
+
+        La recarga abre su propia sesión: puede sobrevivir a la petición que la
+        lanzó, cuya sesión se cierra al terminar esa petición.
+        """
+        index = self._index
+        if self._is_fresh(index):
+            return index.search(query, limit)
+        refresh = self._refresh
+        started_here = refresh is None
+        if started_here:
+            refresh = self._refresh = asyncio.ensure_future(self._reload_async())
+        if index is None or started_here:
+            # shield: si esta petición se cancela, la recarga sigue para las demás
+            index = await asyncio.shield(refresh)
+        return index.search(query, limit)
+
+    async def _reload_async(self) -> _CatalogIndex:
+        try:
+            generation = self._generation
+            async with (self._session_factory or database.AsyncSessionLocal)() as db:
+                rows = (await db.scalars(select(IngredientModel))).all()
+            return await run_in_threadpool(self._publish, rows, generation)
+        finally:
+            self._refresh = None
+
+
+@lru_cache()
+def get_ingredient_catalog() -> IngredientCatalog:
+    # Singleton por proceso (mismo patrón que get_crypto_service)
+    return IngredientCatalog()
@@ -0,0 +1,110 @@
+"""
+Caché LRU con TTL (por proceso) de la identidad del usuario autenticado.
+
+Cada ruta protegida resuelve `get_current_user`, que hacía un SELECT sobre `users`
+por id en cada llamada; el dashboard lanza cinco o seis por pantalla. Se guarda una
+instantánea inmutable de las columnas de identidad, con clave (user_id, iat del
+token): un token nuevo no reutiliza entradas de uno anterior.
+
+Las escrituras locales (cambio de contraseña, actualización de perfil) invalidan al
+usuario; el TTL acota lo que puede tardar en verse un cambio hecho en otro worker.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from src.infrastructure.db.models import UserModel
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+CacheKey = Tuple[UUID, Optional[int]]
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Columnas de identidad de un usuario, desacopladas de la sesión ORM.
+    `hashed_password` y `pin_hash` no se guardan: quien los necesite los carga
+    de la BD al acceder al atributo.
+    """
+    id: UUID
+    email: str
+    full_name: Optional[str]
+    is_active: Optional[bool]
+
+    @classmethod
+    def from_model(cls, m: UserModel) -> "CachedUser":
+        return cls(id=m.id, email=m.email, full_name=m.full_name, is_active=m.is_active)
+
+    def attach(self, db: Session) -> UserModel:
+        """
+        Devuelve un UserModel persistente en `db` sin SELECT (merge con load=False).
+        Las columnas no cacheadas y las relaciones se cargan de forma perezosa.
+        """
+        user = UserModel(id=self.id, email=self.email, full_name=self.full_name, is_active=self.is_active)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+
+class UserIdentityCache:
+    def __init__(
+        self,
+        ttl_seconds: float = USER_CACHE_TTL_SECONDS,
+        max_entries: int = USER_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, CachedUser]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: CacheKey, user: CachedUser) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Descarta todas las entradas del usuario (todos sus tokens)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def get_user_identity_cache() -> UserIdentityCache:
+    return UserIdentityCache()
@@ -0,0 +1,46 @@
+"""
+Dialect-specific SQL helpers.
+
+Production runs on PostgreSQL and the test-suite on SQLite; both support
+`INSERT ... ON CONFLICT`, but through different SQLAlchemy insert constructs.
+"""
+from typing import Union
+
+from sqlalchemy import Date, cast, func, literal_column, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Union[Session, AsyncSession], table):
+    """Return an `insert(table)` that supports `.on_conflict_do_*()` for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def lock_table_for_writes(db: Union[Session, AsyncSession], table):
+    """
+    Block other writers of `table` until the session's transaction ends (readers are
+    not blocked). Must be the transaction's first statement so later reads see every
+    write committed before the lock. PostgreSQL only: SQLite has a single writer.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(text(f"LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE"))
+    return None
+
+
+def truncate_timestamp(db: Union[Session, AsyncSession], column, unit: str):
+    """
+    `column` truncated to the start of its hour (unit="hour") or to its date
+    (unit="day"), comparable with DateTime/Date columns written by SQLAlchemy.
+    Literals are inlined so the expression can be repeated in GROUP BY.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        if unit == "hour":
+            return func.date_trunc(literal_column("'hour'"), column)
+        return cast(column, Date)
+    # SQLite keeps DateTime as 'YYYY-MM-DD HH:MM:SS.ffffff' and Date as 'YYYY-MM-DD' text
+    if unit == "hour":
+        return func.strftime(literal_column("'%Y-%m-%d %H:00:00.000000'"), column)
+    return func.date(column)
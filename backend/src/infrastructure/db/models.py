@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Index, Uuid, Integer, Float, DateTime, LargeBinary, Enum as SQLEnum, Time
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, ForeignKey, Index, PrimaryKeyConstraint, UniqueConstraint, Uuid, Integer, BigInteger, Float, Date, DateTime, LargeBinary, Enum as SQLEnum, Time
+from sqlalchemy.orm import relationship, validates
 from uuid import uuid4
 from datetime import datetime
-from src.infrastructure.db.types import EncryptedString
+from src.infrastructure.db.types import EncryptedString, lazily_decrypted
 from src.infrastructure.db.database import Base
 from src.domain.health_models import TherapyType
+from src.domain.nutrition import normalize_ingredient_name
 import datetime as dt
 
 class UserModel(Base):
@@ -87,6 +88,8 @@ class IngredientModel(Base):
 
     id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String, unique=True, index=True, nullable=False)
+    # Clave de búsqueda sin tildes ni mayúsculas ("platano" encuentra "Plátano")
+    name_normalized = Column(String, index=True, nullable=False)
     glycemic_index = Column(Integer, nullable=False) # 0-100
     carbs_per_100g = Column(Float, nullable=False)
     fiber_per_100g = Column(Float, nullable=False, default=0.0)
@@ -94,6 +97,11 @@ class IngredientModel(Base):
     # Metadata for AI/OCR future matching
     barcode = Column(String, index=True, nullable=True) 
 
+    @validates("name")
+    def _sync_name_normalized(self, key, value):
+        self.name_normalized = normalize_ingredient_name(value) if value is not None else None
+        return value
+
 class MealLogModel(Base):
     __tablename__ = "meals_log"
 
@@ -112,10 +120,16 @@ class MealLogModel(Base):
     bolus_units_administered = Column(Float, nullable=True)
 
     # Sensitive data (e.g. "I felt dizzy") -> Encrypted
-    notes = Column(EncryptedString, nullable=True)
+    _notes = Column("notes", EncryptedString, nullable=True)
+    notes = lazily_decrypted("_notes")
 
     # Relationships
     patient = relationship("PatientModel", backref="meals")
+
+    # Keyset pagination of history: WHERE patient_id = ? ORDER BY timestamp DESC, id
+    __table_args__ = (
+        Index("ix_meals_log_patient_timestamp_id", "patient_id", timestamp.desc(), "id"),
+    )
     # user = relationship("UserModel", back_populates="meals") # DEPRECATED linkage
     items = relationship("MealItemModel", back_populates="meal", cascade="all, delete-orphan")
 
@@ -163,6 +177,28 @@ class XPTransactionModel(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
 
 
+class UserXPBalanceModel(Base):
+    """Materialized XP total per user, kept in sync with xp_transactions by XPRepository.add_xp"""
+    __tablename__ = "user_xp_balance"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_xp = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class KeyRotationCheckpointModel(Base):
+    """Re-encryption progress per table and primary key, so the rotation job can resume after a crash"""
+    __tablename__ = "key_rotation_checkpoints"
+
+    table_name = Column(String(64), primary_key=True)
+    key_id = Column(String(16), primary_key=True)  # CryptoService.primary_key_id
+    last_id = Column(Uuid(as_uuid=True), nullable=True)  # Keyset cursor: last row id processed
+    rows_scanned = Column(Integer, nullable=False, default=0)
+    rows_rotated = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class UserAchievementModel(Base):
     """User's unlocked achievements"""
     __tablename__ = "user_achievements"
@@ -188,7 +224,69 @@ class GlucoseMeasurementModel(Base):
     
     # Metadata
     measurement_type = Column(String(20), default="FINGER", nullable=False) # FINGER, CGM, MANUAL
-    notes = Column(EncryptedString, nullable=True) # Sensitive notes
+    _notes = Column("notes", EncryptedString, nullable=True) # Sensitive notes
+    notes = lazily_decrypted("_notes")
     
     # Relationships
     patient = relationship("PatientModel", backref="glucose_logs")
+
+    # Keyset pagination of history: WHERE patient_id = ? ORDER BY timestamp DESC, id
+    __table_args__ = (
+        Index("ix_glucose_measurements_patient_timestamp_id", "patient_id", timestamp.desc(), "id"),
+        # Idempotent uploads: the same reading re-sent by a CGM backfill is ignored
+        UniqueConstraint("patient_id", "timestamp", "measurement_type", name="uq_glucose_patient_timestamp_type"),
+    )
+
+
+class GlucoseMeasurementConflictModel(Base):
+    """
+    Readings set aside by migration 015: same (patient_id, timestamp, measurement_type)
+    as a kept reading but a different value or notes. Kept for manual review; no FK,
+    so the row survives even if the kept reading is later deleted.
+    """
+    __tablename__ = "glucose_measurement_conflicts"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True)  # id it had in glucose_measurements
+    patient_id = Column(Uuid(as_uuid=True), nullable=False, index=True)
+    glucose_value = Column(Integer, nullable=False)
+    timestamp = Column(DateTime)
+    measurement_type = Column(String(20), nullable=False)
+    notes = Column(EncryptedString, nullable=True)
+    kept_id = Column(Uuid(as_uuid=True), nullable=False)  # the reading left in glucose_measurements
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class _GlucoseRollupColumns:
+    """
+    Sufficient statistics of a patient's readings in one time bucket, kept in sync
+    with glucose_measurements by GlucoseRepository. Range bands use the fixed
+    consensus thresholds (<54, 54-69, 70-180, 181-250, >250).
+    """
+    patient_id = Column(Uuid(as_uuid=True), ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
+    count = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)  # sum of glucose_value
+    total_squares = Column(BigInteger, nullable=False)  # sum of glucose_value²
+    minimum = Column(Integer, nullable=False)
+    maximum = Column(Integer, nullable=False)
+    very_low = Column(Integer, nullable=False)
+    low = Column(Integer, nullable=False)
+    in_range = Column(Integer, nullable=False)
+    high = Column(Integer, nullable=False)
+    very_high = Column(Integer, nullable=False)
+
+    # Window reads scan one patient's buckets in order
+    __table_args__ = (PrimaryKeyConstraint("patient_id", "bucket"),)
+
+
+class GlucoseHourlyModel(_GlucoseRollupColumns, Base):
+    """Hourly glucose rollup: bucket is the start of the hour (naive UTC)"""
+    __tablename__ = "glucose_hourly"
+
+    bucket = Column(DateTime, nullable=False)
+
+
+class GlucoseDailyModel(_GlucoseRollupColumns, Base):
+    """Daily glucose rollup: bucket is the UTC date"""
+    __tablename__ = "glucose_daily"
+
+    bucket = Column(Date, nullable=False)
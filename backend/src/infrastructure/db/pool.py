@@ -0,0 +1,207 @@
+"""
+Connection pool configuration and instrumentation.
+
+Pool sizing comes from the environment so it can be tuned per deployment (the API
+container is limited to 0.5 CPU) without a rebuild:
+
+    DB_POOL_SIZE          persistent connections kept open         (default 5)
+    DB_MAX_OVERFLOW       extra connections opened under load      (default 10)
+    DB_POOL_TIMEOUT       seconds to wait for a free connection    (default 30)
+    DB_POOL_RECYCLE       max connection age in seconds, -1 = off  (default 1800)
+    DB_POOL_PRE_PING      test connections on checkout             (default true)
+
+Pre-ping and recycle make the pool survive a Postgres restart: stale connections
+are detected on checkout and replaced instead of failing the request. The sync and
+async engines each get a pool with these settings, so one worker can hold up to
+2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections, plus the LISTEN connection of
+the postgres pub/sub broker.
+"""
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the checkout-wait histogram buckets; +Inf is implicit
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = 1800
+    pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        defaults = cls()
+        return cls(
+            size=int(os.getenv("DB_POOL_SIZE", defaults.size)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", defaults.max_overflow)),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", defaults.timeout)),
+            recycle=int(os.getenv("DB_POOL_RECYCLE", defaults.recycle)),
+            pre_ping=_env_bool("DB_POOL_PRE_PING", defaults.pre_ping),
+        )
+
+    def engine_kwargs(self, is_async: bool = False) -> dict:
+        return {
+            "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": self.pre_ping,
+        }
+
+    def describe(self) -> str:
+        return (
+            f"pool_size={self.size} max_overflow={self.max_overflow} timeout={self.timeout:g}s "
+            f"recycle={self.recycle}s pre_ping={self.pre_ping}"
+        )
+
+
+class PoolMetrics:
+    """
+    Counters fed by SQLAlchemy pool events (connect, checkout, checkin, invalidate)
+    plus checkout-wait timings recorded by the instrumented pool classes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_use = 0
+            self.connections_opened = 0
+            self.overflow_opened = 0
+            self.checkouts = 0
+            self.checkout_timeouts = 0
+            self.invalidations = 0
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+            self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)
+
+    def attach(self, engine: Engine) -> None:
+        self._engines.add(engine)
+
+        def on_connect(dbapi_connection, connection_record):
+            # QueuePool.overflow() > 0 once connections beyond pool_size are open
+            pool = engine.pool
+            self._on_connect(isinstance(pool, QueuePool) and pool.overflow() > 0)
+
+        event.listen(engine, "connect", on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def observe_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def record_checkout_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def overflow_in_use(self) -> int:
+        """Connections currently open beyond pool_size, over every attached engine."""
+        # engine.pool, not a saved pool: dispose() replaces it
+        pools = [engine.pool for engine in list(self._engines)]
+        return sum(max(0, pool.overflow()) for pool in pools if isinstance(pool, QueuePool))
+
+    def checkout_wait_histogram(self) -> Tuple[Tuple[float, ...], List[int], float, int]:
+        """(bucket bounds, per-bucket counts with +Inf last, sum, count) of the checkout waits."""
+        with self._lock:
+            return CHECKOUT_WAIT_BUCKETS, list(self.wait_buckets), self.wait_sum, self.wait_count
+
+    def stats(self) -> dict:
+        overflow_in_use = self.overflow_in_use()
+        with self._lock:
+            return {
+                "in_use": self.in_use,
+                "overflow_in_use": overflow_in_use,
+                "connections_opened": self.connections_opened,
+                "overflow_opened": self.overflow_opened,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "invalidations": self.invalidations,
+                "checkout_wait_count": self.wait_count,
+                "checkout_wait_sum_seconds": round(self.wait_sum, 6),
+                "checkout_wait_max_seconds": round(self.wait_max, 6),
+            }
+
+    def _on_connect(self, overflowed: bool) -> None:
+        with self._lock:
+            self.connections_opened += 1
+            if overflowed:
+                self.overflow_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+
+@lru_cache(maxsize=1)
+def get_pool_metrics() -> PoolMetrics:
+    return PoolMetrics()
+
+
+class _CheckoutTimingMixin:
+    """
+    Times each checkout from request to usable connection: waiting for a free slot,
+    opening a new connection and the pre-ping. Pool events fire only after a
+    connection is handed out, so the wait itself is measured around `connect()`.
+    """
+
+    def connect(self):
+        metrics = get_pool_metrics()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.record_checkout_timeout()
+            raise
+        finally:
+            metrics.observe_checkout_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """Same instrumentation for the asyncio engine (asyncpg)."""
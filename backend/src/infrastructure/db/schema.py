@@ -0,0 +1,120 @@
+"""
+Schema handling at API startup, selected with STARTUP_MODE.
+
+- verify (default): check that the database is at the Alembic head revision and
+  refuse to start otherwise. One SELECT on alembic_version; no reflection, no DDL.
+  entrypoint.sh runs `alembic upgrade head` before the workers start.
+- migrate: run `alembic upgrade head` from the app, serialized across workers
+  with a PostgreSQL advisory lock. The migrations target PostgreSQL, so on
+  other backends (local SQLite runs) the tables are created from the models.
+- none: touch nothing (schema managed externally, or tests).
+"""
+import ast
+import os
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet
+
+from sqlalchemy import Engine, func, inspect, select, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+# Arbitrary, app-wide key for pg_advisory_lock: one migrating worker at a time
+MIGRATION_LOCK_KEY = 71_160_016
+
+
+class StartupMode(str, Enum):
+    MIGRATE = "migrate"
+    VERIFY = "verify"
+    NONE = "none"
+
+
+class SchemaMismatchError(RuntimeError):
+    """The database is not at the Alembic head revision of this build."""
+
+
+def startup_mode_from_env() -> StartupMode:
+    return StartupMode(os.getenv("STARTUP_MODE", StartupMode.VERIFY.value).strip().lower())
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    # Keep the app's logging configuration (env.py would load alembic.ini's)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def _revision_ids(value) -> FrozenSet[str]:
+    if value is None:
+        return frozenset()
+    return frozenset([value]) if isinstance(value, str) else frozenset(value)
+
+
+@lru_cache()
+def expected_heads() -> FrozenSet[str]:
+    """
+    Head revision(s) of the migration scripts shipped with this build.
+
+    Read from the `revision`/`down_revision` constants of each file with `ast`
+    instead of alembic's ScriptDirectory, which would import alembic and execute
+    every migration module just to verify the schema at startup.
+    """
+    revisions, parents = set(), set()
+    for path in (BACKEND_DIR / "alembic" / "versions").glob("*.py"):
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.Assign):
+                target, value = node.targets[0], node.value
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                target, value = node.target, node.value
+            else:
+                continue
+            if isinstance(target, ast.Name) and target.id == "revision":
+                revisions.add(ast.literal_eval(value))
+            elif isinstance(target, ast.Name) and target.id == "down_revision":
+                parents |= _revision_ids(ast.literal_eval(value))
+    return frozenset(revisions - parents)
+
+
+def current_heads(engine: Engine) -> FrozenSet[str]:
+    """Revision(s) recorded in the database's alembic_version table (empty if none)."""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            return frozenset()
+        return frozenset(connection.scalars(text("SELECT version_num FROM alembic_version")))
+
+
+def verify_schema(engine: Engine) -> None:
+    expected, current = expected_heads(), current_heads(engine)
+    if current != expected:
+        raise SchemaMismatchError(
+            f"Database schema is at {sorted(current) or 'no revision'}, this build expects "
+            f"{sorted(expected)}. Run `alembic upgrade head` or start with STARTUP_MODE=migrate."
+        )
+
+
+def migrate_schema(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        from src.infrastructure.db.database import Base
+        import src.infrastructure.db.models  # noqa: F401  (register the tables)
+        Base.metadata.create_all(bind=engine)
+        return
+
+    from alembic import command
+
+    with engine.connect() as lock:
+        lock.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_KEY)))
+        try:
+            command.upgrade(_alembic_config(), "head")
+        finally:
+            lock.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_KEY)))
+
+
+def prepare_schema(engine: Engine, mode: StartupMode) -> None:
+    if mode is StartupMode.MIGRATE:
+        migrate_schema(engine)
+    elif mode is StartupMode.VERIFY:
+        verify_schema(engine)
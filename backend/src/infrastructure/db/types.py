@@ -1,7 +1,36 @@
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
+from sqlalchemy import Select, inspect, type_coerce
+from sqlalchemy.orm import defer, synonym
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.types import TypeDecorator, LargeBinary
 from sqlalchemy.ext.mutable import Mutable
-from src.infrastructure.security.crypto import get_crypto_service
+from src.infrastructure.security.crypto import get_crypto_service, get_decrypt_executor
+
+# Pages smaller than this are decrypted inline: handing them to the pool costs
+# more than the Fernet work itself.
+PARALLEL_DECRYPT_MIN_ROWS = 512
+DECRYPT_CHUNK_ROWS = 256
+
+# Instance __dict__ entry holding the per-page loaders set by attach_lazy_decryption
+_PENDING_DECRYPTION_KEY = "_pending_decryption"
+
+
+def _decrypt_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        # If plain string (fallback/legacy), return it
+        if isinstance(value, str):
+            return value
+
+        crypto = get_crypto_service()
+        return crypto.decrypt(value)
+    except Exception:
+        # Last ditch effort: decode bytes
+        if isinstance(value, bytes):
+            return value.decode("utf-8", errors="ignore")
+        return str(value)
+
 
 class EncryptedString(TypeDecorator):
     """
@@ -22,17 +51,110 @@ class EncryptedString(TypeDecorator):
             return str(value).encode()
 
     def process_result_value(self, value: Any, dialect: Any) -> Optional[str]:
-        if value is None:
-            return None
-        try:
-            # If plain string (fallback/legacy), return it
-            if isinstance(value, str):
-                return value
-            
-            crypto = get_crypto_service()
-            return crypto.decrypt(value)
-        except Exception:
-            # Last ditch effort: decode bytes
-            if isinstance(value, bytes):
-                return value.decode("utf-8", errors="ignore")
-            return str(value)
+        return _decrypt_value(value)
+
+
+def decrypt_many(values: Sequence[Any]) -> List[Optional[str]]:
+    """
+    Decrypt a batch of EncryptedString column values, in order.
+
+    Large batches are split into chunks and decrypted on the shared decrypt
+    pool (when the host has spare cores); small ones run inline.
+    """
+    executor = get_decrypt_executor()
+    if executor is None or len(values) < PARALLEL_DECRYPT_MIN_ROWS:
+        return [_decrypt_value(value) for value in values]
+
+    def chunk(start: int) -> List[Optional[str]]:
+        return [_decrypt_value(value) for value in values[start:start + DECRYPT_CHUNK_ROWS]]
+
+    result: List[Optional[str]] = []
+    for part in executor.map(chunk, range(0, len(values), DECRYPT_CHUNK_ROWS)):
+        result.extend(part)
+    return result
+
+
+class DecryptionBatch:
+    """Ciphertexts of one column over a result page, decrypted together on first read."""
+
+    def __init__(self, values: Sequence[Any]):
+        self._values = values
+        self._plain: Optional[List[Optional[str]]] = None
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if self._plain is None:
+            self._plain = decrypt_many(self._values)
+            self._values = ()
+        return self._plain[index]
+
+    def loader(self, index: int):
+        return lambda: self[index]
+
+
+class _LazyDecryptedAttribute:
+    """Python side of `lazily_decrypted`: resolves a pending page loader on first read."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+        pending = obj.__dict__.get(_PENDING_DECRYPTION_KEY)
+        loader = pending.pop(self.key, None) if pending else None
+        if loader is not None:
+            state = inspect(obj)
+            # Expired or already populated (refresh, write): the loader is stale
+            if self.key not in state.dict and self.key not in state.expired_attributes:
+                set_committed_value(obj, self.key, loader())
+        return getattr(obj, self.key)
+
+    def __set__(self, obj, value) -> None:
+        pending = obj.__dict__.get(_PENDING_DECRYPTION_KEY)
+        if pending:
+            pending.pop(self.key, None)
+        setattr(obj, self.key, value)
+
+
+def lazily_decrypted(key: str):
+    """
+    Public name of an EncryptedString column mapped under `key`:
+
+        _notes = Column("notes", EncryptedString, nullable=True)
+        notes = lazily_decrypted("_notes")
+
+    Behaves like the column in queries and on write; on read it lets
+    `attach_lazy_decryption` supply the value from a page-wide batch.
+    """
+    return synonym(key, descriptor=_LazyDecryptedAttribute(key))
+
+
+def select_encrypted_lazily(stmt: Select, *columns) -> Select:
+    """
+    Defer the given EncryptedString columns of an ORM select and fetch their raw
+    ciphertext in the same query instead. Pair with `attach_lazy_decryption`.
+    """
+    return stmt.options(*(defer(column) for column in columns)).add_columns(
+        *(type_coerce(column, LargeBinary) for column in columns)
+    )
+
+
+def attach_lazy_decryption(rows: Sequence[Any], *columns) -> List[Any]:
+    """
+    Take the rows of a `select_encrypted_lazily` query and return the entities.
+    The columns must be mapped with `lazily_decrypted`.
+
+    Reading one of the columns on any entity decrypts that column for the whole
+    page at once (see `decrypt_many`); pages whose encrypted columns are never
+    read pay no crypto cost. Entities already loaded in the session keep their
+    value, as with any ORM query.
+    """
+    entities = [row[0] for row in rows]
+    for offset, column in enumerate(columns, start=1):
+        key = column.property.key
+        batch = DecryptionBatch([row[offset] for row in rows])
+        for index, entity in enumerate(entities):
+            if key in inspect(entity).dict:
+                continue
+            entity.__dict__.setdefault(_PENDING_DECRYPTION_KEY, {})[key] = batch.loader(index)
+    return entities
@@ -5,9 +5,10 @@ Repository for XP and achievement data access operations.
 Handles all database interactions for the gamification system.
 """
 
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 
 from src.domain.xp_models import (
@@ -18,12 +19,40 @@ from src.domain.xp_models import (
     UserAchievement,
     UserAchievementCreate,
     UserXPSummary,
+    XPBalanceDrift,
 )
 from src.infrastructure.db.models import (
     XPTransactionModel,
     AchievementModel,
     UserAchievementModel,
+    UserXPBalanceModel,
 )
+from src.infrastructure.db.dialects import lock_table_for_writes, upsert_insert
+
+
+def _new_transaction(user_id: UUID, amount: int, reason: str, description: str) -> XPTransactionModel:
+    return XPTransactionModel(
+        id=uuid4(),
+        user_id=user_id,
+        amount=amount,
+        reason=reason,
+        description=description,
+        timestamp=datetime.utcnow()
+    )
+
+
+def _balance_increment_stmt(db, user_id: UUID, amount: int):
+    table = UserXPBalanceModel.__table__
+    now = datetime.utcnow()
+    stmt = upsert_insert(db, table).values(user_id=user_id, total_xp=amount, updated_at=now)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"total_xp": table.c.total_xp + stmt.excluded.total_xp, "updated_at": now},
+    )
+
+
+def _balance_stmt(user_id: UUID):
+    return select(UserXPBalanceModel.total_xp).where(UserXPBalanceModel.user_id == user_id)
 
 
 class XPRepository:
@@ -39,7 +68,8 @@ class XPRepository:
         user_id: UUID,
         amount: int,
         reason: str,
-        description: str
+        description: str,
+        commit: bool = True
     ) -> XPTransaction:
         """
         Add XP transaction for a user.
@@ -49,22 +79,32 @@ class XPRepository:
             amount: XP amount (positive or negative)
             reason: XPReason enum value
             description: Human-readable description
+            commit: When False the award is only staged in the session, so the
+                caller can commit it together with its own writes
             
         Returns:
             Created XP transaction
         """
-        transaction_model = XPTransactionModel(
-            user_id=user_id,
-            amount=amount,
-            reason=reason,
-            description=description,
-            timestamp=datetime.utcnow()
-        )
+        transaction_model = _new_transaction(user_id, amount, reason, description)
         self.db.add(transaction_model)
-        self.db.commit()
-        self.db.refresh(transaction_model)
+        # Ledger row and balance increment are committed together
+        self._increment_balance(user_id, amount)
+        # Every column is set client-side: validate before commit expires the
+        # instance instead of reloading it with a refresh SELECT
+        transaction = XPTransaction.model_validate(transaction_model)
+        if commit:
+            self.db.commit()
+        
+        return transaction
+    
+    def _increment_balance(self, user_id: UUID, amount: int) -> None:
+        """
+        Atomically add `amount` to the user's materialized balance.
         
-        return XPTransaction.model_validate(transaction_model)
+        Uses INSERT ... ON CONFLICT DO UPDATE SET total_xp = total_xp + amount, so
+        concurrent awards serialize on the balance row instead of losing updates.
+        """
+        self.db.execute(_balance_increment_stmt(self.db, user_id, amount))
     
     def get_user_xp_history(
         self,
@@ -96,7 +136,23 @@ class XPRepository:
     
     def get_user_total_xp(self, user_id: UUID) -> int:
         """
-        Calculate total XP for a user.
+        Get total XP for a user from the materialized balance (primary-key read).
+        
+        Args:
+            user_id: User's UUID
+            
+        Returns:
+            Total XP (0 if the user has never earned XP)
+        """
+        result = self.db.execute(_balance_stmt(user_id)).scalar()
+        return int(result or 0)
+    
+    def get_ledger_total_xp(self, user_id: UUID) -> int:
+        """
+        Calculate total XP for a user by summing the transaction ledger.
+        
+        This is the source of truth the balance is reconciled against; it scans
+        the user's whole history, so request paths should use get_user_total_xp.
         
         Args:
             user_id: User's UUID
@@ -112,6 +168,55 @@ class XPRepository:
         result = self.db.execute(stmt).scalar()
         return int(result)
     
+    def reconcile_balances(self, fix: bool = True) -> list[XPBalanceDrift]:
+        """
+        Rebuild materialized balances from the ledger and report drift.
+        
+        With fix=True the balance table is locked against writes before the ledger
+        is read, so an add_xp committing meanwhile either is in the sums or waits
+        and increments the corrected balance; none is overwritten. Awards block
+        for the duration of the run, which must start outside a transaction (a
+        fresh session, as in scripts/reconcile_xp_balances.py). A dry run takes no
+        lock and may report drift against a slightly older snapshot.
+        
+        Args:
+            fix: When True, overwrite drifted (or missing) balances with the ledger total
+            
+        Returns:
+            One entry per user whose stored balance differs from the ledger
+        """
+        if fix:
+            lock_table_for_writes(self.db, UserXPBalanceModel.__table__)
+        ledger_stmt = (
+            select(XPTransactionModel.user_id, func.sum(XPTransactionModel.amount))
+            .group_by(XPTransactionModel.user_id)
+        )
+        ledger = {user_id: int(total) for user_id, total in self.db.execute(ledger_stmt)}
+        stored = {
+            user_id: total
+            for user_id, total in self.db.execute(select(UserXPBalanceModel.user_id, UserXPBalanceModel.total_xp))
+        }
+        
+        drifts = [
+            XPBalanceDrift(user_id=user_id, stored_total=stored.get(user_id), ledger_total=ledger.get(user_id, 0))
+            for user_id in ledger.keys() | stored.keys()
+            if stored.get(user_id) != ledger.get(user_id, 0)
+        ]
+        
+        if fix:
+            table = UserXPBalanceModel.__table__
+            now = datetime.utcnow()
+            for d in drifts:
+                stmt = upsert_insert(self.db, table).values(user_id=d.user_id, total_xp=d.ledger_total, updated_at=now)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.user_id],
+                    set_={"total_xp": stmt.excluded.total_xp, "updated_at": now},
+                )
+                self.db.execute(stmt)
+            self.db.commit()  # releases the lock, drift or not
+        
+        return drifts
+    
     def get_user_xp_summary(self, user_id: UUID) -> UserXPSummary:
         """
         Get complete XP summary for a user.
@@ -208,7 +313,8 @@ class XPRepository:
                 user_id=user_id,
                 amount=achievement.xp_reward,
                 reason="achievement_unlocked",
-                description=f"Unlocked: {achievement.name}"
+                description=f"Unlocked: {achievement.name}",
+                commit=False
             )
         
         self.db.commit()
@@ -289,3 +395,38 @@ class XPRepository:
         
         results = self.db.execute(stmt).scalars().all()
         return [Achievement.model_validate(r) for r in results]
+
+
+class AsyncXPRepository:
+    """XPRepository operations used by the async routers (AsyncSession)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def add_xp(
+        self,
+        user_id: UUID,
+        amount: int,
+        reason: str,
+        description: str,
+        commit: bool = True
+    ) -> XPTransaction:
+        """
+        Add XP transaction for a user and bump the materialized balance.
+        
+        Same contract as XPRepository.add_xp, including commit=False to join the
+        caller's unit of work.
+        """
+        transaction_model = _new_transaction(user_id, amount, reason, description)
+        self.db.add(transaction_model)
+        await self.db.execute(_balance_increment_stmt(self.db, user_id, amount))
+        transaction = XPTransaction.model_validate(transaction_model)
+        if commit:
+            await self.db.commit()
+        
+        return transaction
+    
+    async def get_user_total_xp(self, user_id: UUID) -> int:
+        """Total XP from the materialized balance (primary-key read)."""
+        result = (await self.db.execute(_balance_stmt(user_id))).scalar()
+        return int(result or 0)
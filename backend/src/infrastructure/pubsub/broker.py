@@ -0,0 +1,231 @@
+"""
+Publish/subscribe of live events (new glucose readings) to streaming clients.
+
+Subscribers live in the worker that holds their connection; publishers call
+`publish(channel, message)` once the data is committed. The backend decides
+which subscribers see the message:
+
+    PUBSUB_BACKEND=memory    subscribers of this worker only (default; enough
+                             with a single Uvicorn worker)
+    PUBSUB_BACKEND=postgres  every worker: messages go through PostgreSQL
+                             NOTIFY and each worker LISTENs on one connection
+
+Another backend (Redis, NATS...) only needs `publish` to reach every worker
+and each worker to call `deliver` for what it receives (see PostgresBroker).
+
+An idle subscriber costs a deque and, while waiting, one future. A subscriber
+that falls behind keeps the newest SUBSCRIBER_MAX_PENDING messages only.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_MAX_PENDING = 32
+# Single NOTIFY channel; the broker channel travels in the payload
+PG_NOTIFY_CHANNEL = "diabeaty_events"
+# NOTIFY payloads are limited to 8000 bytes
+PG_NOTIFY_MAX_PAYLOAD = 7900
+PG_RECONNECT_MAX_DELAY = 30.0
+
+
+class Subscription:
+    """Messages of one channel for one subscriber, in publication order."""
+
+    __slots__ = ("channel", "_broker", "_pending", "_waiter")
+
+    def __init__(self, broker: "InProcessBroker", channel: str, max_pending: int):
+        self.channel = channel
+        self._broker = broker
+        self._pending: deque = deque(maxlen=max_pending)
+        self._waiter: Optional[asyncio.Future] = None
+
+    def _push(self, message: str) -> None:
+        self._pending.append(message)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Next message, or None if `timeout` seconds pass without one."""
+        if not self._pending:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._waiter = None
+        return self._pending.popleft()
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class InProcessBroker:
+    """Fan-out to the subscribers of this process. Must be used from the event loop thread."""
+
+    def __init__(self, max_pending: int = SUBSCRIBER_MAX_PENDING):
+        self.max_pending = max_pending
+        self._channels: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.max_pending)
+        self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    def deliver(self, channel: str, message: str) -> int:
+        """Hand `message` to this process's subscribers of `channel`. Returns how many got it."""
+        subscribers = self._channels.get(channel, ())
+        for subscription in subscribers:
+            subscription._push(message)
+        return len(subscribers)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.deliver(channel, message)
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self._channels.values())
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Fan-out across workers with PostgreSQL LISTEN/NOTIFY on a dedicated asyncpg
+    connection per worker. If that connection drops, it is re-established with
+    exponential backoff; messages published meanwhile are lost (clients resync
+    from GET /glucose/history on reconnect).
+    """
+
+    def __init__(self, dsn: str, max_pending: int = SUBSCRIBER_MAX_PENDING):
+        super().__init__(max_pending)
+        self.dsn = dsn
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._reconnect: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Connect and LISTEN; if PostgreSQL is unreachable, keep retrying in the background."""
+        self._stopping = False
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.warning("Pub/sub LISTEN connection failed (%s); retrying in the background", e)
+            self._reconnect = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(PG_NOTIFY_CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    def _on_notify(self, conn, pid, notify_channel, payload: str) -> None:
+        event = json.loads(payload)
+        self.deliver(event["channel"], event["message"])
+
+    def _on_terminated(self, conn) -> None:
+        self._conn = None
+        if not self._stopping and self._reconnect is None:
+            logger.warning("Pub/sub LISTEN connection lost; reconnecting")
+            self._reconnect = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        delay = 0.5
+        try:
+            while not self._stopping:
+                try:
+                    await self._connect()
+                    logger.info("Pub/sub LISTEN connection restored")
+                    return
+                except Exception as e:  # OSError or any asyncpg error
+                    logger.warning("Pub/sub reconnect failed (%s); retrying in %.1fs", e, delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, PG_RECONNECT_MAX_DELAY)
+        finally:
+            self._reconnect = None
+
+    async def publish(self, channel: str, message: str) -> None:
+        """
+        NOTIFY every worker. Publishing runs after the data is committed, so it
+        never raises: on failure (too large, not connected) only this worker's
+        subscribers get the message.
+        """
+        payload = json.dumps({"channel": channel, "message": message})
+        try:
+            if len(payload.encode()) > PG_NOTIFY_MAX_PAYLOAD:
+                raise ValueError(f"{len(payload)} bytes exceeds the NOTIFY payload limit")
+            if self._conn is None:
+                raise ConnectionError("LISTEN connection is down")
+            # One query at a time per asyncpg connection; this worker's NOTIFY comes
+            # back through its own LISTEN, so local subscribers are served from there
+            async with self._lock:
+                await self._conn.execute("SELECT pg_notify($1, $2)", PG_NOTIFY_CHANNEL, payload)
+        except Exception as e:
+            logger.warning("Pub/sub NOTIFY failed (%s); delivering %s locally only", e, channel)
+            self.deliver(channel, message)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    from sqlalchemy.engine import make_url
+
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _web_concurrency() -> int:
+    """Worker processes as set by entrypoint.sh; 1 when unset (a single Uvicorn process)."""
+    try:
+        return int(os.getenv("WEB_CONCURRENCY") or 1)
+    except ValueError:
+        return 1
+
+
+@lru_cache(maxsize=1)
+def get_broker() -> InProcessBroker:
+    backend = os.getenv("PUBSUB_BACKEND", "memory").strip().lower()
+    if backend == "postgres":
+        from src.infrastructure.db.database import DATABASE_URL
+
+        return PostgresBroker(_asyncpg_dsn(DATABASE_URL))
+    if backend != "memory":
+        raise ValueError(f"Unknown PUBSUB_BACKEND {backend!r} (expected 'memory' or 'postgres')")
+    workers = _web_concurrency()
+    if workers > 1:
+        logger.error(
+            "PUBSUB_BACKEND=memory with WEB_CONCURRENCY=%d: stream clients only receive readings "
+            "posted to their own worker, the rest are dropped. Set PUBSUB_BACKEND=postgres.",
+            workers,
+        )
+    return InProcessBroker()
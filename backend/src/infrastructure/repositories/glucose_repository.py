@@ -1,56 +1,419 @@
 
+from sqlalchemy import Row, Select, and_, func, literal_column, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from uuid import UUID
-from typing import List, Optional
-from datetime import datetime
+from uuid import UUID, uuid4
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from datetime import datetime, timedelta
 
-from src.infrastructure.db.models import GlucoseMeasurementModel
+from src.infrastructure.db.models import GlucoseMeasurementModel, HealthProfileModel
+from src.infrastructure.db.dialects import upsert_insert
+from src.infrastructure.db.types import attach_lazy_decryption, select_encrypted_lazily
+from src.infrastructure.repositories.glucose_rollups import (
+    BANDS,
+    band_counts,
+    rebuild_stmts,
+    rollup_increments,
+    trend_stmt,
+    window_parts,
+)
 from src.domain.glucose_models import GlucoseCreateRequest
+from src.domain.glucose_stats import (
+    DEFAULT_TARGET_RANGE_HIGH,
+    DEFAULT_TARGET_RANGE_LOW,
+    GlucoseAggregates,
+)
+
+# Rows per INSERT statement: 6 bind params per row stays well below the
+# PostgreSQL (65535) and SQLite (32766) parameter limits.
+BULK_INSERT_CHUNK = 1000
+
+# Summaries over windows longer than this read the hourly/daily rollups
+ROLLUP_MIN_WINDOW = timedelta(days=1)
+
+# Rows per fetch when streaming a trace (server-side cursor on PostgreSQL)
+SERIES_FETCH_SIZE = 1000
+
+# History projection without the encrypted notes column: list pages that do not
+# return notes neither fetch nor decrypt them.
+HISTORY_SUMMARY_COLUMNS = (
+    GlucoseMeasurementModel.id,
+    GlucoseMeasurementModel.patient_id,
+    GlucoseMeasurementModel.glucose_value,
+    GlucoseMeasurementModel.timestamp,
+    GlucoseMeasurementModel.measurement_type,
+)
+
+
+def _new_measurement(patient_id: UUID, data: GlucoseCreateRequest) -> GlucoseMeasurementModel:
+    # id and timestamp are set client-side so the row is complete without a refresh
+    return GlucoseMeasurementModel(
+        id=uuid4(),
+        patient_id=patient_id,
+        glucose_value=data.value,
+        timestamp=data.timestamp,
+        measurement_type=data.measurement_type.value,
+        notes=data.notes
+    )
+
+
+def _bulk_rows(patient_id: UUID, items: Sequence[GlucoseCreateRequest]) -> List[dict]:
+    """Insert parameters for `items`, dropping readings repeated inside the batch."""
+    rows, seen = [], set()
+    for item in items:
+        key = (item.timestamp, item.measurement_type.value)
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append({
+            "id": uuid4(),
+            "patient_id": patient_id,
+            "glucose_value": item.value,
+            "timestamp": item.timestamp,
+            "measurement_type": item.measurement_type.value,
+            "notes": item.notes,
+        })
+    return rows
+
+
+def _bulk_insert_stmt(db, table):
+    # executemany + RETURNING uses SQLAlchemy's "insertmanyvalues": rows are sent
+    # as multi-row VALUES batches and only the rows that did not conflict come back.
+    return upsert_insert(db, table).on_conflict_do_nothing(
+        index_elements=["patient_id", "timestamp", "measurement_type"]
+    ).returning(table.c.id)
+
+
+def _inserted_readings(rows: List[dict], inserted_ids: Set[UUID]) -> List[Tuple[datetime, int]]:
+    return [(row["timestamp"], row["glucose_value"]) for row in rows if row["id"] in inserted_ids]
+
+
+def _history_stmt(
+    patient_id: UUID,
+    limit: int,
+    offset: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    after: Optional[Tuple[datetime, UUID]],
+    include_notes: bool = True,
+) -> Select:
+    if include_notes:
+        stmt = select_encrypted_lazily(select(GlucoseMeasurementModel), GlucoseMeasurementModel.notes)
+    else:
+        stmt = select(*HISTORY_SUMMARY_COLUMNS)
+    stmt = stmt.where(GlucoseMeasurementModel.patient_id == patient_id)
+
+    if start_date:
+        stmt = stmt.where(GlucoseMeasurementModel.timestamp >= start_date)
+
+    if end_date:
+        stmt = stmt.where(GlucoseMeasurementModel.timestamp <= end_date)
+
+    stmt = stmt.order_by(GlucoseMeasurementModel.timestamp.desc(), GlucoseMeasurementModel.id)
+
+    if after:
+        after_ts, after_id = after
+        stmt = stmt.where(or_(
+            GlucoseMeasurementModel.timestamp < after_ts,
+            and_(GlucoseMeasurementModel.timestamp == after_ts, GlucoseMeasurementModel.id > after_id)
+        ))
+    else:
+        stmt = stmt.offset(offset)
+
+    return stmt.limit(limit)
+
+
+def _window_filter(patient_id: UUID, start: datetime, end: datetime) -> tuple:
+    return (
+        GlucoseMeasurementModel.patient_id == patient_id,
+        GlucoseMeasurementModel.timestamp >= start,
+        GlucoseMeasurementModel.timestamp < end,
+    )
+
+
+def _targets_subquery(patient_id: UUID):
+    """One-row derived table with the patient's target range (or the 70-180 default)."""
+    profile = HealthProfileModel
+    return select(
+        func.coalesce(
+            select(profile.target_range_low).where(profile.patient_id == patient_id).scalar_subquery(),
+            DEFAULT_TARGET_RANGE_LOW,
+        ).label("low"),
+        func.coalesce(
+            select(profile.target_range_high).where(profile.patient_id == patient_id).scalar_subquery(),
+            DEFAULT_TARGET_RANGE_HIGH,
+        ).label("high"),
+    ).subquery("targets")
+
+
+def _target_range_stmt(patient_id: UUID) -> Select:
+    """The patient's (low, high) target range, read before choosing between rollups and raw readings."""
+    targets = _targets_subquery(patient_id)
+    return select(targets.c.low, targets.c.high)
+
+
+def _stats_stmt(patient_id: UUID, start: datetime, end: datetime) -> Select:
+    """
+    One aggregate over the readings in [start, end): sufficient statistics plus the
+    count per range band. The target range comes from a one-row derived table,
+    outer-joined so the row exists without readings.
+    """
+    targets = _targets_subquery(patient_id)
+    value = GlucoseMeasurementModel.glucose_value
+    return (
+        select(
+            func.count(value).label("count"),
+            func.coalesce(func.sum(value), 0).label("total"),
+            func.coalesce(func.sum(value * value), 0).label("total_squares"),
+            func.min(value).label("minimum"),
+            func.max(value).label("maximum"),
+            *band_counts(value, targets.c.low, targets.c.high),
+            func.max(targets.c.low).label("target_range_low"),
+            func.max(targets.c.high).label("target_range_high"),
+        )
+        .select_from(targets)
+        .outerjoin(GlucoseMeasurementModel, and_(*_window_filter(patient_id, start, end)))
+    )
+
+
+def _rollup_stats_stmt(patient_id: UUID, start: datetime, end: datetime) -> Select:
+    """
+    _stats_stmt for long windows: adds up the daily and hourly rollup rows covering
+    [start, end) plus the raw readings of the partial edge hours, in one statement.
+    The rollups only count the consensus 70-180 bands, so this is for patients
+    whose target range is that one.
+    """
+    parts = union_all(*window_parts(patient_id, start, end)).subquery("parts")
+    total = lambda column: func.coalesce(func.sum(column), 0).label(column.name)  # noqa: E731
+    return (
+        select(
+            total(parts.c.count),
+            total(parts.c.total),
+            total(parts.c.total_squares),
+            func.min(parts.c.minimum).label("minimum"),
+            func.max(parts.c.maximum).label("maximum"),
+            *(total(parts.c[band]) for band in BANDS),
+            literal_column(str(DEFAULT_TARGET_RANGE_LOW)).label("target_range_low"),
+            literal_column(str(DEFAULT_TARGET_RANGE_HIGH)).label("target_range_high"),
+        )
+    )
+
+
+def _uses_consensus_range(target_range: Row) -> bool:
+    return tuple(target_range) == (DEFAULT_TARGET_RANGE_LOW, DEFAULT_TARGET_RANGE_HIGH)
+
+
+def _series_count_stmt(patient_id: UUID, start: datetime, end: datetime) -> Select:
+    return select(func.count()).select_from(GlucoseMeasurementModel).where(*_window_filter(patient_id, start, end))
+
+
+def _series_stmt(patient_id: UUID, start: datetime, end: datetime) -> Select:
+    return (
+        select(GlucoseMeasurementModel.timestamp, GlucoseMeasurementModel.glucose_value)
+        .where(*_window_filter(patient_id, start, end))
+        .order_by(GlucoseMeasurementModel.timestamp, GlucoseMeasurementModel.id)
+        .execution_options(yield_per=SERIES_FETCH_SIZE)
+    )
+
+
+def _trend_unit(start: datetime, end: datetime) -> str:
+    return "day" if end - start > ROLLUP_MIN_WINDOW else "hour"
+
+
+def _latest_stmt(patient_id: UUID) -> Select:
+    return select(GlucoseMeasurementModel)\
+        .where(GlucoseMeasurementModel.patient_id == patient_id)\
+        .order_by(GlucoseMeasurementModel.timestamp.desc())\
+        .limit(1)
+
 
 class GlucoseRepository:
     def __init__(self, db: Session):
         self.db = db
 
     def create_measurement(self, patient_id: UUID, data: GlucoseCreateRequest) -> GlucoseMeasurementModel:
-        """Create a new glucose measurement record"""
-        measurement = GlucoseMeasurementModel(
-            patient_id=patient_id,
-            glucose_value=data.value,
-            timestamp=data.timestamp,
-            measurement_type=data.measurement_type.value,
-            notes=data.notes
-        )
-        self.db.add(measurement)
+        """
+        Create a new glucose measurement record.
+        Raises IntegrityError if the same (timestamp, measurement_type) is already
+        stored for the patient; the session stays usable (savepoint rollback).
+        """
+        measurement = _new_measurement(patient_id, data)
+        with self.db.begin_nested():
+            self.db.add(measurement)
+        self._add_to_rollups(patient_id, [(measurement.timestamp, measurement.glucose_value)])
         self.db.commit()
         self.db.refresh(measurement)
         return measurement
 
+    def bulk_create_measurements(self, patient_id: UUID, items: Sequence[GlucoseCreateRequest]) -> int:
+        """
+        Insert many measurements with multi-row INSERT ... ON CONFLICT DO NOTHING
+        on (patient_id, timestamp, measurement_type) and commit once.
+
+        Readings repeated inside `items` are dropped before hitting the database;
+        only the rows actually inserted are added to the rollups.
+        Returns the number of rows actually inserted.
+        """
+        rows = _bulk_rows(patient_id, items)
+        if not rows:
+            return 0
+
+        stmt = _bulk_insert_stmt(self.db, GlucoseMeasurementModel.__table__)
+        inserted = set()
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            inserted.update(self.db.execute(stmt, rows[start:start + BULK_INSERT_CHUNK]).scalars())
+        self._add_to_rollups(patient_id, _inserted_readings(rows, inserted))
+        self.db.commit()
+        return len(inserted)
+
+    def _add_to_rollups(self, patient_id: UUID, readings: Iterable[Tuple[datetime, int]]) -> None:
+        for stmt, params in rollup_increments(self.db, patient_id, readings):
+            self.db.execute(stmt, params)
+
+    def rebuild_rollups(self, patient_id: Optional[UUID] = None) -> None:
+        """Regenerate glucose_hourly and glucose_daily from the readings (one patient or all) and commit."""
+        for stmt in rebuild_stmts(self.db, patient_id):
+            self.db.execute(stmt)
+        self.db.commit()
+
     def get_history(
-        self, 
-        patient_id: UUID, 
-        limit: int = 20, 
+        self,
+        patient_id: UUID,
+        limit: int = 20,
         offset: int = 0,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> List[GlucoseMeasurementModel]:
-        """Get glucose history for a patient, ordered by timestamp desc"""
-        query = self.db.query(GlucoseMeasurementModel)\
-            .filter(GlucoseMeasurementModel.patient_id == patient_id)
-
-        if start_date:
-            query = query.filter(GlucoseMeasurementModel.timestamp >= start_date)
-        
-        if end_date:
-            query = query.filter(GlucoseMeasurementModel.timestamp <= end_date)
-
-        return query.order_by(GlucoseMeasurementModel.timestamp.desc())\
-            .limit(limit)\
-            .offset(offset)\
-            .all()
+        end_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_notes: bool = True
+    ) -> List[Union[GlucoseMeasurementModel, Row]]:
+        """
+        Get glucose history for a patient, ordered by timestamp desc.
+
+        When `after` (the timestamp and id of the last row already seen) is given,
+        the page is fetched by keyset on the (patient_id, timestamp DESC, id) index
+        and `offset` is ignored.
+
+        Notes are decrypted lazily, for the whole page at once, on first read.
+        With include_notes=False the page is made of HISTORY_SUMMARY_COLUMNS rows
+        (same attribute names, no `notes`) and the ciphertext is not even fetched.
+        """
+        stmt = _history_stmt(patient_id, limit, offset, start_date, end_date, after, include_notes)
+        rows = self.db.execute(stmt).all()
+        return attach_lazy_decryption(rows, GlucoseMeasurementModel.notes) if include_notes else list(rows)
 
     def get_latest(self, patient_id: UUID) -> Optional[GlucoseMeasurementModel]:
         """Get the most recent glucose measurement"""
-        return self.db.query(GlucoseMeasurementModel)\
-            .filter(GlucoseMeasurementModel.patient_id == patient_id)\
-            .order_by(GlucoseMeasurementModel.timestamp.desc())\
-            .first()
+        return self.db.scalars(_latest_stmt(patient_id)).first()
+
+    def get_stats_aggregates(self, patient_id: UUID, start: datetime, end: datetime) -> GlucoseAggregates:
+        """
+        Sufficient statistics of the readings in [start, end), in one aggregate query.
+        Windows longer than ROLLUP_MIN_WINDOW add up the rollups instead of the
+        readings, unless the patient has a custom target range: the rollups only
+        count the consensus bands, so those windows always scan the raw readings.
+        """
+        if end - start > ROLLUP_MIN_WINDOW and _uses_consensus_range(
+            self.db.execute(_target_range_stmt(patient_id)).one()
+        ):
+            return GlucoseAggregates(**self.db.execute(_rollup_stats_stmt(patient_id, start, end)).one()._mapping)
+        return GlucoseAggregates(**self.db.execute(_stats_stmt(patient_id, start, end)).one()._mapping)
+
+    def get_trend(self, patient_id: UUID, start: datetime, end: datetime) -> Tuple[str, List[Row]]:
+        """Rollup buckets overlapping [start, end): days for windows longer than ROLLUP_MIN_WINDOW, else hours."""
+        unit = _trend_unit(start, end)
+        return unit, list(self.db.execute(trend_stmt(patient_id, start, end, unit)).all())
+
+    def count_readings(self, patient_id: UUID, start: datetime, end: datetime) -> int:
+        """Number of readings in [start, end)."""
+        return self.db.execute(_series_count_stmt(patient_id, start, end)).scalar_one()
+
+    def iter_series(self, patient_id: UUID, start: datetime, end: datetime) -> Iterator[Tuple[datetime, int]]:
+        """
+        (timestamp, glucose_value) of the readings in [start, end), oldest first,
+        fetched SERIES_FETCH_SIZE rows at a time instead of loading the whole trace.
+        """
+        for timestamp, value in self.db.execute(_series_stmt(patient_id, start, end)):
+            yield timestamp, value
+
+
+class AsyncGlucoseRepository:
+    """GlucoseRepository over an AsyncSession, for the async routers."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_measurement(self, patient_id: UUID, data: GlucoseCreateRequest) -> GlucoseMeasurementModel:
+        """
+        Create a new glucose measurement record.
+        Raises IntegrityError on a duplicate reading (savepoint rollback, as in the sync
+        repository). Every column is set client-side, so no refresh follows the commit.
+        """
+        measurement = _new_measurement(patient_id, data)
+        async with self.db.begin_nested():
+            self.db.add(measurement)
+        await self._add_to_rollups(patient_id, [(measurement.timestamp, measurement.glucose_value)])
+        await self.db.commit()
+        return measurement
+
+    async def bulk_create_measurements(self, patient_id: UUID, items: Sequence[GlucoseCreateRequest]) -> int:
+        """Async GlucoseRepository.bulk_create_measurements. Returns rows inserted."""
+        rows = _bulk_rows(patient_id, items)
+        if not rows:
+            return 0
+
+        stmt = _bulk_insert_stmt(self.db, GlucoseMeasurementModel.__table__)
+        inserted = set()
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            result = await self.db.execute(stmt, rows[start:start + BULK_INSERT_CHUNK])
+            inserted.update(result.scalars())
+        await self._add_to_rollups(patient_id, _inserted_readings(rows, inserted))
+        await self.db.commit()
+        return len(inserted)
+
+    async def _add_to_rollups(self, patient_id: UUID, readings: Iterable[Tuple[datetime, int]]) -> None:
+        for stmt, params in rollup_increments(self.db, patient_id, readings):
+            await self.db.execute(stmt, params)
+
+    async def get_history(
+        self,
+        patient_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_notes: bool = True
+    ) -> List[Union[GlucoseMeasurementModel, Row]]:
+        """Async GlucoseRepository.get_history (same keyset/offset and include_notes semantics)."""
+        stmt = _history_stmt(patient_id, limit, offset, start_date, end_date, after, include_notes)
+        rows = (await self.db.execute(stmt)).all()
+        return attach_lazy_decryption(rows, GlucoseMeasurementModel.notes) if include_notes else list(rows)
+
+    async def get_latest(self, patient_id: UUID) -> Optional[GlucoseMeasurementModel]:
+        """Get the most recent glucose measurement"""
+        return (await self.db.scalars(_latest_stmt(patient_id))).first()
+
+    async def get_stats_aggregates(self, patient_id: UUID, start: datetime, end: datetime) -> GlucoseAggregates:
+        """Async GlucoseRepository.get_stats_aggregates (rollups for long windows)."""
+        if end - start > ROLLUP_MIN_WINDOW and _uses_consensus_range(
+            (await self.db.execute(_target_range_stmt(patient_id))).one()
+        ):
+            return GlucoseAggregates(**(await self.db.execute(_rollup_stats_stmt(patient_id, start, end))).one()._mapping)
+        return GlucoseAggregates(**(await self.db.execute(_stats_stmt(patient_id, start, end))).one()._mapping)
+
+    async def get_trend(self, patient_id: UUID, start: datetime, end: datetime) -> Tuple[str, List[Row]]:
+        """Async GlucoseRepository.get_trend."""
+        unit = _trend_unit(start, end)
+        return unit, list((await self.db.execute(trend_stmt(patient_id, start, end, unit))).all())
+
+    async def count_readings(self, patient_id: UUID, start: datetime, end: datetime) -> int:
+        """Number of readings in [start, end)."""
+        return (await self.db.execute(_series_count_stmt(patient_id, start, end))).scalar_one()
+
+    async def iter_series(self, patient_id: UUID, start: datetime, end: datetime) -> AsyncIterator[Tuple[datetime, int]]:
+        """Async GlucoseRepository.iter_series, over a streamed result."""
+        result = await self.db.stream(_series_stmt(patient_id, start, end))
+        # One await per fetched batch, not per row
+        async for partition in result.partitions():
+            for timestamp, value in partition:
+                yield timestamp, value
@@ -0,0 +1,215 @@
+"""
+Hourly and daily glucose rollups (glucose_hourly, glucose_daily).
+
+Each row holds the sufficient statistics of one patient's readings in one bucket
+(count, sum, sum of squares, min, max and readings per range band), so a summary
+over N days adds up about N rows instead of every reading (288 per day per CGM).
+
+- rollup_increments: upserts for readings just inserted, run by the writers of
+  GlucoseRepository in the same transaction as the readings.
+- rebuild_stmts: regenerate the tables from glucose_measurements.
+- window_parts: the pieces of a [start, end) window, as whole days, whole hours
+  and the raw readings of the partial hours at either edge.
+
+Bands use the fixed consensus thresholds (<54, 54-69, 70-180, 181-250, >250);
+summaries against a custom HealthProfile target range need the raw readings.
+"""
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, case, delete, func, insert, or_, select
+
+from src.domain.glucose_stats import (
+    DEFAULT_TARGET_RANGE_HIGH,
+    DEFAULT_TARGET_RANGE_LOW,
+    VERY_HIGH_MG_DL,
+    VERY_LOW_MG_DL,
+)
+from src.infrastructure.db.dialects import truncate_timestamp, upsert_insert
+from src.infrastructure.db.models import GlucoseDailyModel, GlucoseHourlyModel, GlucoseMeasurementModel
+
+ROLLUP_UNITS = ((GlucoseHourlyModel, "hour"), (GlucoseDailyModel, "day"))
+BANDS = ("very_low", "low", "in_range", "high", "very_high")
+ADDITIVE_COLUMNS = ("count", "total", "total_squares") + BANDS
+
+
+def band_counts(value, low, high) -> list:
+    """
+    Readings per range band, as labelled aggregate expressions. Bands are checked
+    in order (very low first), so they never overlap even when a target range
+    reaches below 54 or above 250.
+    """
+    count_if = lambda condition: func.coalesce(func.sum(case((condition, 1), else_=0)), 0)  # noqa: E731
+    above_very_low = value >= VERY_LOW_MG_DL
+    return [
+        count_if(value < VERY_LOW_MG_DL).label("very_low"),
+        count_if(and_(above_very_low, value < low)).label("low"),
+        count_if(and_(above_very_low, value >= low, value <= high)).label("in_range"),
+        count_if(and_(above_very_low, value >= low, value > high, value <= VERY_HIGH_MG_DL)).label("high"),
+        count_if(and_(value > VERY_HIGH_MG_DL, value >= low, value > high)).label("very_high"),
+    ]
+
+
+def _aggregate_columns(value) -> list:
+    return [
+        func.count(value).label("count"),
+        func.coalesce(func.sum(value), 0).label("total"),
+        func.coalesce(func.sum(value * value), 0).label("total_squares"),
+        func.min(value).label("minimum"),
+        func.max(value).label("maximum"),
+        *band_counts(value, DEFAULT_TARGET_RANGE_LOW, DEFAULT_TARGET_RANGE_HIGH),
+    ]
+
+
+def _band(value: int) -> str:
+    if value < VERY_LOW_MG_DL:
+        return "very_low"
+    if value < DEFAULT_TARGET_RANGE_LOW:
+        return "low"
+    if value <= DEFAULT_TARGET_RANGE_HIGH:
+        return "in_range"
+    if value <= VERY_HIGH_MG_DL:
+        return "high"
+    return "very_high"
+
+
+def as_utc_naive(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = floor_hour(value)
+    return floor if floor == value else floor + timedelta(hours=1)
+
+
+def _floor_day(value: datetime) -> datetime:
+    return datetime.combine(value.date(), time())
+
+
+def _ceil_day(value: datetime) -> datetime:
+    floor = _floor_day(value)
+    return floor if floor == value else floor + timedelta(days=1)
+
+
+def _increment_stmt(db, model):
+    table = model.__table__
+    stmt = upsert_insert(db, table)
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=["patient_id", "bucket"],
+        set_={
+            **{name: table.c[name] + new[name] for name in ADDITIVE_COLUMNS},
+            "minimum": case((new.minimum < table.c.minimum, new.minimum), else_=table.c.minimum),
+            "maximum": case((new.maximum > table.c.maximum, new.maximum), else_=table.c.maximum),
+        },
+    )
+
+
+def rollup_increments(db, patient_id: UUID, readings: Iterable[Tuple[datetime, int]]) -> List[Tuple[object, List[dict]]]:
+    """
+    (statement, parameters) pairs adding `readings` (timestamp, mg/dL) to the
+    hourly and daily buckets: one executemany upsert per table. Timezone-aware
+    timestamps are bucketed by their UTC time, as the database stores them.
+    """
+    buckets: Dict[str, Dict[object, dict]] = {"hour": {}, "day": {}}
+    for timestamp, value in readings:
+        timestamp = as_utc_naive(timestamp)
+        for unit, key in (("hour", floor_hour(timestamp)), ("day", timestamp.date())):
+            row = buckets[unit].get(key)
+            if row is None:
+                row = buckets[unit][key] = {
+                    "patient_id": patient_id, "bucket": key, "count": 0, "total": 0, "total_squares": 0,
+                    "minimum": value, "maximum": value, **dict.fromkeys(BANDS, 0),
+                }
+            row["count"] += 1
+            row["total"] += value
+            row["total_squares"] += value * value
+            row["minimum"] = min(row["minimum"], value)
+            row["maximum"] = max(row["maximum"], value)
+            row[_band(value)] += 1
+
+    return [
+        (_increment_stmt(db, model), list(buckets[unit].values()))
+        for model, unit in ROLLUP_UNITS
+        if buckets[unit]
+    ]
+
+
+def rebuild_stmts(db, patient_id: Optional[UUID] = None) -> list:
+    """DELETE + INSERT ... SELECT GROUP BY per rollup table, for one patient or all of them."""
+    readings = GlucoseMeasurementModel
+    stmts = []
+    for model, unit in ROLLUP_UNITS:
+        bucket = truncate_timestamp(db, readings.timestamp, unit)
+        query = (
+            select(readings.patient_id, bucket.label("bucket"), *_aggregate_columns(readings.glucose_value))
+            .group_by(readings.patient_id, bucket)
+        )
+        clear = delete(model)
+        if patient_id is not None:
+            query = query.where(readings.patient_id == patient_id)
+            clear = clear.where(model.patient_id == patient_id)
+        columns = ["patient_id", "bucket", "count", "total", "total_squares", "minimum", "maximum", *BANDS]
+        stmts += [clear, insert(model).from_select(columns, query)]
+    return stmts
+
+
+def _rollup_part(model, patient_id: UUID, ranges: List[tuple]) -> Select:
+    return select(
+        model.count, model.total, model.total_squares, model.minimum, model.maximum,
+        *(getattr(model, band) for band in BANDS),
+    ).where(
+        model.patient_id == patient_id,
+        or_(*(and_(model.bucket >= lo, model.bucket < hi) for lo, hi in ranges)),
+    )
+
+
+def window_parts(patient_id: UUID, start: datetime, end: datetime) -> List[Select]:
+    """
+    Selects with the rollup columns whose rows add up to the readings in [start, end):
+    whole days from glucose_daily, the remaining whole hours from glucose_hourly and
+    the partial hours at the edges aggregated from glucose_measurements.
+    """
+    h0, h1 = _ceil_hour(start), floor_hour(end)
+    if h0 >= h1:
+        raw = [(start, end)]
+        hours, days = [], []
+    else:
+        raw = [r for r in ((start, h0), (h1, end)) if r[0] < r[1]]
+        d0, d1 = _ceil_day(h0), _floor_day(h1)
+        if d0 < d1:
+            days = [(d0.date(), d1.date())]
+            hours = [r for r in ((h0, d0), (d1, h1)) if r[0] < r[1]]
+        else:
+            days, hours = [], [(h0, h1)]
+
+    parts = []
+    if days:
+        parts.append(_rollup_part(GlucoseDailyModel, patient_id, days))
+    if hours:
+        parts.append(_rollup_part(GlucoseHourlyModel, patient_id, hours))
+    if raw:
+        readings = GlucoseMeasurementModel
+        parts.append(select(*_aggregate_columns(readings.glucose_value)).where(
+            readings.patient_id == patient_id,
+            or_(*(and_(readings.timestamp >= lo, readings.timestamp < hi) for lo, hi in raw)),
+        ))
+    return parts
+
+
+def trend_stmt(patient_id: UUID, start: datetime, end: datetime, unit: str) -> Select:
+    """Buckets of `unit` overlapping [start, end), oldest first."""
+    model = GlucoseHourlyModel if unit == "hour" else GlucoseDailyModel
+    lo = floor_hour(start) if unit == "hour" else start.date()
+    hi = end if unit == "hour" else _ceil_day(end).date()
+    return (
+        select(model.bucket, model.count, model.total, model.total_squares, model.minimum, model.maximum)
+        .where(model.patient_id == patient_id, model.bucket >= lo, model.bucket < hi)
+        .order_by(model.bucket)
+    )
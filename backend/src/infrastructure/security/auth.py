@@ -1,8 +1,11 @@
-import bcrypt
-import jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from src.infrastructure.security.crypto import get_crypto_service
+from src.infrastructure.security.password_hasher import (
+    get_password_hasher,
+    hash_password_sync,
+    verify_password_sync,
+)
 import os
 
 # JWT Settings
@@ -17,18 +20,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    import jwt  # PyJWT imports cryptography.x509; load it only when a token is issued
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def get_password_hash(password: str) -> str:
-    pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(pwd_bytes, salt).decode('utf-8')
+    return hash_password_sync(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    pwd_bytes = plain_password.encode('utf-8')
-    hash_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(pwd_bytes, hash_bytes)
+    return verify_password_sync(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded bcrypt pool; use from async handlers."""
+    return await get_password_hasher().hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded bcrypt pool; use from async handlers."""
+    return await get_password_hasher().verify(plain_password, hashed_password)
 
 def encrypt_sensitive_data(data: float | str) -> bytes:
     crypto = get_crypto_service()
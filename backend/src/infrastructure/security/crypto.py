@@ -1,16 +1,58 @@
 import base64
+import hashlib
 import os
-from cryptography.fernet import Fernet
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
 from functools import lru_cache
 
+
+def _retired_keys_from_env() -> List[str]:
+    # Comma-separated, newest first; kept only until the re-encryption job has finished
+    return [k.strip() for k in os.getenv("ENCRYPTION_KEYS_RETIRED", "").split(",") if k.strip()]
+
+
 class CryptoService:
-    def __init__(self, key: str = None):
+    """
+    Fernet encryption with key rotation.
+
+    New values are always encrypted with the primary key (ENCRYPTION_KEY).
+    Values written under a retired key (ENCRYPTION_KEYS_RETIRED) still decrypt,
+    so the key can be rotated online and old rows re-encrypted in the background
+    (scripts/reencrypt_phi.py).
+    """
+    def __init__(self, key: str = None, retired_keys: Optional[Sequence[str]] = None):
         # In production, key comes from env vars or KMS
         # Fallback for dev/test if not provided (WARNING: Unsafe for prod)
         self.key = key or os.getenv("ENCRYPTION_KEY")
         if not self.key:
              raise ValueError("ENCRYPTION_KEY environment variable is not set")
-        self.fernet = Fernet(self.key)
+        if retired_keys is None:
+            retired_keys = _retired_keys_from_env() if key is None else []
+        # Imported on first use, not with the models: keeps it off the API import path
+        from cryptography.fernet import Fernet, MultiFernet
+        self.primary = Fernet(self.key)
+        self.fernet = MultiFernet([self.primary, *(Fernet(k) for k in retired_keys)])
+
+    @property
+    def primary_key_id(self) -> str:
+        """Short, non-reversible fingerprint of the primary key (safe to log and store)."""
+        return hashlib.sha256(self.key.encode()).hexdigest()[:16]
+
+    def is_primary(self, token: bytes) -> bool:
+        """True if `token` is signed with the primary key (checks the HMAC, no decryption)."""
+        from cryptography.fernet import InvalidToken
+        try:
+            self.primary.extract_timestamp(token)
+            return True
+        except InvalidToken:
+            return False
+
+    def rotate(self, token: bytes) -> bytes:
+        """
+        Re-encrypt `token` under the primary key, keeping its original timestamp.
+        Raises InvalidToken if no configured key can decrypt it.
+        """
+        return self.fernet.rotate(token)
 
     def encrypt(self, data: str) -> bytes:
         if data is None:
@@ -28,3 +70,24 @@ def get_crypto_service() -> CryptoService:
     # IMPORTANT: Generate a key in terminal using: 
     # python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
     return CryptoService()
+
+
+def _default_decrypt_workers() -> int:
+    # Worker threads only pay off with spare cores; a single-core host decrypts inline.
+    return int(os.getenv("DECRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+@lru_cache()
+def get_decrypt_executor() -> Optional[ThreadPoolExecutor]:
+    """Pool for bulk decryption of large result pages; None on a single core."""
+    workers = _default_decrypt_workers()
+    if workers < 2:
+        return None
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decrypt")
+
+
+def shutdown_decrypt_executor() -> None:
+    executor = get_decrypt_executor()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    get_decrypt_executor.cache_clear()
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import jwt, JWTError
 from pydantic import BaseModel
 import os
 
@@ -14,6 +13,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None
+    issued_at: Optional[int] = None
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -23,17 +23,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=15)
     
     # "sub" (Subject) es un claim estándar reservado para el ID del usuario
-    to_encode.update({"exp": expire})
+    # "iat" distingue tokens del mismo usuario (clave de la caché de identidad)
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str, credentials_exception) -> TokenData:
+    # python-jose (and the cryptography backends it pulls in) load on the first
+    # token, not at import: /health answers sooner after a cold start
+    from jose import jwt, JWTError
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        return TokenData(user_id=user_id)
+        return TokenData(user_id=user_id, issued_at=payload.get("iat"))
     except JWTError:
         raise credentials_exception
@@ -0,0 +1,189 @@
+"""
+Background re-encryption of EncryptedString columns after a key rotation.
+
+Rotation procedure:
+  1. Deploy with the new key in ENCRYPTION_KEY and the previous one in
+     ENCRYPTION_KEYS_RETIRED. Reads keep working (MultiFernet) and new writes
+     use the new key.
+  2. Run scripts/reencrypt_phi.py. It walks every table that has encrypted
+     columns in primary-key order, in chunks, and re-encrypts only the values
+     that are not under the primary key.
+  3. Once every table reports done, drop the old key from ENCRYPTION_KEYS_RETIRED.
+
+Each chunk is committed together with its checkpoint (key_rotation_checkpoints),
+so a crashed or interrupted run resumes from the last committed chunk. Updates
+are conditional on the ciphertext not having changed since it was read, so the
+job never overwrites a value the API wrote concurrently.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import Column, LargeBinary, Table, bindparam, func, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from src.infrastructure.db.database import Base
+from src.infrastructure.db.models import KeyRotationCheckpointModel
+from src.infrastructure.db.types import EncryptedString
+from src.infrastructure.security.crypto import CryptoService, get_crypto_service
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass
+class ReencryptionProgress:
+    table: str
+    rows_scanned: int  # Rows walked for this key, across runs
+    rows_rotated: int  # Values re-encrypted under the primary key, across runs
+    rows_unreadable: int  # Values no configured key can decrypt (left untouched), this run
+    rows_skipped: int  # Values the API rewrote between read and update (left as written), this run
+    rows_remaining: int
+    rows_per_second: float  # Scan rate of this run
+    done: bool
+
+
+def encrypted_tables() -> Dict[str, Tuple[Table, List[Column]]]:
+    """Tables of the ORM metadata with EncryptedString columns and an `id` primary key."""
+    found = {}
+    for table in Base.metadata.sorted_tables:
+        columns = [c for c in table.columns if isinstance(c.type, EncryptedString)]
+        if columns and [c.name for c in table.primary_key.columns] == ["id"]:
+            found[table.name] = (table, columns)
+    return found
+
+
+class ReencryptionJob:
+    """Throttled, resumable re-encryption of EncryptedString values under the primary key."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        crypto: Optional[CryptoService] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_rows_per_second: Optional[float] = None,
+        on_progress: Optional[Callable[[ReencryptionProgress], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.session_factory = session_factory
+        self.crypto = crypto or get_crypto_service()
+        self.chunk_size = chunk_size
+        self.max_rows_per_second = max_rows_per_second
+        self.on_progress = on_progress or (lambda p: None)
+        self._clock = clock
+        self._sleep = sleep
+
+    def run(self, tables: Optional[Iterable[str]] = None) -> List[ReencryptionProgress]:
+        """Re-encrypt the given tables (default: all encrypted tables). Returns the final progress of each."""
+        targets = encrypted_tables()
+        names = list(tables) if tables is not None else list(targets)
+        unknown = set(names) - set(targets)
+        if unknown:
+            raise ValueError(f"No encrypted columns in: {', '.join(sorted(unknown))}")
+        return [self._run_table(*targets[name]) for name in names]
+
+    def _run_table(self, table: Table, columns: Sequence[Column]) -> ReencryptionProgress:
+        key_id = self.crypto.primary_key_id
+        with self.session_factory() as db:
+            checkpoint = db.get(KeyRotationCheckpointModel, (table.name, key_id))
+            last_id = checkpoint.last_id if checkpoint else None
+            scanned = checkpoint.rows_scanned if checkpoint else 0
+            rotated = checkpoint.rows_rotated if checkpoint else 0
+            if checkpoint is not None and checkpoint.completed_at is not None:
+                progress = ReencryptionProgress(table.name, scanned, rotated, 0, 0, 0, 0.0, True)
+                self.on_progress(progress)
+                return progress
+            remaining_stmt = select(func.count()).select_from(table)
+            if last_id is not None:
+                remaining_stmt = remaining_stmt.where(table.c.id > last_id)
+            remaining = db.scalar(remaining_stmt)
+
+        started = self._clock()
+        scanned_now = unreadable = skipped = 0
+        while True:
+            with self.session_factory() as db:
+                rows = db.execute(self._chunk_stmt(table, columns, last_id)).all()
+                if rows:
+                    chunk_rotated, chunk_unreadable, chunk_skipped = self._rotate_chunk(db, table, columns, rows)
+                    last_id = rows[-1].id
+                    scanned += len(rows)
+                    rotated += chunk_rotated
+                    unreadable += chunk_unreadable
+                    skipped += chunk_skipped
+                    scanned_now += len(rows)
+                    remaining = max(remaining - len(rows), 0)
+                done = len(rows) < self.chunk_size
+                db.merge(KeyRotationCheckpointModel(
+                    table_name=table.name,
+                    key_id=key_id,
+                    last_id=last_id,
+                    rows_scanned=scanned,
+                    rows_rotated=rotated,
+                    completed_at=datetime.utcnow() if done else None,
+                ))
+                db.commit()
+
+            elapsed = self._clock() - started
+            progress = ReencryptionProgress(
+                table=table.name,
+                rows_scanned=scanned,
+                rows_rotated=rotated,
+                rows_unreadable=unreadable,
+                rows_skipped=skipped,
+                rows_remaining=0 if done else remaining,
+                rows_per_second=scanned_now / elapsed if elapsed > 0 else 0.0,
+                done=done,
+            )
+            self.on_progress(progress)
+            if done:
+                return progress
+            self._throttle(scanned_now, elapsed)
+
+    def _chunk_stmt(self, table: Table, columns: Sequence[Column], last_id):
+        # Raw ciphertext: the EncryptedString result processor would decrypt it
+        stmt = select(table.c.id, *(type_coerce(c, LargeBinary).label(c.name) for c in columns))
+        if last_id is not None:
+            stmt = stmt.where(table.c.id > last_id)
+        return stmt.order_by(table.c.id).limit(self.chunk_size)
+
+    def _rotate_chunk(self, db: Session, table: Table, columns: Sequence[Column], rows) -> Tuple[int, int, int]:
+        """Returns (rotated, unreadable, skipped) value counts for the chunk."""
+        rotated = unreadable = skipped = 0
+        for column in columns:
+            params = []
+            for row in rows:
+                token = row._mapping[column.name]
+                if token is None or self.crypto.is_primary(token):
+                    continue
+                try:
+                    params.append({"row_id": row.id, "old": token, "new": self.crypto.rotate(token)})
+                except InvalidToken:
+                    # Legacy plaintext or a key that is no longer configured: leave it as is
+                    unreadable += 1
+            if not params:
+                continue
+            raw = type_coerce(column, LargeBinary)
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("row_id"), raw == bindparam("old", type_=LargeBinary))
+                .values({column.name: bindparam("new", type_=LargeBinary)})
+            )
+            result = db.execute(stmt, params)
+            if result.supports_sane_multi_rowcount():
+                updated = result.rowcount
+            else:
+                # The driver does not sum rowcount across executemany: one statement per row
+                updated = sum(db.execute(stmt, p).rowcount for p in params)
+            # Rows whose ciphertext changed since the read (a concurrent API write) match nothing
+            rotated += updated
+            skipped += len(params) - updated
+        return rotated, unreadable, skipped
+
+    def _throttle(self, scanned: int, elapsed: float) -> None:
+        if not self.max_rows_per_second:
+            return
+        ahead = scanned / self.max_rows_per_second - elapsed
+        if ahead > 0:
+            self._sleep(ahead)
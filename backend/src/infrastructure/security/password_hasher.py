@@ -0,0 +1,101 @@
+"""
+Bounded executor for bcrypt work.
+
+bcrypt deliberately costs ~250 ms of CPU per hash/verify. Run from sync route
+handlers it occupies the shared AnyIO threadpool that every other sync endpoint
+and dependency needs, so a login spike starves the whole API. PasswordHasher
+runs it on its own small pool instead: the event loop stays free, excess
+requests wait in the executor queue, and the queue depth is observable.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _default_workers() -> int:
+    # bcrypt releases the GIL, so one worker per core saturates the CPU without
+    # oversubscribing it; keep at least two so one slow hash does not block all.
+    return max(2, os.cpu_count() or 1)
+
+
+def hash_password_sync(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited thread pool."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a free bcrypt worker."""
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently being hashed/verified."""
+        return self._running
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                "completed": self._completed,
+            }
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password_sync, plain_password, hashed_password)
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._queued += 1
+
+        def task() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, task)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide hasher; pool size from PASSWORD_HASH_WORKERS."""
+    workers = int(os.getenv("PASSWORD_HASH_WORKERS", _default_workers()))
+    logger.info("Password hasher pool: %d workers", workers)
+    return PasswordHasher(max_workers=workers)
@@ -2,17 +2,57 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
-from src.infrastructure.db.database import engine, Base
+import logging
+import time
+from src.infrastructure.db.database import engine, async_engine, SessionLocal, log_database_config
+from src.infrastructure.db.schema import prepare_schema, startup_mode_from_env
+from src.infrastructure.api.metrics import MetricsMiddleware, get_request_metrics
+from src.infrastructure.api import query_inspector
+from src.infrastructure.cache.ingredient_catalog import get_ingredient_catalog
+from src.infrastructure.security.crypto import shutdown_decrypt_executor
+from src.infrastructure.pubsub.broker import get_broker
+from src.infrastructure.security.password_hasher import get_password_hasher
 
 # Import Routers
 from src.infrastructure.api.routers import health, users, auth, nutrition, family
 
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Establish DB tables on startup (Dev Only - use Alembic for prod)
-    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    log_database_config()
+    # Schema: verify against the Alembic head (default), migrate, or none
+    mode = startup_mode_from_env()
+    prepare_schema(engine, mode)
+    schema_done = time.perf_counter()
+    # Warm the in-memory ingredient catalog so autocomplete never hits Postgres
+    db = SessionLocal()
+    try:
+        loaded = get_ingredient_catalog().load(db)
+        logger.info("Ingredient catalog warmed with %d items", loaded)
+    except Exception as e:
+        # Non-fatal: the catalog loads lazily on the first search
+        logger.warning("Ingredient catalog warm-up skipped: %s", e)
+    finally:
+        db.close()
+    ready = time.perf_counter()
+    app.state.startup = {
+        "mode": mode.value,
+        "schema_seconds": schema_done - started,
+        "catalog_seconds": ready - schema_done,
+        "total_seconds": ready - started,
+    }
+    logger.info("Startup completed in %.3fs (%s)", ready - started, app.state.startup)
+    # Live glucose stream fan-out (PUBSUB_BACKEND); never blocks startup
+    await get_broker().start()
     yield
-    # Shutdown logic if needed
+    await get_broker().stop()
+    # Let in-flight logins finish before the worker exits
+    get_password_hasher().shutdown()
+    get_password_hasher.cache_clear()
+    shutdown_decrypt_executor()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Diabetics Platform API",
@@ -34,8 +74,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # History pagination cursor must be readable by Flutter web
 )
 
+# Development only: per-request N+1 detection (QUERY_INSPECTOR=true)
+if query_inspector.query_inspector_enabled():
+    app.add_middleware(query_inspector.QueryInspectorMiddleware)
+    query_inspector.attach(engine)
+    query_inspector.attach(async_engine.sync_engine)
+
+# Outermost middleware (add_middleware prepends, so it is registered last): latency
+# includes CORS and the query inspector; SQL counted on both engines (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+get_request_metrics().attach(engine)
+get_request_metrics().attach(async_engine.sync_engine)
+
 # --- Routes ---
 app.include_router(health.router)
 app.include_router(users.router, prefix="/api/v1")
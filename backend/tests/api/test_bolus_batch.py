@@ -0,0 +1,102 @@
+"""
+POST /nutrition/bolus/calculate-batch: muchos escenarios en una petición,
+mismos resultados (y redondeo) que POST /nutrition/bolus/calculate.
+"""
+import random
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.db.models import IngredientModel
+
+BATCH_URL = "/api/v1/nutrition/bolus/calculate-batch"
+SINGLE_URL = "/api/v1/nutrition/bolus/calculate"
+
+
+def _seed_ingredients(db_session, n=8, seed=1):
+    rng = random.Random(seed)
+    items = [
+        IngredientModel(
+            name=f"Alimento {uuid4().hex[:8]}",
+            glycemic_index=rng.randint(0, 100),
+            carbs_per_100g=round(rng.uniform(0, 90), 1),
+            fiber_per_100g=0.0,
+        )
+        for _ in range(n)
+    ]
+    db_session.add_all(items)
+    db_session.flush()
+    return items
+
+
+def _random_scenario(rng, ingredients):
+    return {
+        "current_glucose": rng.choice([65.0, 98.5, 143.0, 212.3]),
+        "target_glucose": rng.choice([100.0, 110.0]),
+        "icr": rng.choice([7.5, 10.0, 12.0]),
+        "isf": rng.choice([30.0, 45.5, 50.0]),
+        "ingredients": [
+            {"ingredient_id": str(rng.choice(ingredients).id), "weight_grams": round(rng.uniform(5, 350), 1)}
+            for _ in range(rng.randint(0, 6))
+        ],
+    }
+
+
+class TestBolusBatch:
+    def test_matches_single_endpoint(self, client, db_session):
+        ingredients = _seed_ingredients(db_session)
+        rng = random.Random(42)
+        scenarios = [_random_scenario(rng, ingredients) for _ in range(40)]
+
+        response = client.post(BATCH_URL, json={"scenarios": scenarios})
+        assert response.status_code == 200, response.text
+        results = response.json()["results"]
+        assert len(results) == len(scenarios)
+
+        for scenario, batched in zip(scenarios, results):
+            single = client.post(SINGLE_URL, json=scenario).json()
+            assert batched["total_carbs_grams"] == single["total_carbs_grams"]
+            assert batched["recommended_bolus_units"] == single["recommended_bolus_units"]
+
+    def test_glycemic_load_and_hypo_protection(self, client, db_session):
+        ingredient = IngredientModel(name="Arroz batch", glycemic_index=70, carbs_per_100g=50.0, fiber_per_100g=0.0)
+        db_session.add(ingredient)
+        db_session.flush()
+        scenarios = [
+            # 100 g -> 50 g carbs, CG 35, bolus 5 + 2 = 7
+            {"current_glucose": 200, "target_glucose": 100, "icr": 10, "isf": 50,
+             "ingredients": [{"ingredient_id": str(ingredient.id), "weight_grams": 100}]},
+            # Hipoglucemia sin comida: nunca bolus negativo
+            {"current_glucose": 60, "target_glucose": 100, "icr": 10, "isf": 50, "ingredients": []},
+        ]
+        results = client.post(BATCH_URL, json={"scenarios": scenarios}).json()["results"]
+        assert results[0] == {"total_carbs_grams": 50.0, "total_glycemic_load": 35.0, "recommended_bolus_units": 7.0}
+        assert results[1]["recommended_bolus_units"] == 0.0
+
+    def test_unknown_ingredients_are_ignored(self, client):
+        scenario = {"current_glucose": 150, "target_glucose": 100,
+                    "ingredients": [{"ingredient_id": str(uuid4()), "weight_grams": 100}]}
+        [result] = client.post(BATCH_URL, json={"scenarios": [scenario]}).json()["results"]
+        assert result["total_carbs_grams"] == 0.0
+        assert result["recommended_bolus_units"] == 1.0
+
+    def test_resolves_all_ingredients_in_one_query(self, client, db_session, count_statements):
+        ingredients = _seed_ingredients(db_session, n=20)
+        rng = random.Random(7)
+        scenarios = [_random_scenario(rng, ingredients) for _ in range(200)]
+
+        with count_statements() as counter:
+            response = client.post(BATCH_URL, json={"scenarios": scenarios})
+        assert response.status_code == 200
+        assert counter.count == 1
+
+    @pytest.mark.parametrize("field", ["icr", "isf"])
+    def test_zero_ratio_is_rejected(self, client, field):
+        scenario = {"current_glucose": 150, "target_glucose": 100, "ingredients": [], field: 0}
+        response = client.post(BATCH_URL, json={"scenarios": [scenario]})
+        assert response.status_code == 422
+
+    def test_empty_batch(self, client):
+        response = client.post(BATCH_URL, json={"scenarios": []})
+        assert response.status_code == 200
+        assert response.json() == {"results": []}
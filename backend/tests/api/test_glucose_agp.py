@@ -0,0 +1,108 @@
+"""
+GET /glucose/agp: time-of-day percentile profile, cached per patient and window.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.api.routers import glucose as glucose_router
+from src.infrastructure.cache.glucose_agp import get_agp_cache
+from src.infrastructure.db.models import GlucoseMeasurementModel
+
+BASE_TS = datetime(2026, 5, 1)
+END_DATE = "2026-05-14"  # 14 days: May 1st to 14th
+
+
+@pytest.fixture
+def guardian(guardian, db_session):
+    # 15 days of 5-minute readings; the last day is outside the window
+    _, patient_id = guardian
+    db_session.execute(GlucoseMeasurementModel.__table__.insert(), [
+        {"id": uuid4(), "patient_id": patient_id, "glucose_value": 80 + (i % 288) // 2 + (i // 288),
+         "timestamp": BASE_TS + timedelta(minutes=5 * i), "measurement_type": "CGM"}
+        for i in range(15 * 288)
+    ])
+    db_session.commit()
+    return guardian
+
+
+def _agp(client, headers, patient_id, **params):
+    params = {"patient_id": str(patient_id), "to": END_DATE, **params}
+    return client.get("/api/v1/glucose/agp", params=params, headers=headers)
+
+
+class TestGlucoseAgp:
+    def test_profile_over_14_days(self, client, guardian, headers):
+        _, patient_id = guardian
+        resp = _agp(client, headers, patient_id)
+
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert (body["from"], body["to"]) == ("2026-05-01T00:00:00", "2026-05-15T00:00:00")
+        assert body["count"] == 14 * 288
+        assert body["slot_minutes"] == 15 and len(body["slots"]) == 96
+        # 00:00 slot: readings 0..2 of each day, 80 + 0/0/1 + day offset 0..13
+        first = body["slots"][0]
+        assert first["start"] == "00:00" and first["count"] == 42
+        assert first["p5"] <= first["p25"] <= first["p50"] <= first["p75"] <= first["p95"]
+        assert first["p50"] == 87.0
+
+    def test_five_minute_slots(self, client, guardian, headers):
+        _, patient_id = guardian
+        body = _agp(client, headers, patient_id, slot_minutes=5, days=7).json()
+
+        assert len(body["slots"]) == 288
+        assert body["count"] == 7 * 288
+        assert _agp(client, headers, patient_id, slot_minutes=10).status_code == 400
+
+    def test_second_request_is_served_from_cache(self, client, guardian, headers, count_statements):
+        _, patient_id = guardian
+        first = _agp(client, headers, patient_id).json()
+        with count_statements() as counter:
+            second = _agp(client, headers, patient_id).json()
+
+        assert second == first
+        assert not [s for s in counter.statements if "glucose_measurements" in s]
+        assert get_agp_cache().stats()["hits"] == 1
+
+    def test_new_reading_in_window_invalidates(self, client, guardian, headers):
+        _, patient_id = guardian
+        before = _agp(client, headers, patient_id).json()
+        reading = {"value": 400, "timestamp": "2026-05-10T00:01:00", "measurement_type": "FINGER"}
+        assert client.post(f"/api/v1/glucose/?patient_id={patient_id}", json=reading,
+                           headers=headers).status_code == 201
+
+        after = _agp(client, headers, patient_id).json()
+
+        assert after["count"] == before["count"] + 1
+        assert after["slots"][0]["count"] == 43
+
+    def test_reading_outside_window_keeps_the_cache(self, client, guardian, headers):
+        _, patient_id = guardian
+        _agp(client, headers, patient_id)
+        batch = {"measurements": [{"value": 100, "timestamp": "2026-05-20T08:00:00", "measurement_type": "CGM"}]}
+        assert client.post(f"/api/v1/glucose/bulk?patient_id={patient_id}", json=batch,
+                           headers=headers).json()["inserted"] == 1
+
+        _agp(client, headers, patient_id)
+
+        assert get_agp_cache().stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_write_during_the_read_is_not_overwritten(self, client, guardian, headers, monkeypatch):
+        """A POST that commits and invalidates while the profile is computed: the stale profile is dropped."""
+        _, patient_id = guardian
+        iter_series = glucose_router.AsyncGlucoseRepository.iter_series
+
+        async def iter_series_racing_a_write(self, *args):
+            get_agp_cache().invalidate(patient_id, [datetime(2026, 5, 10)])
+            async for reading in iter_series(self, *args):
+                yield reading
+
+        monkeypatch.setattr(glucose_router.AsyncGlucoseRepository, "iter_series", iter_series_racing_a_write)
+        assert _agp(client, headers, patient_id).status_code == 200
+
+        assert get_agp_cache().stats()["size"] == 0
+
+    def test_other_guardian_gets_404(self, client, guardian, headers):
+        assert _agp(client, headers, uuid4()).status_code == 404
@@ -0,0 +1,115 @@
+"""
+POST /glucose/bulk: CGM backfill in a single request with deduplication.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.infrastructure.db.models import GlucoseMeasurementModel, PatientModel, UserModel
+
+BASE_TS = datetime(2026, 5, 1, 0, 0, 0)
+
+
+def _readings(n, start=0, notes=None):
+    return [
+        {
+            "value": 90 + (i % 120),
+            "timestamp": (BASE_TS + timedelta(minutes=5 * i)).isoformat(),
+            "measurement_type": "CGM",
+            "notes": notes,
+        }
+        for i in range(start, start + n)
+    ]
+
+
+class TestGlucoseBulk:
+    def test_inserts_all_new_readings(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        resp = client.post(
+            f"/api/v1/glucose/bulk?patient_id={patient_id}",
+            json={"measurements": _readings(2500)},
+            headers=headers,
+        )
+        assert resp.status_code == 201, resp.text
+        assert resp.json() == {"received": 2500, "inserted": 2500, "duplicates": 0}
+        assert db_session.query(GlucoseMeasurementModel).filter_by(patient_id=patient_id).count() == 2500
+
+    def test_resending_overlapping_batch_counts_duplicates(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        url = f"/api/v1/glucose/bulk?patient_id={patient_id}"
+        client.post(url, json={"measurements": _readings(10)}, headers=headers)
+
+        resp = client.post(url, json={"measurements": _readings(10, start=5)}, headers=headers)
+        assert resp.json() == {"received": 10, "inserted": 5, "duplicates": 5}
+        assert db_session.query(GlucoseMeasurementModel).filter_by(patient_id=patient_id).count() == 15
+
+    def test_duplicates_within_same_upload(self, client, guardian, headers):
+        _, patient_id = guardian
+        readings = _readings(3)
+        resp = client.post(
+            f"/api/v1/glucose/bulk?patient_id={patient_id}",
+            json={"measurements": readings + readings[:2]},
+            headers=headers,
+        )
+        assert resp.json() == {"received": 5, "inserted": 3, "duplicates": 2}
+
+    def test_same_timestamp_different_type_is_not_duplicate(self, client, guardian, headers):
+        _, patient_id = guardian
+        [cgm] = _readings(1)
+        finger = {**cgm, "measurement_type": "FINGER"}
+        resp = client.post(
+            f"/api/v1/glucose/bulk?patient_id={patient_id}",
+            json={"measurements": [cgm, finger]},
+            headers=headers,
+        )
+        assert resp.json()["inserted"] == 2
+
+    def test_notes_are_encrypted_and_readable(self, client, guardian, headers):
+        _, patient_id = guardian
+        client.post(
+            f"/api/v1/glucose/bulk?patient_id={patient_id}",
+            json={"measurements": _readings(2, notes="sensor warm-up")},
+            headers=headers,
+        )
+        history = client.get(
+            f"/api/v1/glucose/history?patient_id={patient_id}&include=notes", headers=headers
+        ).json()
+        assert {h["notes"] for h in history} == {"sensor warm-up"}
+
+        # Notes are opt-in: without include=notes they are neither fetched nor returned
+        history = client.get(f"/api/v1/glucose/history?patient_id={patient_id}", headers=headers).json()
+        assert {h["notes"] for h in history} == {None}
+
+    def test_other_guardian_gets_404(self, client, db_session, headers):
+        other = UserModel(email=f"other_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+        db_session.add(other)
+        db_session.flush()
+        foreign = PatientModel(guardian_id=other.id, display_name="Not mine", role="DEPENDENT")
+        db_session.add(foreign)
+        db_session.commit()
+
+        resp = client.post(
+            f"/api/v1/glucose/bulk?patient_id={foreign.id}",
+            json={"measurements": _readings(1)},
+            headers=headers,
+        )
+        assert resp.status_code == 404
+
+    def test_single_duplicate_returns_409(self, client, guardian, headers):
+        _, patient_id = guardian
+        [reading] = _readings(1)
+        url = f"/api/v1/glucose/?patient_id={patient_id}"
+        assert client.post(url, json=reading, headers=headers).status_code == 201
+
+        resp = client.post(url, json={**reading, "value": reading["value"] + 50}, headers=headers)
+
+        assert resp.status_code == 409
+        assert resp.json()["detail"] == "Measurement already recorded for this timestamp"
+        history = client.get(f"/api/v1/glucose/history?patient_id={patient_id}", headers=headers).json()
+        assert [r["glucose_value"] for r in history] == [reading["value"]]
+
+    def test_same_timestamp_other_type_is_accepted(self, client, guardian, headers):
+        _, patient_id = guardian
+        [reading] = _readings(1)
+        url = f"/api/v1/glucose/?patient_id={patient_id}"
+        assert client.post(url, json=reading, headers=headers).status_code == 201
+        assert client.post(url, json={**reading, "measurement_type": "FINGER"}, headers=headers).status_code == 201
@@ -0,0 +1,168 @@
+"""
+glucose_hourly / glucose_daily rollups: incremental upkeep, rebuild, and the
+stats and trend endpoints reading them for windows longer than a day.
+"""
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.domain.glucose_models import GlucoseCreateRequest
+from src.domain.glucose_stats import GlucoseAggregates
+from src.infrastructure.db.models import (
+    GlucoseDailyModel,
+    GlucoseHourlyModel,
+    HealthProfileModel,
+)
+from src.infrastructure.repositories.glucose_repository import GlucoseRepository, _stats_stmt
+from src.infrastructure.repositories.glucose_rollups import rollup_increments
+
+BASE_TS = datetime(2026, 5, 1, 0, 7, 0)
+# 12 days of readings every 15 minutes, spread over every band
+READINGS = [(BASE_TS + timedelta(minutes=15 * i), 40 + (i * 37) % 300) for i in range(12 * 96)]
+
+
+def _request(timestamp, value):
+    return GlucoseCreateRequest(value=value, timestamp=timestamp, measurement_type="CGM")
+
+
+@pytest.fixture
+def guardian(guardian, db_session):
+    GlucoseRepository(db_session).bulk_create_measurements(guardian[1], [_request(ts, v) for ts, v in READINGS])
+    return guardian
+
+
+def _rollups(db_session, patient_id):
+    return {
+        model.__tablename__: [
+            tuple(row) for row in db_session.execute(
+                select(*model.__table__.c).where(model.patient_id == patient_id).order_by(model.bucket)
+            )
+        ]
+        for model in (GlucoseHourlyModel, GlucoseDailyModel)
+    }
+
+
+def _raw_aggregates(db_session, patient_id, start, end):
+    return GlucoseAggregates(**db_session.execute(_stats_stmt(patient_id, start, end)).one()._mapping)
+
+
+class TestRollupUpkeep:
+    def test_bulk_insert_fills_both_tables(self, db_session, guardian):
+        _, patient_id = guardian
+        rollups = _rollups(db_session, patient_id)
+
+        assert len(rollups["glucose_hourly"]) == 12 * 24
+        assert len(rollups["glucose_daily"]) == 12
+        assert sum(row[2] for row in rollups["glucose_daily"]) == len(READINGS)
+
+    def test_incremental_writes_match_rebuild(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        extra = [_request(BASE_TS + timedelta(days=3, minutes=1), 35), _request(BASE_TS + timedelta(days=30), 400)]
+        # Single readings through the API, then a re-sent batch: duplicates must not count twice
+        for item in extra:
+            resp = client.post(f"/api/v1/glucose/?patient_id={patient_id}", json=item.model_dump(mode="json"),
+                               headers=headers)
+            assert resp.status_code == 201, resp.text
+        batch = [{"value": v, "timestamp": ts.isoformat(), "measurement_type": "CGM"} for ts, v in READINGS[:200]]
+        batch.append({"value": 180, "timestamp": (BASE_TS + timedelta(days=3, minutes=2)).isoformat(),
+                      "measurement_type": "CGM"})
+        resp = client.post(f"/api/v1/glucose/bulk?patient_id={patient_id}", json={"measurements": batch},
+                           headers=headers)
+        assert resp.json()["inserted"] == 1
+
+        db_session.expire_all()
+        incremental = _rollups(db_session, patient_id)
+        GlucoseRepository(db_session).rebuild_rollups(patient_id)
+
+        assert _rollups(db_session, patient_id) == incremental
+
+    def test_aware_timestamps_use_utc_buckets(self, db_session):
+        # 01:30 at UTC+02:00 is 23:30 UTC the previous day
+        reading = datetime(2026, 5, 2, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+        hourly, daily = [params for _, params in rollup_increments(db_session, uuid4(), [(reading, 120)])]
+
+        assert [row["bucket"] for row in hourly] == [datetime(2026, 5, 1, 23)]
+        assert [row["bucket"] for row in daily] == [date(2026, 5, 1)]
+
+    def test_rebuild_one_patient(self, db_session, guardian):
+        _, patient_id = guardian
+        expected = _rollups(db_session, patient_id)
+        db_session.query(GlucoseHourlyModel).delete()
+        db_session.query(GlucoseDailyModel).filter_by(patient_id=patient_id).update({"count": 0})
+
+        GlucoseRepository(db_session).rebuild_rollups(patient_id)
+
+        assert _rollups(db_session, patient_id) == expected
+
+
+class TestRollupStats:
+    @pytest.mark.parametrize("start, end", [
+        (datetime(2026, 5, 2), datetime(2026, 5, 9)),  # whole days
+        (datetime(2026, 5, 2, 5), datetime(2026, 5, 9, 17)),  # whole hours
+        (datetime(2026, 5, 1, 23, 50), datetime(2026, 5, 3, 0, 20)),  # partial edges around whole days
+        (datetime(2026, 5, 4, 0, 30), datetime(2026, 5, 5, 23, 10)),  # no whole day in between
+        (BASE_TS - timedelta(days=60), BASE_TS + timedelta(days=30)),  # 90 days, beyond the data
+    ])
+    def test_matches_raw_readings(self, db_session, guardian, start, end):
+        _, patient_id = guardian
+        assert GlucoseRepository(db_session).get_stats_aggregates(patient_id, start, end) == \
+            _raw_aggregates(db_session, patient_id, start, end)
+
+    def test_90_day_window_reads_the_rollups(self, client, guardian, headers, count_statements):
+        _, patient_id = guardian
+        params = {"patient_id": str(patient_id), "from": "2026-03-01T00:07:00", "to": "2026-05-30T00:07:00"}
+        with count_statements() as counter:
+            resp = client.get("/api/v1/glucose/stats", params=params, headers=headers)
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["count"] == len(READINGS)
+        [stats] = [s for s in counter.statements if "glucose_" in s]
+        assert "glucose_daily" in stats and "glucose_hourly" in stats
+
+    def test_custom_target_range_uses_raw_readings(self, client, db_session, guardian, headers, count_statements):
+        _, patient_id = guardian
+        db_session.add(HealthProfileModel(patient_id=patient_id, target_range_low=90, target_range_high=140))
+        db_session.commit()
+        start, end = datetime(2026, 5, 2), datetime(2026, 5, 9)
+
+        with count_statements() as counter:
+            aggregates = GlucoseRepository(db_session).get_stats_aggregates(patient_id, start, end)
+
+        assert not [s for s in counter.statements if "glucose_hourly" in s or "glucose_daily" in s]
+
+        assert aggregates == _raw_aggregates(db_session, patient_id, start, end)
+        assert (aggregates.target_range_low, aggregates.target_range_high) == (90, 140)
+
+
+class TestGlucoseTrend:
+    def _trend(self, client, headers, patient_id, start, end):
+        params = {"patient_id": str(patient_id), "from": start.isoformat(), "to": end.isoformat()}
+        return client.get("/api/v1/glucose/trend", params=params, headers=headers)
+
+    def test_daily_points_for_long_windows(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        resp = self._trend(client, headers, patient_id, datetime(2026, 4, 1), datetime(2026, 6, 30))
+
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert body["bucket"] == "day"
+        assert len(body["points"]) == 12
+        first_day = [v for ts, v in READINGS if ts.date() == BASE_TS.date()]
+        assert body["points"][0]["bucket"] == "2026-05-01T00:00:00"
+        assert body["points"][0]["count"] == len(first_day)
+        assert body["points"][0]["mean"] == round(sum(first_day) / len(first_day), 1)
+        assert (body["points"][0]["min"], body["points"][0]["max"]) == (min(first_day), max(first_day))
+
+    def test_hourly_points_for_a_day(self, client, guardian, headers):
+        _, patient_id = guardian
+        body = self._trend(client, headers, patient_id, datetime(2026, 5, 3, 6, 30), datetime(2026, 5, 4, 6)).json()
+
+        assert body["bucket"] == "hour"
+        assert [p["bucket"] for p in body["points"]][:2] == ["2026-05-03T06:00:00", "2026-05-03T07:00:00"]
+        assert len(body["points"]) == 24
+        assert all(p["count"] == 4 for p in body["points"])
+
+    def test_other_guardian_gets_404(self, client, guardian, headers):
+        assert self._trend(client, headers, uuid4(), datetime(2026, 5, 1), datetime(2026, 5, 2)).status_code == 404
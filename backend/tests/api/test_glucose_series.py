@@ -0,0 +1,72 @@
+"""
+GET /glucose/series: LTTB-downsampled chart trace.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.db.models import GlucoseMeasurementModel
+
+BASE_TS = datetime(2026, 5, 1)
+DAYS = 30
+READINGS = DAYS * 288  # 5-minute CGM
+
+
+@pytest.fixture
+def guardian(guardian, db_session):
+    _, patient_id = guardian
+    values = [100 + (i % 24) for i in range(READINGS)]
+    values[4000] = 45  # Hypo
+    values[7000] = 320  # Hyper
+    db_session.execute(GlucoseMeasurementModel.__table__.insert(), [
+        {"id": uuid4(), "patient_id": patient_id, "glucose_value": v,
+         "timestamp": BASE_TS + timedelta(minutes=5 * i), "measurement_type": "CGM"}
+        for i, v in enumerate(values)
+    ])
+    db_session.commit()
+    return guardian
+
+
+def _series(client, headers, patient_id, start=BASE_TS, end=BASE_TS + timedelta(days=DAYS), **params):
+    params = {"patient_id": str(patient_id), "from": start.isoformat(), "to": end.isoformat(), **params}
+    return client.get("/api/v1/glucose/series", params=params, headers=headers)
+
+
+class TestGlucoseSeries:
+    def test_downsamples_30_days_to_300_points(self, client, guardian, headers):
+        _, patient_id = guardian
+        resp = _series(client, headers, patient_id)
+
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert body["count"] == READINGS
+        assert len(body["points"]) == 300
+        assert body["points"][0] == {"timestamp": BASE_TS.isoformat(), "value": 100}
+        assert body["points"][-1]["timestamp"] == (BASE_TS + timedelta(minutes=5 * (READINGS - 1))).isoformat()
+        values = [p["value"] for p in body["points"]]
+        assert 45 in values and 320 in values
+
+    def test_payload_is_an_order_of_magnitude_smaller(self, client, guardian, headers):
+        _, patient_id = guardian
+        full = client.get("/api/v1/glucose/history", headers=headers,
+                          params={"patient_id": str(patient_id), "limit": READINGS})
+        series = _series(client, headers, patient_id)
+
+        assert len(full.json()) == READINGS
+        assert len(series.content) * 10 < len(full.content)
+
+    def test_points_parameter(self, client, guardian, headers):
+        _, patient_id = guardian
+        assert len(_series(client, headers, patient_id, points=50).json()["points"]) == 50
+        assert _series(client, headers, patient_id, points=2).status_code == 422
+
+    def test_short_window_returns_every_reading(self, client, guardian, headers):
+        _, patient_id = guardian
+        body = _series(client, headers, patient_id, BASE_TS, BASE_TS + timedelta(hours=2)).json()
+
+        assert body["count"] == 24
+        assert [p["value"] for p in body["points"]] == [100 + i for i in range(24)]
+
+    def test_other_guardian_gets_404(self, client, guardian, headers):
+        assert _series(client, headers, uuid4()).status_code == 404
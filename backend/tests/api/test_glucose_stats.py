@@ -0,0 +1,108 @@
+"""
+GET /glucose/stats: time in range, mean, SD, CV and GMI from one aggregate query.
+"""
+import statistics
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.domain.glucose_stats import gmi_percent
+from src.infrastructure.db.models import GlucoseMeasurementModel, HealthProfileModel
+
+BASE_TS = datetime(2026, 5, 1, 0, 0, 0)
+# 20 readings: 2 very low, 3 low, 10 in 70-180, 3 high, 2 very high
+VALUES = [40, 53, 54, 60, 69, 70, 85, 100, 110, 120, 130, 140, 150, 165, 180, 181, 200, 250, 251, 320]
+
+
+@pytest.fixture
+def guardian(guardian, db_session):
+    _, patient_id = guardian
+    db_session.add_all(
+        GlucoseMeasurementModel(patient_id=patient_id, glucose_value=v,
+                                timestamp=BASE_TS + timedelta(minutes=5 * i), measurement_type="CGM")
+        for i, v in enumerate(VALUES)
+    )
+    db_session.commit()
+    return guardian
+
+
+def _stats(client, headers, patient_id, start=BASE_TS, end=BASE_TS + timedelta(days=1)):
+    params = {"patient_id": str(patient_id)}
+    if start is not None:
+        params["from"] = start.isoformat()
+    if end is not None:
+        params["to"] = end.isoformat()
+    return client.get("/api/v1/glucose/stats", params=params, headers=headers)
+
+
+class TestGlucoseStats:
+    def test_summary_matches_readings(self, client, guardian, headers):
+        _, patient_id = guardian
+        resp = _stats(client, headers, patient_id)
+
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        mean, sd = statistics.mean(VALUES), statistics.stdev(VALUES)
+        assert body["count"] == 20
+        assert body["mean"] == round(mean, 1)
+        assert body["sd"] == round(sd, 1)
+        assert body["cv"] == round(100 * sd / mean, 1)
+        assert body["gmi"] == round(gmi_percent(mean), 1)
+        assert (body["min"], body["max"]) == (40, 320)
+        assert body["from"] == BASE_TS.isoformat()
+        assert (body["target_range_low"], body["target_range_high"]) == (70, 180)
+        assert body["ranges"] == {"very_low": 10.0, "low": 15.0, "in_range": 50.0, "high": 15.0, "very_high": 10.0}
+        assert len(resp.content) < 500
+
+    def test_uses_health_profile_target_range(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        db_session.add(HealthProfileModel(patient_id=patient_id, target_range_low=100, target_range_high=150))
+        db_session.commit()
+
+        body = _stats(client, headers, patient_id).json()
+
+        assert (body["target_range_low"], body["target_range_high"]) == (100, 150)
+        # 54-99: 54, 60, 69, 70, 85 | 100-150: 100..150 | 151-250: 165, 180, 181, 200, 250
+        assert body["ranges"] == {"very_low": 10.0, "low": 25.0, "in_range": 30.0, "high": 25.0, "very_high": 10.0}
+
+    def test_window_is_half_open(self, client, guardian, headers):
+        _, patient_id = guardian
+        # Readings 2..4 only: BASE+10min inclusive, BASE+25min exclusive
+        body = _stats(client, headers, patient_id, BASE_TS + timedelta(minutes=10), BASE_TS + timedelta(minutes=25)).json()
+
+        assert body["count"] == 3
+        assert (body["min"], body["max"]) == (54, 69)
+        assert body["ranges"]["low"] == 100.0
+
+    def test_empty_window(self, client, guardian, headers):
+        _, patient_id = guardian
+        body = _stats(client, headers, patient_id, BASE_TS - timedelta(days=2), BASE_TS - timedelta(days=1)).json()
+
+        assert body["count"] == 0
+        assert body["mean"] is None and body["ranges"] is None
+        assert (body["target_range_low"], body["target_range_high"]) == (70, 180)
+
+    def test_single_aggregate_query(self, client, guardian, headers, count_statements):
+        _, patient_id = guardian
+        with count_statements() as counter:
+            assert _stats(client, headers, patient_id).status_code == 200
+
+        aggregates = [s for s in counter.statements if "glucose_measurements" in s]
+        assert len(aggregates) == 1
+        assert "count(" in aggregates[0].lower()
+
+    def test_default_window_ends_now(self, client, guardian, headers):
+        _, patient_id = guardian
+        body = _stats(client, headers, patient_id, start=None, end=None).json()
+
+        end = datetime.fromisoformat(body["to"])
+        assert abs((datetime.utcnow() - end).total_seconds()) < 60
+        assert end - datetime.fromisoformat(body["from"]) == timedelta(days=14)
+
+    def test_inverted_window_is_rejected(self, client, guardian, headers):
+        _, patient_id = guardian
+        assert _stats(client, headers, patient_id, BASE_TS, BASE_TS).status_code == 400
+
+    def test_other_guardian_gets_404(self, client, guardian, headers):
+        assert _stats(client, headers, uuid4()).status_code == 404
@@ -0,0 +1,129 @@
+"""
+GET /glucose/stream: Server-Sent Events pushed by POST /glucose/ through the broker.
+
+The stream never ends on its own, so it is driven as a raw ASGI call on the
+TestClient's event loop (its portal) while the test posts measurements.
+"""
+import asyncio
+import json
+import queue
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.api.routers import glucose as glucose_router
+from src.infrastructure.db.models import PatientModel
+from src.infrastructure.pubsub.broker import get_broker
+from src.main import app
+
+
+class SSEConnection:
+    """One GET /glucose/stream running on the TestClient's loop; messages land in a thread-safe queue."""
+
+    def __init__(self, client, patient_id, headers):
+        self.client = client
+        self.messages: "queue.Queue[dict]" = queue.Queue()
+        self._disconnected = None
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/v1/glucose/stream",
+            "raw_path": b"/api/v1/glucose/stream", "root_path": "",
+            "query_string": f"patient_id={patient_id}".encode(),
+            "headers": [(b"host", b"testserver")] + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("testclient", 50000), "server": ("testserver", 80),
+        }
+        self.done = client.portal.start_task_soon(self._run, scope)
+
+    async def _run(self, scope):
+        self._disconnected = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self._disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            self.messages.put(message)
+
+        await app(scope, receive, send)
+
+    def next_message(self, timeout=5.0) -> dict:
+        return self.messages.get(timeout=timeout)
+
+    def next_body(self, timeout=5.0) -> str:
+        while True:
+            message = self.next_message(timeout)
+            if message["type"] == "http.response.body":
+                return message["body"].decode()
+
+    def disconnect(self):
+        self.client.portal.call(self._disconnected.set)
+        self.done.result(timeout=5)
+
+
+def _post_reading(client, headers, patient_id, value, timestamp, notes=None):
+    reading = {"value": value, "timestamp": timestamp, "measurement_type": "CGM", "notes": notes}
+    resp = client.post(f"/api/v1/glucose/?patient_id={patient_id}", json=reading, headers=headers)
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+class TestGlucoseStream:
+    def test_pushes_committed_measurements(self, client, guardian, headers):
+        _, patient_id = guardian
+        stream = SSEConnection(client, patient_id, headers)
+
+        start = stream.next_message()
+        assert start["status"] == 200
+        assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+        assert stream.next_body() == f"retry: {glucose_router.STREAM_RETRY_MS}\n\n"
+
+        created = _post_reading(client, headers, patient_id, 142, "2026-05-01T08:00:00", notes="after breakfast")
+        frame = stream.next_body()
+
+        event, event_id, data = frame.rstrip("\n").split("\n")
+        assert event == "event: measurement"
+        assert event_id == f"id: {created['id']}"
+        payload = json.loads(data.removeprefix("data: "))
+        assert payload["glucose_value"] == 142 and payload["patient_id"] == str(patient_id)
+        assert "notes" not in payload  # PHI is not broadcast
+
+        stream.disconnect()
+        assert get_broker().subscriber_count() == 0
+
+    def test_only_the_patients_subscribers_get_it(self, client, db_session, guardian, headers):
+        user, patient_id = guardian
+        sibling = PatientModel(guardian_id=user.id, display_name="Sibling", role="DEPENDENT")
+        db_session.add(sibling)
+        db_session.commit()
+        mine, theirs = SSEConnection(client, patient_id, headers), SSEConnection(client, sibling.id, headers)
+        mine.next_body(), theirs.next_body()
+
+        _post_reading(client, headers, patient_id, 99, "2026-05-01T09:00:00")
+
+        assert "event: measurement" in mine.next_body()
+        with pytest.raises(queue.Empty):
+            theirs.next_message(timeout=0.2)
+        mine.disconnect()
+        theirs.disconnect()
+
+    def test_keep_alive_while_idle(self, client, guardian, headers, monkeypatch):
+        _, patient_id = guardian
+        monkeypatch.setattr(glucose_router, "STREAM_HEARTBEAT_SECONDS", 0.05)
+        stream = SSEConnection(client, patient_id, headers)
+        stream.next_body()
+
+        assert stream.next_body() == ": keep-alive\n\n"
+        stream.disconnect()
+
+    def test_other_guardian_gets_404(self, client, headers):
+        resp = client.get("/api/v1/glucose/stream", params={"patient_id": str(uuid4())}, headers=headers)
+        assert resp.status_code == 404
+
+    def test_requires_a_token(self, client, guardian):
+        _, patient_id = guardian
+        assert client.get("/api/v1/glucose/stream", params={"patient_id": str(patient_id)}).status_code == 401
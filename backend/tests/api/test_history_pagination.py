@@ -0,0 +1,153 @@
+"""
+Keyset (cursor) pagination for GET /nutrition/meals/history and GET /glucose/history.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.api.pagination import decode_cursor, encode_cursor
+from src.infrastructure.db.models import GlucoseMeasurementModel, MealLogModel, UserModel
+from src.infrastructure.security.auth import get_password_hash
+
+BASE_TS = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def _timestamps(n):
+    # Pairs of rows share a timestamp so the id tie-breaker is exercised
+    return [BASE_TS + timedelta(minutes=5 * (i // 2)) for i in range(n)]
+
+
+def _walk(client, url, headers=None, limit=4):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page_url = f"{url}&limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(page_url, headers=headers)
+        assert resp.status_code == 200, resp.text
+        ids.extend(row["id"] for row in resp.json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+
+
+class TestCursorEncoding:
+    def test_round_trip(self):
+        row_id = uuid4()
+        assert decode_cursor(encode_cursor(BASE_TS, row_id)) == (BASE_TS, row_id)
+
+    @pytest.mark.parametrize("bad", ["", "not-base64!", "Zm9v"])
+    def test_malformed_cursor_raises(self, bad):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+class TestGlucoseHistoryCursor:
+    def _seed(self, db_session, patient_id, n=11):
+        rows = [
+            # Same-timestamp pairs differ in type (unique per patient/timestamp/type)
+            GlucoseMeasurementModel(
+                patient_id=patient_id, glucose_value=100 + i, timestamp=ts,
+                measurement_type="CGM" if i % 2 else "FINGER",
+            )
+            for i, ts in enumerate(_timestamps(n))
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+
+    def test_cursor_walk_matches_full_listing(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        self._seed(db_session, patient_id)
+        url = f"/api/v1/glucose/history?patient_id={patient_id}"
+
+        full = [r["id"] for r in client.get(f"{url}&limit=100", headers=headers).json()]
+        walked, pages = _walk(client, url, headers=headers)
+
+        assert len(full) == 11
+        assert walked == full
+        assert pages == 3
+
+    def test_last_page_has_no_cursor(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        self._seed(db_session, patient_id, n=3)
+        resp = client.get(f"/api/v1/glucose/history?patient_id={patient_id}&limit=3", headers=headers)
+        assert len(resp.json()) == 3
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_offset_still_supported(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        self._seed(db_session, patient_id)
+        url = f"/api/v1/glucose/history?patient_id={patient_id}"
+        full = [r["id"] for r in client.get(f"{url}&limit=100", headers=headers).json()]
+
+        page = client.get(f"{url}&limit=4&offset=4", headers=headers).json()
+        assert [r["id"] for r in page] == full[4:8]
+
+    def test_invalid_cursor_returns_400(self, client, guardian, headers):
+        _, patient_id = guardian
+        resp = client.get(f"/api/v1/glucose/history?patient_id={patient_id}&cursor=garbage", headers=headers)
+        assert resp.status_code == 400
+
+
+class TestMealHistoryCursor:
+    def _seed(self, db_session, patient_id, n=9):
+        rows = [
+            MealLogModel(patient_id=patient_id, total_carbs_grams=float(i), total_glycemic_load=1.0, timestamp=ts)
+            for i, ts in enumerate(_timestamps(n))
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+
+    def test_cursor_walk_matches_full_listing(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        self._seed(db_session, patient_id)
+        url = f"/api/v1/nutrition/meals/history?patient_id={patient_id}"
+
+        full = [r["id"] for r in client.get(f"{url}&limit=100", headers=headers).json()]
+        walked, pages = _walk(client, url, headers=headers)
+
+        assert len(full) == 9
+        assert walked == full
+        assert pages == 3
+
+    def test_offset_still_supported(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        self._seed(db_session, patient_id)
+        url = f"/api/v1/nutrition/meals/history?patient_id={patient_id}"
+        full = [r["id"] for r in client.get(f"{url}&limit=100", headers=headers).json()]
+
+        page = client.get(f"{url}&limit=3&offset=3", headers=headers).json()
+        assert [r["id"] for r in page] == full[3:6]
+
+    def test_invalid_cursor_returns_400(self, client, guardian, headers):
+        _, patient_id = guardian
+        resp = client.get(f"/api/v1/nutrition/meals/history?patient_id={patient_id}&cursor=%%%", headers=headers)
+        assert resp.status_code == 400
+
+    def test_notes_only_with_include(self, client, db_session, guardian, headers):
+        _, patient_id = guardian
+        db_session.add(MealLogModel(patient_id=patient_id, total_carbs_grams=30.0, total_glycemic_load=5.0,
+                                    timestamp=BASE_TS, notes="Me siento mareado"))
+        db_session.commit()
+        url = f"/api/v1/nutrition/meals/history?patient_id={patient_id}"
+
+        assert client.get(url, headers=headers).json()[0]["notes"] is None
+        assert client.get(f"{url}&include=notes", headers=headers).json()[0]["notes"] == "Me siento mareado"
+        assert client.get(f"{url}&include=ingredients", headers=headers).status_code == 400
+
+    def test_notes_need_the_patients_guardian(self, client, db_session, guardian):
+        _, patient_id = guardian
+        db_session.add(MealLogModel(patient_id=patient_id, total_carbs_grams=30.0, total_glycemic_load=5.0,
+                                    timestamp=BASE_TS, notes="Me siento mareado"))
+        stranger = UserModel(email=f"stranger_{uuid4().hex[:8]}@example.com",
+                             hashed_password=get_password_hash("pass1234"), is_active=True)
+        db_session.add(stranger)
+        db_session.commit()
+        url = f"/api/v1/nutrition/meals/history?patient_id={patient_id}&include=notes"
+        token = client.post("/api/v1/auth/login",
+                            data={"username": stranger.email, "password": "pass1234"}).json()["access_token"]
+
+        assert client.get(url).status_code == 401
+        resp = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert resp.status_code == 404
+        assert "Me siento mareado" not in resp.text
@@ -82,6 +82,57 @@ class TestCreateIngredient:
         assert "carbs_per_100g" not in results[0]
 
 
+class TestAccentInsensitiveSearch:
+    def test_search_without_accents_finds_accented_name(self, client):
+        """'platano' encuentra 'Plátano maduro'."""
+        client.post("/api/v1/nutrition/ingredients", json={
+            "name": "Plátano maduro",
+            "glycemic_index": 62,
+            "carbs_per_100g": 23.0,
+            "fiber_per_100g": 2.6,
+        })
+        response = client.get("/api/v1/nutrition/ingredients?q=platano")
+        assert response.status_code == 200
+        assert [r["name"] for r in response.json()] == ["Plátano maduro"]
+
+    def test_search_with_accents_and_uppercase(self, client):
+        """'JAMÓN' encuentra 'Jamón serrano' y 'jamon' también."""
+        client.post("/api/v1/nutrition/ingredients", json={
+            "name": "Jamón serrano",
+            "glycemic_index": 0,
+            "carbs_per_100g": 0.0,
+        })
+        for q in ("JAMÓN", "jamon"):
+            response = client.get(f"/api/v1/nutrition/ingredients?q={q}")
+            assert [r["name"] for r in response.json()] == ["Jamón serrano"]
+
+    def test_duplicate_ignores_accents_and_case(self, client):
+        """'PURE DE PATATA' es duplicado de 'Puré de patata' -> 409."""
+        base = {"glycemic_index": 87, "carbs_per_100g": 15.0, "fiber_per_100g": 1.0}
+        first = client.post("/api/v1/nutrition/ingredients", json={"name": "Puré de patata", **base})
+        assert first.status_code == 201
+        second = client.post("/api/v1/nutrition/ingredients", json={"name": "PURE DE PATATA", **base})
+        assert second.status_code == 409
+
+    def test_enye_is_not_folded(self, client):
+        """'Año' y 'Ano' son nombres distintos: la ñ no se reduce a n."""
+        base = {"glycemic_index": 50, "carbs_per_100g": 10.0}
+        assert client.post("/api/v1/nutrition/ingredients", json={"name": "Año nuevo", **base}).status_code == 201
+        assert client.post("/api/v1/nutrition/ingredients", json={"name": "Ano nuevo", **base}).status_code == 201
+        assert client.post("/api/v1/nutrition/ingredients", json={"name": "AÑO NUEVO", **base}).status_code == 409
+
+    def test_normalized_key_is_stored(self, client, db_session):
+        """El ORM rellena name_normalized al insertar."""
+        from src.infrastructure.db.models import IngredientModel
+        client.post("/api/v1/nutrition/ingredients", json={
+            "name": "Piña  en Almíbar",
+            "glycemic_index": 59,
+            "carbs_per_100g": 20.0,
+        })
+        stored = db_session.query(IngredientModel).filter_by(name="Piña  en Almíbar").one()
+        assert stored.name_normalized == "piña en almibar"
+
+
 class TestSeedIngredients:
     def test_seed_populates_database(self, client):
         """POST /ingredients/seed inserta alimentos base y devuelve cuántos se añadieron."""
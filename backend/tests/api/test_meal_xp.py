@@ -4,8 +4,11 @@ Test: Registrar una comida otorga XP al usuario autenticado.
 TDD — RED phase: este test debe fallar hasta que log_meal llame a XPRepository.
 """
 import pytest
+from unittest.mock import patch
 from uuid import uuid4
-from src.infrastructure.db.models import UserModel, PatientModel, IngredientModel
+from sqlalchemy import func, select
+from src.infrastructure.db.models import UserModel, PatientModel, IngredientModel, MealLogModel
+from src.infrastructure.db.xp_repository import AsyncXPRepository
 from src.infrastructure.security.auth import get_password_hash
 
 
@@ -122,3 +125,51 @@ class TestMealLoggingAwardsXP:
         assert "meal_logged" in reasons, (
             f"Se esperaba una transacción con reason='meal_logged'. Historial: {reasons}"
         )
+
+
+class TestMealLoggingUnitOfWork:
+    """Comida, items y XP se confirman juntos y sin SELECT de refresco."""
+
+    def test_no_refresh_select_after_insert(
+        self, client, user_with_patient_and_ingredient, auth_headers, count_statements
+    ):
+        data = user_with_patient_and_ingredient
+        payload = {
+            "patient_id": data["patient_id"],
+            "ingredients": [{"ingredient_id": data["ingredient_id"], "weight_grams": 120}],
+            "notes": "Merienda",
+        }
+
+        with count_statements() as counter:
+            resp = client.post("/api/v1/nutrition/meals", json=payload, headers=auth_headers)
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["total_carbs_grams"] == pytest.approx(13.8 * 1.2)
+        reloads = [
+            s for s in counter.statements
+            if s.lstrip().upper().startswith("SELECT") and ("meals_log" in s or "xp_transactions" in s)
+        ]
+        assert reloads == []
+
+    def test_failed_xp_award_does_not_persist_meal(
+        self, client, db_session, user_with_patient_and_ingredient, auth_headers
+    ):
+        data = user_with_patient_and_ingredient
+        payload = {
+            "patient_id": data["patient_id"],
+            "ingredients": [{"ingredient_id": data["ingredient_id"], "weight_grams": 100}],
+        }
+        flushed = []
+
+        async def add_xp_fails_after_the_meal_is_flushed(self, *args, **kwargs):
+            await self.db.flush()  # la comida y sus items ya están en la BD, sin confirmar
+            flushed.append((await self.db.execute(select(func.count()).select_from(MealLogModel))).scalar())
+            raise RuntimeError("xp store down")
+
+        with patch.object(AsyncXPRepository, "add_xp", add_xp_fails_after_the_meal_is_flushed):
+            resp = client.post("/api/v1/nutrition/meals", json=payload, headers=auth_headers)
+
+        assert resp.status_code == 400
+        assert flushed == [1]
+        db_session.expunge_all()
+        assert db_session.query(MealLogModel).count() == 0
@@ -0,0 +1,148 @@
+"""
+GET /metrics: per-route-template latency, status counters, in-flight gauge and SQL per request.
+"""
+import re
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.api.metrics import get_request_metrics
+
+
+@pytest.fixture
+def metrics(engine, async_engine):
+    """The process-wide registry, reset and listening on the test engines."""
+    registry = get_request_metrics()
+    registry.attach(engine)
+    registry.attach(async_engine.sync_engine)
+    registry.reset()
+    yield registry
+    registry.detach(engine)
+    registry.detach(async_engine.sync_engine)
+    registry.reset()
+
+
+def _samples(body: str) -> dict:
+    samples = {}
+    for line in body.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_route_template_is_one_series(client, metrics, headers, guardian):
+    _, patient_id = guardian
+    for _ in range(2):
+        assert client.get(f"/api/v1/family/members/{patient_id}", headers=headers).status_code == 200
+    assert client.get(f"/api/v1/family/members/{uuid4()}", headers=headers).status_code == 404
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(resp.text)
+
+    route = 'method="GET",route="/api/v1/family/members/{patient_id}"'
+    assert samples[f'http_requests_total{{{route},status="200"}}'] == 2
+    assert samples[f'http_requests_total{{{route},status="404"}}'] == 1
+    assert samples[f'http_request_duration_seconds_count{{{route}}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}'] == 3
+    assert str(patient_id) not in resp.text
+    # Only the /metrics request itself is being served while rendering
+    assert samples["http_requests_in_flight"] == 1
+
+
+def test_sql_statements_per_request(client, metrics, headers, guardian, count_statements):
+    _, patient_id = guardian
+    with count_statements() as counter:
+        # Sync route (threadpool) and async route (greenlet) both attribute their SQL
+        assert client.get(f"/api/v1/family/members/{patient_id}", headers=headers).status_code == 200
+        assert client.get(f"/api/v1/glucose/history?patient_id={patient_id}", headers=headers).status_code == 200
+
+    samples = _samples(client.get("/metrics").text)
+    family = 'method="GET",route="/api/v1/family/members/{patient_id}"'
+    glucose = 'method="GET",route="/api/v1/glucose/history"'
+    per_request = (
+        samples[f"http_request_sql_statements_sum{{{family}}}"]
+        + samples[f"http_request_sql_statements_sum{{{glucose}}}"]
+    )
+    assert samples[f"http_request_sql_statements_sum{{{glucose}}}"] >= 1
+    assert per_request == counter.count
+    assert samples["db_statements_total"] >= counter.count
+    assert samples[f"http_request_sql_duration_seconds_sum{{{glucose}}}"] > 0
+
+
+def test_unmatched_paths_share_a_series(client, metrics):
+    for path in ("/nope", "/also/not/here"):
+        assert client.get(path).status_code == 404
+
+    samples = _samples(client.get("/metrics").text)
+
+    assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] == 2
+
+
+def test_histogram_buckets_are_cumulative(client, metrics):
+    for _ in range(3):
+        client.get("/health")
+
+    body = client.get("/metrics").text
+    counts = [
+        float(v) for v in re.findall(
+            r'^http_request_duration_seconds_bucket\{method="GET",route="/health",le="[^"]+"\} (\S+)$', body, re.M
+        )
+    ]
+
+    assert counts == sorted(counts)
+    assert counts[-1] == 3
+
+
+def test_disabled_metrics_pass_through(client, metrics):
+    metrics.enabled = False
+    try:
+        client.get("/health")
+    finally:
+        metrics.enabled = True
+
+    assert "route=\"/health\"" not in client.get("/metrics").text
+
+
+def test_failed_statement_leaves_no_start_time(metrics, engine):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from src.infrastructure.api.metrics import _QUERY_START_KEY
+
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get(_QUERY_START_KEY) == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get(_QUERY_START_KEY) == []
+
+
+def test_streams_leave_in_flight_and_request_latency(metrics):
+    import asyncio
+
+    from src.infrastructure.api.metrics import MetricsMiddleware
+
+    during = {}
+
+    async def sse_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream; charset=utf-8")]})
+        during["in_flight"], during["streams_open"] = metrics.in_flight, metrics.streams_open
+        await send({"type": "http.response.body", "body": b": keep-alive\n\n", "more_body": False})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/glucose/stream"}
+    asyncio.run(MetricsMiddleware(sse_app, metrics)(scope, None, send))
+    samples = _samples(metrics.render())
+
+    assert during == {"in_flight": 0, "streams_open": 1}
+    assert samples["http_requests_in_flight"] == 0
+    assert samples["http_streams_open"] == 0
+    assert samples['http_requests_total{method="GET",route="unmatched",status="200"}'] == 1
+    assert samples['http_stream_duration_seconds_count{method="GET",route="unmatched"}'] == 1
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched"}' not in samples
@@ -6,9 +6,9 @@ XP history, and achievements endpoints. Follows TDD approach.
 """
 
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 
-from src.infrastructure.db.models import UserModel, HealthProfileModel
+from src.infrastructure.db.models import AchievementModel, HealthProfileModel, UserAchievementModel, UserModel
 from src.infrastructure.security.auth import get_password_hash
 
 
@@ -284,6 +284,26 @@ class TestUserAchievements:
         response = client.get("/api/v1/users/me/achievements")
         assert response.status_code == 401
 
+    def test_get_achievements_query_budget(
+        self, client, db_session, test_user_with_profile, authenticated_headers, query_budget
+    ):
+        """Unlocked achievements resolve their definitions in one extra query, not one per row"""
+        user_id = UUID(test_user_with_profile["user_id"])
+        for i in range(4):
+            achievement = AchievementModel(
+                name=f"Budget {i}", description="-", category="milestone", icon="star", xp_reward=10
+            )
+            db_session.add(achievement)
+            db_session.flush()
+            db_session.add(UserAchievementModel(user_id=user_id, achievement_id=achievement.id))
+        db_session.commit()
+
+        with query_budget(max_queries=4, max_repeats=1):
+            response = client.get("/api/v1/users/me/achievements", headers=authenticated_headers)
+
+        assert response.status_code == 200
+        assert len(response.json()["unlocked"]) == 4
+
 
 class TestXPSummary:
     """Test GET /api/v1/users/me/xp-summary endpoint"""
@@ -0,0 +1,170 @@
+"""
+get_current_user identity cache: LRU+TTL keyed by (user_id, token iat),
+invalidated on password change and profile update, shared within a request.
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event
+
+from src.infrastructure.api.dependencies import get_current_user
+from src.infrastructure.cache.user_identity import CachedUser, UserIdentityCache, get_user_identity_cache
+from src.infrastructure.db.database import get_db
+from src.infrastructure.db.models import HealthProfileModel, UserModel
+from src.infrastructure.security.auth import get_password_hash
+from src.infrastructure.security.jwt_handler import ALGORITHM, SECRET_KEY, create_access_token
+
+
+def _user_selects(counter) -> int:
+    return sum(1 for s in counter.statements if s.lstrip().upper().startswith("SELECT") and "FROM users" in s)
+
+
+@pytest.fixture
+def user(db_session):
+    user = UserModel(
+        id=uuid4(),
+        email=f"cache_{uuid4().hex[:6]}@example.com",
+        hashed_password=get_password_hash("password123"),
+        full_name="Cache User",
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.add(HealthProfileModel(user_id=user.id, diabetes_type="T1", target_glucose="100"))
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+class TestIdentityCacheOnRoutes:
+    def test_repeated_requests_hit_cache(self, client, db_session, user, headers, count_statements):
+        client.get("/api/v1/users/me", headers=headers)
+        db_session.expunge_all()  # the next request cannot rely on the identity map
+
+        with count_statements() as counter:
+            resp = client.get("/api/v1/users/me", headers=headers)
+
+        assert resp.status_code == 200
+        assert resp.json()["email"] == user.email
+        assert _user_selects(counter) == 0
+        assert client.get("/health/user-cache").json() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_new_token_is_a_new_key(self, client, user, headers):
+        client.get("/api/v1/users/me", headers=headers)
+        older = jwt.encode({"sub": str(user.id), "iat": 1, "exp": 4102444800}, SECRET_KEY, algorithm=ALGORITHM)
+        other = {"Authorization": f"Bearer {older}"}
+        client.get("/api/v1/users/me", headers=other)
+
+        assert get_user_identity_cache().stats()["misses"] == 2
+
+    def test_password_change_invalidates_and_reads_fresh_hash(self, client, db_session, engine, user, headers):
+        client.get("/api/v1/users/me", headers=headers)
+        db_session.expunge_all()
+        hash_loads_on_the_loop = []
+
+        def on_execute(conn, cursor, statement, *args):
+            if "users.hashed_password" in statement:
+                try:
+                    asyncio.get_running_loop()
+                    hash_loads_on_the_loop.append(statement)
+                except RuntimeError:
+                    pass
+
+        event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            resp = client.post("/api/v1/users/me/change-password", headers=headers, json={
+                "old_password": "password123", "new_password": "newpassword456", "confirm_password": "newpassword456",
+            })
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+
+        assert resp.status_code == 200, resp.text
+        assert hash_loads_on_the_loop == []
+        assert get_user_identity_cache().stats()["size"] == 0
+        login = client.post("/api/v1/auth/login", data={"username": user.email, "password": "newpassword456"})
+        assert login.status_code == 200
+
+    def test_profile_update_invalidates(self, client, user, headers):
+        client.get("/api/v1/users/me", headers=headers)
+
+        resp = client.patch("/api/v1/users/me/health-profile", headers=headers, json={"target_glucose": 110})
+
+        assert resp.status_code == 200
+        assert get_user_identity_cache().stats()["size"] == 0
+
+    def test_shared_within_request(self, db_session, user, headers, count_statements):
+        mini = FastAPI()
+
+        def current_email(current: UserModel = Depends(get_current_user)) -> str:
+            return current.email
+
+        @mini.get("/whoami")
+        def whoami(current: UserModel = Depends(get_current_user), email: str = Depends(current_email)):
+            return {"id": str(current.id), "email": email}
+
+        mini.dependency_overrides[get_db] = lambda: db_session
+        db_session.expunge_all()
+        with count_statements() as counter:
+            resp = TestClient(mini).get("/whoami", headers=headers)
+
+        assert resp.json() == {"id": str(user.id), "email": user.email}
+        assert _user_selects(counter) == 1
+
+
+    def test_token_is_decoded_once_per_request(self, client, headers, monkeypatch):
+        decodes = []
+        real_decode = jwt.decode
+        monkeypatch.setattr(jwt, "decode", lambda *a, **kw: decodes.append(1) or real_decode(*a, **kw))
+
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+        assert len(decodes) == 1
+
+    def test_missing_or_invalid_token_is_401(self, client):
+        assert client.get("/api/v1/users/me").status_code == 401
+        resp = client.get("/api/v1/users/me", headers={"Authorization": "Bearer not-a-jwt"})
+        assert resp.status_code == 401
+        assert resp.headers["WWW-Authenticate"] == "Bearer"
+
+class TestUserIdentityCache:
+    def _entry(self):
+        return CachedUser(id=uuid4(), email="a@example.com", full_name=None, is_active=True)
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = UserIdentityCache(ttl_seconds=10, clock=lambda: now[0])
+        entry = self._entry()
+        cache.put((entry.id, 1), entry)
+
+        assert cache.get((entry.id, 1)) == entry
+        now[0] = 11.0
+        assert cache.get((entry.id, 1)) is None
+        assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+    def test_lru_eviction(self):
+        cache = UserIdentityCache(max_entries=2)
+        a, b, c = self._entry(), self._entry(), self._entry()
+        cache.put((a.id, 1), a)
+        cache.put((b.id, 1), b)
+        cache.get((a.id, 1))  # a becomes most recently used
+        cache.put((c.id, 1), c)
+
+        assert cache.get((b.id, 1)) is None
+        assert cache.get((a.id, 1)) == a
+
+    def test_invalidate_drops_every_token_of_user(self):
+        cache = UserIdentityCache()
+        a, b = self._entry(), self._entry()
+        cache.put((a.id, 1), a)
+        cache.put((a.id, 2), a)
+        cache.put((b.id, 1), b)
+
+        cache.invalidate(a.id)
+
+        assert cache.stats()["size"] == 1
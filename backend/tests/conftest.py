@@ -5,25 +5,39 @@ from unittest.mock import patch
 
 # Add project root to sys.path to ensure src module can be found
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from sqlalchemy import create_engine
+import sqlite3
+import aiosqlite
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from src.main import app
-from src.infrastructure.db.database import Base, get_db
+from src.infrastructure.db.database import Base, get_async_db, get_db
 
 # Use SQLite in-memory for testing to avoid external dependencies
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 @pytest.fixture(scope="session")
-def engine():
+def sqlite_connection():
+    """
+    The single in-memory database of the test session. Both the sync engine and
+    the async (aiosqlite) engine wrap this same sqlite3 connection, so sync
+    fixtures and async routes see the same data inside the per-test transaction.
+    """
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    yield conn
+    conn.close()
+
+@pytest.fixture(scope="session")
+def engine(sqlite_connection):
     """
     Create a single engine for the test session.
     StaticPool is critical for in-memory SQLite to persist state across connections.
     """
     engine = create_engine(
         TEST_DATABASE_URL, 
-        connect_args={"check_same_thread": False},
+        creator=lambda: sqlite_connection,
         poolclass=StaticPool
     )
     
@@ -35,6 +49,131 @@ def engine():
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
 
+class _SharedSQLiteConnection:
+    """The session's sqlite3 connection as handed to aiosqlite: close() is a no-op,
+    the connection belongs to the sqlite_connection fixture."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass
+
+ASYNC_TRANSACTION_SAVEPOINT = "async_transaction"
+
+@pytest.fixture(scope="session")
+def async_engine(engine, sqlite_connection):
+    """
+    aiosqlite engine over the shared sqlite3 connection.
+
+    The only real transaction is the one db_session opens per test and rolls back
+    at teardown, so each async transaction runs as a savepoint inside it: COMMIT
+    releases the savepoint and ROLLBACK undoes the writes, as against a real database.
+    """
+    aio_connections = []
+    open_transactions = set()
+
+    def do_begin(dbapi_connection):
+        dbapi_connection.cursor().execute(f"SAVEPOINT {ASYNC_TRANSACTION_SAVEPOINT}")
+        open_transactions.add(id(dbapi_connection))
+
+    def do_commit(dbapi_connection):
+        if id(dbapi_connection) in open_transactions:
+            open_transactions.discard(id(dbapi_connection))
+            dbapi_connection.cursor().execute(f"RELEASE SAVEPOINT {ASYNC_TRANSACTION_SAVEPOINT}")
+
+    def do_rollback(dbapi_connection):
+        # Also called on pool check-in, when the transaction may already be over
+        if id(dbapi_connection) in open_transactions:
+            open_transactions.discard(id(dbapi_connection))
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {ASYNC_TRANSACTION_SAVEPOINT}")
+            cursor.execute(f"RELEASE SAVEPOINT {ASYNC_TRANSACTION_SAVEPOINT}")
+
+    async def creator():
+        conn = await aiosqlite.Connection(lambda: _SharedSQLiteConnection(sqlite_connection), iter_chunk_size=64)
+        aio_connections.append(conn)
+        return conn
+
+    async_engine = create_async_engine("sqlite+aiosqlite://", async_creator=creator, poolclass=StaticPool)
+    async_engine.sync_engine.dialect.do_begin = do_begin
+    async_engine.sync_engine.dialect.do_commit = do_commit
+    async_engine.sync_engine.dialect.do_rollback = do_rollback
+
+    yield async_engine
+
+    # Stop the aiosqlite worker threads (non-daemon) so the interpreter can exit
+    for conn in aio_connections:
+        conn.stop()
+
+class StatementCounter:
+    """Counts SQL statements sent to the DB while the context is active."""
+
+    def __init__(self, *engines):
+        self.engines = engines
+        self.count = 0
+        self.statements = []
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, *args, **kwargs):
+        self.count += 1
+        self.statements.append(statement)
+
+@pytest.fixture
+def count_statements(engine, async_engine):
+    """Usage: `with count_statements() as counter: ...; assert counter.count == N`."""
+    return lambda: StatementCounter(engine, async_engine.sync_engine)
+
+@pytest.fixture
+def query_budget(engine, async_engine):
+    """
+    Usage: `with query_budget(max_queries=3): client.get(...)`. Fails the test when the
+    block runs more statements, or repeats one more than max_repeats times (N+1),
+    with the src/ stack that issued each repeated statement.
+    """
+    from src.infrastructure.api.query_inspector import DEFAULT_MAX_REPEATS, QueryBudget
+    return lambda max_queries=None, max_repeats=DEFAULT_MAX_REPEATS: QueryBudget(
+        engine, async_engine.sync_engine, max_queries=max_queries, max_repeats=max_repeats
+    )
+
+@pytest.fixture(autouse=True)
+def reset_ingredient_catalog():
+    """
+    The ingredient catalog is a process-wide cache; each test rolls back its
+    transaction, so drop any snapshot loaded by a previous test.
+    """
+    from src.infrastructure.cache.ingredient_catalog import get_ingredient_catalog
+    get_ingredient_catalog().invalidate()
+    yield
+    get_ingredient_catalog().invalidate()
+
+@pytest.fixture(autouse=True)
+def reset_user_identity_cache():
+    """Process-wide like the catalog: cached users would outlive the rolled-back test data."""
+    from src.infrastructure.cache.user_identity import get_user_identity_cache
+    get_user_identity_cache().clear()
+    yield
+    get_user_identity_cache().clear()
+
+@pytest.fixture(autouse=True)
+def reset_agp_cache():
+    """Process-wide too: cached profiles would outlive the rolled-back readings."""
+    from src.infrastructure.cache.glucose_agp import get_agp_cache
+    get_agp_cache().clear()
+    yield
+    get_agp_cache().clear()
+
 @pytest.fixture(scope="function")
 def db_session(engine):
     """
@@ -43,6 +182,9 @@ def db_session(engine):
     """
     connection = engine.connect()
     transaction = connection.begin()
+    # pysqlite only opens the transaction before the first write; open it now so
+    # the async engine's savepoints always nest inside it
+    connection.exec_driver_sql("BEGIN")
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=connection)
     session = SessionLocal()
@@ -54,15 +196,25 @@ def db_session(engine):
     connection.close()
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def async_session_factory(async_engine, db_session):
+    """AsyncSession factory for the test database (requires db_session's transaction)."""
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(scope="function")
+def client(db_session, async_session_factory):
     """
-    Override the get_db dependency with the test session.
+    Override the get_db dependency with the test session, and get_async_db with an
+    AsyncSession on the same underlying connection.
     """
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
             
     # Override lifespan to avoid real DB connection startup
     from contextlib import asynccontextmanager
@@ -79,13 +231,46 @@ def client(db_session):
     # Patch SessionLocal to ensure get_db always returns the test session
     # Also patch global engine to prevent any accidental production DB connections
     with patch("src.infrastructure.db.database.SessionLocal", return_value=db_session), \
+         patch("src.infrastructure.db.database.AsyncSessionLocal", async_session_factory), \
          patch("src.main.engine", engine), \
          patch("src.infrastructure.db.database.engine", engine):
         
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_async_db
         with TestClient(app) as c:
             yield c
         
     # Restore
     app.router.lifespan_context = original_lifespan
     app.dependency_overrides.clear()
+
+GUARDIAN_PASSWORD = "pass1234"
+
+@pytest.fixture
+def guardian(db_session):
+    """
+    A guardian with one dependent patient; returns (user, patient_id). Test files
+    that need readings override it as `def guardian(guardian, db_session)` and seed.
+    """
+    from uuid import uuid4
+    from src.infrastructure.db.models import PatientModel, UserModel
+    from src.infrastructure.security.auth import get_password_hash
+
+    user = UserModel(
+        email=f"guardian_{uuid4().hex[:8]}@example.com",
+        hashed_password=get_password_hash(GUARDIAN_PASSWORD),
+        is_active=True,
+    )
+    db_session.add(user)
+    db_session.flush()
+    patient = PatientModel(guardian_id=user.id, display_name="Test Kid", role="DEPENDENT")
+    db_session.add(patient)
+    db_session.commit()
+    return user, patient.id
+
+@pytest.fixture
+def headers(client, guardian):
+    """Bearer header for `guardian`, obtained through POST /auth/login."""
+    user, _ = guardian
+    resp = client.post("/api/v1/auth/login", data={"username": user.email, "password": GUARDIAN_PASSWORD})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
@@ -0,0 +1,62 @@
+"""
+AGP percentiles by time-of-day slot: agreement with numpy.percentile and the window.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.domain.glucose_agp import AGP_PERCENTILES, agp_slots, agp_window
+
+BASE_TS = datetime(2026, 5, 1)
+
+
+def _readings(days=14, seed=5):
+    rng = random.Random(seed)
+    return [
+        (BASE_TS + timedelta(minutes=5 * i + rng.randint(0, 4)), rng.randint(40, 400))
+        for i in range(days * 288)
+    ]
+
+
+class TestAgpSlots:
+    @pytest.mark.parametrize("slot_minutes", [5, 15])
+    def test_matches_numpy_percentile_per_slot(self, slot_minutes):
+        readings = _readings()
+        slots = agp_slots(readings, slot_minutes)
+
+        assert len(slots) == 24 * 60 // slot_minutes
+        for i in (0, 7, len(slots) // 2, len(slots) - 1):
+            values = [v for ts, v in readings if (ts.hour * 60 + ts.minute) // slot_minutes == i]
+            expected = np.percentile(values, AGP_PERCENTILES)
+            slot = slots[i]
+            assert slot.count == len(values)
+            assert [slot.p5, slot.p25, slot.p50, slot.p75, slot.p95] == pytest.approx(expected, abs=0.051)
+
+    def test_slot_labels_and_folding(self):
+        # Same time of day on different days lands in the same slot
+        readings = [(BASE_TS + timedelta(days=d, hours=7, minutes=20), 100 + d) for d in range(5)]
+        slots = agp_slots(readings, 15)
+
+        assert slots[0].start == "00:00" and slots[-1].start == "23:45"
+        [filled] = [s for s in slots if s.count]
+        assert filled.start == "07:15" and filled.count == 5
+        assert (filled.p5, filled.p50, filled.p95) == (100.2, 102.0, 103.8)
+
+    def test_empty_slots_have_no_percentiles(self):
+        slots = agp_slots([], 5)
+        assert len(slots) == 288
+        assert all(s.count == 0 and s.p50 is None for s in slots)
+
+    def test_single_reading_slot(self):
+        [slot] = [s for s in agp_slots([(BASE_TS, 123)], 15) if s.count]
+        assert slot.p5 == slot.p95 == 123.0
+
+    def test_rejects_other_slot_sizes(self):
+        with pytest.raises(ValueError):
+            agp_slots([], 10)
+
+
+def test_window_covers_whole_days_ending_on_the_date():
+    assert agp_window(date(2026, 5, 14)) == (datetime(2026, 5, 1), datetime(2026, 5, 15))
@@ -0,0 +1,95 @@
+"""
+Async repositories (AsyncSession) behave like their sync counterparts.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.application.repositories.nutrition_repository import AsyncNutritionRepository
+from src.application.use_cases.log_meal import execute_log_meal_async
+from src.infrastructure.cache.ingredient_catalog import IngredientCatalog
+from src.domain.glucose_models import GlucoseCreateRequest, GlucoseType
+from src.infrastructure.db.database import to_async_url
+from src.infrastructure.db.models import IngredientModel, PatientModel, UserModel
+from src.infrastructure.db.xp_repository import AsyncXPRepository, XPRepository
+from src.infrastructure.repositories.glucose_repository import AsyncGlucoseRepository
+
+
+@pytest.fixture
+def patient(db_session):
+    user = UserModel(email=f"async_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    patient = PatientModel(guardian_id=user.id, display_name="Async", role="DEPENDENT")
+    db_session.add(patient)
+    db_session.flush()
+    return patient
+
+
+def _run(async_session_factory, fn):
+    async def main():
+        async with async_session_factory() as session:
+            return await fn(session)
+    return asyncio.run(main())
+
+
+def test_to_async_url():
+    assert to_async_url("postgresql+psycopg2://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("sqlite:///./local.db") == "sqlite+aiosqlite:///./local.db"
+
+
+class TestAsyncGlucoseRepository:
+    def test_create_history_and_duplicates(self, async_session_factory, patient):
+        start = datetime(2026, 3, 1, 8, 0)
+        readings = [
+            GlucoseCreateRequest(value=100 + i, timestamp=start + timedelta(minutes=5 * i), measurement_type=GlucoseType.CGM)
+            for i in range(5)
+        ]
+
+        async def scenario(session):
+            repo = AsyncGlucoseRepository(session)
+            created = await repo.create_measurement(patient.id, readings[0])
+            with pytest.raises(IntegrityError):
+                await repo.create_measurement(patient.id, readings[0])
+            inserted = await repo.bulk_create_measurements(patient.id, readings)
+            history = await repo.get_history(patient.id, limit=3)
+            latest = await repo.get_latest(patient.id)
+            return created, inserted, history, latest
+
+        created, inserted, history, latest = _run(async_session_factory, scenario)
+
+        assert created.glucose_value == 100
+        assert inserted == 4  # the first reading was already stored
+        assert [m.glucose_value for m in history] == [104, 103, 102]
+        assert latest.glucose_value == 104
+
+
+class TestAsyncNutritionRepository:
+    def test_log_meal_with_xp_in_one_commit_and_history(self, async_session_factory, db_session, patient):
+        ingredient = IngredientModel(name="Pan async", glycemic_index=70, carbs_per_100g=50.0, fiber_per_100g=0.0)
+        db_session.add(ingredient)
+        db_session.flush()
+
+        async def scenario(session):
+            repo = AsyncNutritionRepository(session, catalog=IngredientCatalog(session_factory=async_session_factory))
+            meal = await execute_log_meal_async(
+                patient_id=patient.id,
+                ingredients_input=[{"ingredient_id": ingredient.id, "weight_grams": 40}],
+                notes="Desayuno",
+                repo=repo,
+                commit=False,
+            )
+            await AsyncXPRepository(session).add_xp(patient.guardian_id, 10, "meal_logged", "Comida registrada", commit=False)
+            await session.commit()
+            found = await repo.search_ingredients("pan as")
+            return meal, await repo.get_meal_history(patient.id), found
+
+        meal, history, found = _run(async_session_factory, scenario)
+
+        assert meal.total_carbs_grams == pytest.approx(20.0)
+        assert [m.id for m in history] == [meal.id]
+        assert [i.name for i in found] == ["Pan async"]
+        assert XPRepository(db_session).get_user_total_xp(patient.guardian_id) == 10
@@ -0,0 +1,77 @@
+"""
+Connection pool settings from the environment and pool instrumentation.
+"""
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.infrastructure.api.metrics import get_request_metrics
+from src.infrastructure.db.pool import InstrumentedQueuePool, PoolSettings, get_pool_metrics
+
+
+class TestPoolSettings:
+    def test_defaults(self, monkeypatch):
+        for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT", "DB_POOL_RECYCLE", "DB_POOL_PRE_PING"):
+            monkeypatch.delenv(name, raising=False)
+
+        assert PoolSettings.from_env() == PoolSettings(size=5, max_overflow=10, timeout=30.0, recycle=1800, pre_ping=True)
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "5")
+        monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+        settings = PoolSettings.from_env()
+
+        assert settings == PoolSettings(size=3, max_overflow=2, timeout=5.0, recycle=600, pre_ping=False)
+        assert settings.describe() == "pool_size=3 max_overflow=2 timeout=5s recycle=600s pre_ping=False"
+
+
+class TestPoolMetrics:
+    @pytest.fixture
+    def pool_engine(self, tmp_path):
+        settings = PoolSettings(size=1, max_overflow=1, timeout=0.05, recycle=-1, pre_ping=True)
+        engine = create_engine(f"sqlite:///{tmp_path}/pool.db", **settings.engine_kwargs())
+        metrics = get_pool_metrics()
+        metrics.attach(engine)
+        metrics.reset()
+        yield engine, metrics
+        engine.dispose()
+
+    def test_in_use_overflow_and_timeouts(self, pool_engine):
+        engine, metrics = pool_engine
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+
+        first = engine.connect()
+        second = engine.connect()  # beyond pool_size -> overflow connection
+        first.execute(text("SELECT 1"))
+        assert metrics.stats()["in_use"] == 2
+        assert metrics.stats()["overflow_in_use"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        first.close()
+        second.close()
+
+        stats = metrics.stats()
+        assert stats["in_use"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["connections_opened"] == 2
+        assert stats["overflow_opened"] == 1
+        assert stats["checkout_timeouts"] == 1
+        # The timed-out checkout waited at least pool_timeout
+        assert stats["checkout_wait_count"] == 3
+        assert stats["checkout_wait_max_seconds"] >= 0.05
+
+    def test_exported_to_prometheus(self, pool_engine):
+        engine, metrics = pool_engine
+        with engine.connect(), engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            body = get_request_metrics().render()
+
+        assert "db_pool_connections_in_use 2" in body
+        assert "db_pool_overflow_in_use 1" in body
+        assert "db_pool_checkout_timeouts_total 1" in body
+        assert 'db_pool_checkout_wait_seconds_bucket{le="+Inf"} 3' in body
+        assert "db_pool_checkout_wait_seconds_count 3" in body
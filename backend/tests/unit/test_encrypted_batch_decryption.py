@@ -0,0 +1,124 @@
+"""
+EncryptedString bulk decryption: list endpoints decrypt a page lazily and in one batch.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import update
+
+from src.domain.glucose_models import GlucoseCreateRequest, GlucoseType
+from src.infrastructure.db import types
+from src.infrastructure.db.models import GlucoseMeasurementModel, PatientModel, UserModel
+from src.infrastructure.repositories.glucose_repository import GlucoseRepository
+from src.infrastructure.security.crypto import CryptoService, get_crypto_service
+
+
+@pytest.fixture
+def crypto(monkeypatch):
+    monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    get_crypto_service.cache_clear()
+    yield get_crypto_service()
+    get_crypto_service.cache_clear()
+
+
+@pytest.fixture
+def patient(db_session):
+    user = UserModel(email=f"crypt_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    patient = PatientModel(guardian_id=user.id, display_name="Crypt", role="DEPENDENT")
+    db_session.add(patient)
+    db_session.flush()
+    return patient
+
+
+def test_history_notes_are_decrypted_once_per_page_on_first_read(db_session, crypto, patient):
+    start = datetime(2026, 3, 1, 8, 0)
+    patient_id = patient.id
+    repo = GlucoseRepository(db_session)
+    repo.bulk_create_measurements(patient_id, [
+        GlucoseCreateRequest(value=100 + i, timestamp=start + timedelta(minutes=5 * i),
+                             measurement_type=GlucoseType.CGM, notes=f"nota {i}")
+        for i in range(5)
+    ])
+    db_session.expunge_all()
+
+    with patch.object(CryptoService, "decrypt", autospec=True, side_effect=CryptoService.decrypt) as decrypt:
+        history = repo.get_history(patient_id, limit=10)
+        assert decrypt.call_count == 0
+
+        assert history[0].notes == "nota 4"
+        assert decrypt.call_count == 5
+
+        assert [m.notes for m in history] == [f"nota {i}" for i in range(4, -1, -1)]
+        assert decrypt.call_count == 5
+
+
+def test_decrypt_many_keeps_order_on_the_pool(crypto, monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(types, "get_decrypt_executor", lambda: executor)
+    monkeypatch.setattr(types, "PARALLEL_DECRYPT_MIN_ROWS", 4)
+    monkeypatch.setattr(types, "DECRYPT_CHUNK_ROWS", 3)
+
+    plain = [f"nota {i}" if i % 4 else None for i in range(20)]
+    tokens = [crypto.encrypt(value) if value is not None else None for value in plain]
+    try:
+        assert types.decrypt_many(tokens) == plain
+    finally:
+        executor.shutdown()
+
+
+def test_decrypt_many_keeps_legacy_fallbacks(crypto):
+    assert types.decrypt_many([None, "texto plano", b"sin cifrar"]) == [None, "texto plano", "sin cifrar"]
+
+
+def test_history_without_notes_skips_the_encrypted_column(db_session, crypto, patient, count_statements):
+    patient_id = patient.id
+    repo = GlucoseRepository(db_session)
+    repo.bulk_create_measurements(patient_id, [
+        GlucoseCreateRequest(value=110, measurement_type=GlucoseType.CGM, notes="nota")
+    ])
+
+    with count_statements() as counter:
+        history = repo.get_history(patient_id, include_notes=False)
+
+    assert [m.glucose_value for m in history] == [110]
+    assert not hasattr(history[0], "notes")
+    assert "notes" not in counter.statements[0]
+
+
+def test_expired_entity_reloads_notes_instead_of_the_page_batch(db_session, crypto, patient):
+    patient_id = patient.id
+    repo = GlucoseRepository(db_session)
+    repo.bulk_create_measurements(patient_id, [
+        GlucoseCreateRequest(value=120, measurement_type=GlucoseType.CGM, notes="antes")
+    ])
+    db_session.expunge_all()
+
+    [measurement] = repo.get_history(patient_id)
+    db_session.execute(
+        update(GlucoseMeasurementModel).where(GlucoseMeasurementModel.id == measurement.id).values(notes="después")
+    )
+    db_session.expire(measurement)
+
+    assert measurement.notes == "después"
+
+
+def test_written_notes_win_over_the_page_batch(db_session, crypto, patient):
+    patient_id = patient.id
+    repo = GlucoseRepository(db_session)
+    repo.bulk_create_measurements(patient_id, [
+        GlucoseCreateRequest(value=130, measurement_type=GlucoseType.CGM, notes="original")
+    ])
+    db_session.expunge_all()
+
+    [measurement] = repo.get_history(patient_id)
+    measurement.notes = "editada"
+    db_session.flush()
+    db_session.expunge_all()
+
+    assert repo.get_history(patient_id)[0].notes == "editada"
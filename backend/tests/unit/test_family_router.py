@@ -219,3 +219,17 @@ def test_get_patient_details(client):
     assert details["display_name"] == "Detail Test"
     assert details["diabetes_type"] == "T2"
     assert details["carb_ratio"] == 8.0
+
+def test_get_patient_details_query_budget(client, query_budget):
+    create_resp = client.post("/api/v1/family/members", json={
+        "display_name": "Budget Test", "role": "DEPENDENT", "diabetes_type": "T1", "carb_ratio": 10.0,
+    })
+    assert create_resp.status_code == 200, create_resp.text
+    pid = create_resp.json()["id"]
+
+    # Patient and health profile in one statement (no lazy load of patient.health_profile)
+    with query_budget(max_queries=1):
+        get_resp = client.get(f"/api/v1/family/members/{pid}")
+
+    assert get_resp.status_code == 200
+    assert get_resp.json()["carb_ratio"] == 10.0
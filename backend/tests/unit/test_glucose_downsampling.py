@@ -0,0 +1,68 @@
+"""
+LTTB downsampling of glucose traces: streamed and in-memory results, excursions kept.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.domain.glucose_downsampling import LTTBDownsampler, lttb
+
+BASE_TS = datetime(2026, 5, 1)
+
+
+def _trace(n, seed=3):
+    rng = random.Random(seed)
+    return [(BASE_TS + timedelta(minutes=5 * i), 110 + rng.randint(-15, 15)) for i in range(n)]
+
+
+class TestLTTB:
+    @pytest.mark.parametrize("n, threshold", [(8640, 300), (1000, 3), (302, 300), (50, 10)])
+    def test_keeps_first_last_and_threshold_points_in_order(self, n, threshold):
+        trace = _trace(n)
+        out = lttb(trace, threshold)
+
+        assert len(out) == threshold
+        assert out[0] == trace[0] and out[-1] == trace[-1]
+        assert [p[0] for p in out] == sorted(p[0] for p in out)
+        assert set(out) <= set(trace)
+
+    def test_short_trace_passes_through(self):
+        trace = _trace(120)
+        assert lttb(trace, 300) == trace
+
+    def test_keeps_hypo_and_hyper_excursions(self):
+        trace = _trace(8640)
+        # One 5-minute dip and one 15-minute spike in a flat 30-day trace
+        trace[1234] = (trace[1234][0], 48)
+        for i in range(6000, 6003):
+            trace[i] = (trace[i][0], 290)
+
+        values = [v for _, v in lttb(trace, 300)]
+
+        assert 48 in values and 290 in values
+
+    def test_streaming_matches_in_memory_and_holds_two_buckets(self):
+        trace = _trace(8640)
+        sampler = LTTBDownsampler(len(trace), 300)
+        streamed, peak = [], 0
+        for point in trace:
+            streamed += sampler.add(point)
+            peak = max(peak, len(sampler._pending) + len(sampler._filling))
+        streamed += sampler.finish()
+
+        assert streamed == lttb(trace, 300)
+        assert peak <= 2 * (len(trace) // 298 + 1)
+
+    def test_stale_count_still_ends_with_the_last_reading(self):
+        # A reading inserted between the count and the fetch joins the last bucket
+        trace = _trace(1001)
+        sampler = LTTBDownsampler(1000, 100)
+        out = [p for point in trace for p in sampler.add(point)] + sampler.finish()
+
+        assert len(out) == 100
+        assert out[-1] == trace[-1]
+
+    def test_threshold_below_three_is_rejected(self):
+        with pytest.raises(ValueError):
+            LTTBDownsampler(100, 2)
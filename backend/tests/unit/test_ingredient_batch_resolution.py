@@ -0,0 +1,75 @@
+"""
+Resolución de ingredientes en lote: execute_calculate_bolus y execute_log_meal
+deben lanzar un número constante de consultas, independiente del nº de items.
+"""
+from uuid import uuid4
+
+import pytest
+
+from src.application.repositories.nutrition_repository import NutritionRepository
+from src.application.use_cases.calculate_bolus import execute_calculate_bolus
+from src.application.use_cases.log_meal import execute_log_meal
+from src.infrastructure.db.models import IngredientModel, PatientModel
+
+
+def _ingredients(db_session, n):
+    items = [
+        IngredientModel(name=f"Ingrediente {uuid4().hex[:8]}", glycemic_index=50, carbs_per_100g=10.0, fiber_per_100g=0.0)
+        for _ in range(n)
+    ]
+    db_session.add_all(items)
+    db_session.flush()
+    return [{"ingredient_id": i.id, "weight_grams": 100} for i in items]
+
+
+def _patient_id(db_session):
+    patient = PatientModel(guardian_id=uuid4(), display_name="Paciente", role="DEPENDENT")
+    db_session.add(patient)
+    db_session.flush()
+    return patient.id
+
+
+class TestGetIngredientsByIds:
+    def test_returns_mapping_and_skips_unknown_ids(self, db_session):
+        items = _ingredients(db_session, 3)
+        ids = [i["ingredient_id"] for i in items]
+        repo = NutritionRepository(db_session)
+
+        found = repo.get_ingredients_by_ids(ids + [uuid4()])
+        assert set(found) == set(ids)
+
+    def test_empty_input_issues_no_query(self, db_session, count_statements):
+        repo = NutritionRepository(db_session)
+        with count_statements() as counter:
+            assert repo.get_ingredients_by_ids([]) == {}
+        assert counter.count == 0
+
+
+class TestConstantQueryCount:
+    @pytest.mark.parametrize("n_items", [1, 12])
+    def test_calculate_bolus_single_query(self, db_session, count_statements, n_items):
+        items = _ingredients(db_session, n_items)
+        repo = NutritionRepository(db_session)
+
+        with count_statements() as counter:
+            result = execute_calculate_bolus(
+                current_glucose=100, target_glucose=100, icr=10, isf=50,
+                ingredients_input=items, repo=repo,
+            )
+        assert result["total_carbs_grams"] == pytest.approx(10.0 * n_items)
+        assert counter.count == 1
+
+    def test_log_meal_query_count_does_not_grow(self, db_session, count_statements):
+        patient_id = _patient_id(db_session)
+        repo = NutritionRepository(db_session)
+
+        counts = []
+        for n_items in (1, 12):
+            items = _ingredients(db_session, n_items)
+            with count_statements() as counter:
+                meal = execute_log_meal(patient_id=patient_id, ingredients_input=items, notes=None, repo=repo)
+            assert len(meal.items) == n_items
+            counts.append(counter.count)
+        # Sólo la lectura de ingredientes depende de la petición; las escrituras de items
+        # se agrupan en el flush (insertmanyvalues), así que el total no crece con N.
+        assert counts[0] == counts[1]
@@ -0,0 +1,196 @@
+"""
+Tests del catálogo de ingredientes en memoria (índice de trigramas).
+"""
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+from src.application.repositories.nutrition_repository import NutritionRepository
+from src.infrastructure.cache.ingredient_catalog import IngredientCatalog
+from src.infrastructure.db.models import IngredientModel
+
+
+def _add(db_session, name, gi=50, carbs=20.0):
+    ingredient = IngredientModel(name=name, glycemic_index=gi, carbs_per_100g=carbs, fiber_per_100g=0.0)
+    db_session.add(ingredient)
+    db_session.flush()
+    return ingredient
+
+
+class TestIngredientCatalogSearch:
+    def test_substring_match_is_case_insensitive(self, db_session):
+        _add(db_session, "Arroz blanco cocido")
+        _add(db_session, "Pan blanco")
+        catalog = IngredientCatalog()
+
+        names = [i.name for i in catalog.search(db_session, "BLANCO")]
+        assert set(names) == {"Arroz blanco cocido", "Pan blanco"}
+
+    def test_prefix_matches_rank_first(self, db_session):
+        _add(db_session, "Zumo de pan")
+        _add(db_session, "Pan integral de centeno")
+        _add(db_session, "Pan")
+        catalog = IngredientCatalog()
+
+        names = [i.name for i in catalog.search(db_session, "pan")]
+        # Prefijo del nombre, más corto (más similar) primero; luego prefijo de palabra
+        assert names == ["Pan", "Pan integral de centeno", "Zumo de pan"]
+
+    def test_two_character_query(self, db_session):
+        _add(db_session, "Kiwi")
+        catalog = IngredientCatalog()
+
+        assert [i.name for i in catalog.search(db_session, "ki")] == ["Kiwi"]
+
+    def test_no_match_returns_empty(self, db_session):
+        _add(db_session, "Manzana")
+        catalog = IngredientCatalog()
+
+        assert catalog.search(db_session, "xyz") == []
+
+    def test_limit_is_respected(self, db_session):
+        for i in range(30):
+            _add(db_session, f"Galleta {i:02d}")
+        catalog = IngredientCatalog()
+
+        assert len(catalog.search(db_session, "galleta", limit=5)) == 5
+
+
+class TestIngredientCatalogCaching:
+    def test_warm_catalog_does_not_query_database(self, db_session, count_statements):
+        _add(db_session, "Lentejas")
+        catalog = IngredientCatalog()
+        catalog.load(db_session)
+
+        with count_statements() as counter:
+            results = catalog.search(db_session, "lente")
+
+        assert [r.name for r in results] == ["Lentejas"]
+        assert counter.count == 0
+
+    def test_ttl_expiry_reloads(self, db_session):
+        now = [0.0]
+        catalog = IngredientCatalog(ttl_seconds=10, clock=lambda: now[0])
+        catalog.load(db_session)
+        _add(db_session, "Garbanzos")
+
+        assert catalog.search(db_session, "garban") == []
+        now[0] = 11.0
+        assert [r.name for r in catalog.search(db_session, "garban")] == ["Garbanzos"]
+
+    def test_repository_writes_invalidate_catalog(self, db_session):
+        catalog = IngredientCatalog()
+        repo = NutritionRepository(db_session, catalog=catalog)
+        assert repo.search_ingredients("quinoa") == []
+
+        repo.create_ingredient(name="Quinoa cocida", glycemic_index=53, carbs_per_100g=21.3)
+        assert [r.name for r in repo.search_ingredients("quinoa")] == ["Quinoa cocida"]
+
+        repo.bulk_create_ingredients([
+            {"name": "Quinoa inflada", "glycemic_index": 70, "carbs_per_100g": 70.0, "fiber_per_100g": 5.0},
+        ])
+        assert {r.name for r in repo.search_ingredients("quinoa")} == {"Quinoa cocida", "Quinoa inflada"}
+
+    def test_results_are_detached_from_session(self, db_session):
+        ingredient = _add(db_session, "Yogur natural")
+        catalog = IngredientCatalog()
+
+        [result] = catalog.search(db_session, "yogur")
+        db_session.expunge_all()
+        assert result.id == ingredient.id
+        assert result.carbs_per_100g == 20.0
+
+
+class _GatedSessions:
+    """Fábrica de AsyncSession cuya carga del catálogo espera a `gate` (recarga en curso)."""
+
+    def __init__(self, factory, gate: asyncio.Event):
+        self.factory, self.gate, self.loads, self.closed = factory, gate, 0, 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        async with self.factory() as session:
+            scalars = session.scalars
+
+            async def gated_scalars(stmt):
+                self.loads += 1
+                await self.gate.wait()
+                return await scalars(stmt)
+
+            session.scalars = gated_scalars
+            try:
+                yield session
+            finally:
+                self.closed += 1
+
+
+class TestIngredientCatalogAsync:
+    def test_concurrent_cold_searches_share_one_off_loop_build(self, async_session_factory, db_session):
+        _add(db_session, "Lentejas pardinas")
+        build_threads = []
+
+        async def scenario():
+            gate = asyncio.Event()
+            sessions = _GatedSessions(async_session_factory, gate)
+            catalog = IngredientCatalog(session_factory=sessions)
+            publish = catalog._publish
+            catalog._publish = lambda *args: build_threads.append(threading.current_thread()) or publish(*args)
+            searches = [asyncio.ensure_future(catalog.search_async("lente")) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            gate.set()
+            results = await asyncio.gather(*searches)
+            return sessions.loads, results
+
+        loads, results = asyncio.run(scenario())
+
+        assert loads == 1
+        assert all([r.name for r in found] == ["Lentejas pardinas"] for found in results)
+        assert len(build_threads) == 1 and build_threads[0] is not threading.main_thread()
+
+    def test_expired_snapshot_is_served_while_one_request_reloads(self, async_session_factory, db_session):
+        now = [0.0]
+        _add(db_session, "Lentejas pardinas")
+
+        async def scenario():
+            gate = asyncio.Event()
+            sessions = _GatedSessions(async_session_factory, gate)
+            catalog = IngredientCatalog(ttl_seconds=10, clock=lambda: now[0], session_factory=sessions)
+            catalog.load(db_session)
+            _add(db_session, "Garbanzos")
+            now[0] = 11.0
+            reloading = asyncio.ensure_future(catalog.search_async("garban"))
+            await asyncio.sleep(0.01)
+            # Otra petición durante la recarga: instantánea anterior, sin esperar ni recargar
+            stale = await catalog.search_async("garban")
+            gate.set()
+            return stale, await reloading, sessions.loads
+
+        stale, fresh, loads = asyncio.run(scenario())
+
+        assert stale == []
+        assert [r.name for r in fresh] == ["Garbanzos"]
+        assert loads == 1
+
+    def test_reload_outlives_the_cancelled_request_on_its_own_session(self, async_session_factory, db_session):
+        _add(db_session, "Lentejas pardinas")
+
+        async def scenario():
+            gate = asyncio.Event()
+            sessions = _GatedSessions(async_session_factory, gate)
+            catalog = IngredientCatalog(session_factory=sessions)
+            request = asyncio.ensure_future(catalog.search_async("lente"))
+            await asyncio.sleep(0.01)
+            # La petición que lanzó la recarga se cancela (cliente desconectado)
+            request.cancel()
+            await asyncio.sleep(0)
+            gate.set()
+            while catalog._refresh is not None:
+                await asyncio.sleep(0.01)
+            return catalog, request.cancelled(), sessions
+
+        catalog, cancelled, sessions = asyncio.run(scenario())
+
+        assert cancelled
+        assert catalog.is_loaded
+        assert sessions.loads == 1 and sessions.closed == 1
+        assert [r.name for r in catalog.search(db_session, "lente")] == ["Lentejas pardinas"]
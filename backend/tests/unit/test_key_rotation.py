@@ -0,0 +1,138 @@
+"""
+Encryption key rotation: MultiFernet reads and the resumable re-encryption job.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import LargeBinary, select, type_coerce, update
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.db.models import GlucoseMeasurementModel, KeyRotationCheckpointModel, PatientModel, UserModel
+from src.infrastructure.security.crypto import CryptoService, get_crypto_service
+from src.infrastructure.security.key_rotation import ReencryptionJob
+
+OLD_KEY = Fernet.generate_key().decode()
+NEW_KEY = Fernet.generate_key().decode()
+
+
+@pytest.fixture
+def use_keys(monkeypatch):
+    def activate(primary, retired=""):
+        monkeypatch.setenv("ENCRYPTION_KEY", primary)
+        monkeypatch.setenv("ENCRYPTION_KEYS_RETIRED", retired)
+        get_crypto_service.cache_clear()
+        return get_crypto_service()
+    yield activate
+    get_crypto_service.cache_clear()
+
+
+@pytest.fixture
+def old_readings(db_session, use_keys):
+    """Six glucose notes written under OLD_KEY, plus one legacy plaintext value."""
+    use_keys(OLD_KEY)
+    user = UserModel(email=f"rot_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    patient = PatientModel(guardian_id=user.id, display_name="Rot", role="DEPENDENT")
+    db_session.add(patient)
+    db_session.flush()
+    start = datetime(2026, 3, 1)
+    db_session.add_all(
+        GlucoseMeasurementModel(patient_id=patient.id, glucose_value=100, measurement_type="CGM",
+                                timestamp=start + timedelta(minutes=5 * i), notes=f"nota {i}")
+        for i in range(6)
+    )
+    db_session.add(GlucoseMeasurementModel(patient_id=patient.id, glucose_value=100, measurement_type="FINGER",
+                                           timestamp=start, notes=None))
+    db_session.commit()
+    return patient.id
+
+
+def _ciphertexts(db_session):
+    raw = type_coerce(GlucoseMeasurementModel.notes, LargeBinary)
+    return [t for t in db_session.scalars(select(raw)) if t is not None]
+
+
+def _job(db_session, **kwargs):
+    factory = sessionmaker(bind=db_session.get_bind())
+    return ReencryptionJob(factory, chunk_size=3, **kwargs)
+
+
+def test_retired_key_still_decrypts_and_new_writes_use_primary():
+    token = CryptoService(OLD_KEY).encrypt("dato")
+    crypto = CryptoService(NEW_KEY, [OLD_KEY])
+
+    assert crypto.decrypt(token) == "dato"
+    assert not crypto.is_primary(token)
+    assert crypto.is_primary(crypto.encrypt("dato"))
+    assert CryptoService(NEW_KEY).decrypt(crypto.rotate(token)) == "dato"
+
+
+def test_job_rotates_only_old_values_and_reports_progress(db_session, use_keys, old_readings):
+    crypto = use_keys(NEW_KEY, OLD_KEY)
+    reports = []
+
+    (result,) = _job(db_session, on_progress=reports.append).run(["glucose_measurements"])
+
+    assert result.done and result.rows_scanned == 7 and result.rows_rotated == 6
+    assert [p.rows_remaining for p in reports] == [4, 1, 0]
+    assert all(crypto.is_primary(t) for t in _ciphertexts(db_session))
+    new_only = CryptoService(NEW_KEY)
+    assert sorted(new_only.decrypt(t) for t in _ciphertexts(db_session)) == [f"nota {i}" for i in range(6)]
+
+    # A finished table is not walked again for the same primary key
+    (again,) = _job(db_session).run(["glucose_measurements"])
+    assert again.done and again.rows_scanned == 7
+
+
+def test_job_resumes_from_checkpoint_after_a_crash(db_session, use_keys, old_readings):
+    use_keys(NEW_KEY, OLD_KEY)
+
+    def crash(progress):
+        raise RuntimeError("worker killed")
+
+    with pytest.raises(RuntimeError):
+        _job(db_session, on_progress=crash).run(["glucose_measurements"])
+
+    checkpoint = db_session.scalars(select(KeyRotationCheckpointModel)).one()
+    assert checkpoint.rows_scanned == 3 and checkpoint.completed_at is None
+
+    (result,) = _job(db_session).run(["glucose_measurements"])
+    assert result.done and result.rows_scanned == 7 and result.rows_rotated == 6
+
+
+def test_values_rewritten_by_the_api_are_skipped_not_counted(db_session, use_keys, old_readings, monkeypatch):
+    use_keys(NEW_KEY, OLD_KEY)
+    job = _job(db_session)
+    table = GlucoseMeasurementModel.__table__
+    first = db_session.scalar(select(table.c.id).where(table.c.notes.is_not(None)).order_by(table.c.id))
+    real_rotate, raced = job.crypto.rotate, []
+
+    def rotate_while_the_api_writes(token):
+        if not raced:  # the API updates the note after the job read the chunk
+            raced.append(db_session.execute(update(table).where(table.c.id == first).values(notes="editada")))
+        return real_rotate(token)
+
+    monkeypatch.setattr(job.crypto, "rotate", rotate_while_the_api_writes)
+    (result,) = job.run(["glucose_measurements"])
+
+    assert result.rows_rotated == 5 and result.rows_skipped == 1
+    assert db_session.get(GlucoseMeasurementModel, first).notes == "editada"
+
+def test_unknown_key_values_are_left_untouched(db_session, use_keys, old_readings):
+    use_keys(NEW_KEY)  # OLD_KEY not configured: nothing can be rotated
+
+    (result,) = _job(db_session).run(["glucose_measurements"])
+
+    assert result.done and result.rows_rotated == 0 and result.rows_unreadable == 6
+
+
+def test_throttle_sleeps_to_the_configured_rate(db_session, use_keys, old_readings):
+    use_keys(NEW_KEY, OLD_KEY)
+    sleeps = []
+
+    _job(db_session, max_rows_per_second=3, clock=lambda: 0.0, sleep=sleeps.append).run(["glucose_measurements"])
+
+    assert sleeps == [1.0, 2.0]
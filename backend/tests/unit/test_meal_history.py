@@ -176,8 +176,9 @@ class TestGetMealHistory:
 
     def test_returns_empty_list_for_new_patient(self, client, db_session):
         """A patient with no meals should receive an empty list."""
-        patient_id = _create_patient(db_session)
-        response = client.get(f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20&offset=0")
+        user, patient_id = _create_user_and_patient(db_session)
+        response = client.get(f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20&offset=0",
+                              headers=_get_auth_headers(client, user))
         assert response.status_code == 200, response.text
         assert response.json() == []
 
@@ -202,7 +203,7 @@ class TestGetMealHistory:
         client.post("/api/v1/nutrition/meals", json=payload_2, headers=headers)
 
         response = client.get(
-            f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20&offset=0"
+            f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=20&offset=0", headers=headers
         )
         assert response.status_code == 200, response.text
 
@@ -228,7 +229,7 @@ class TestGetMealHistory:
             }, headers=headers)
 
         response = client.get(
-            f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=3&offset=0"
+            f"/api/v1/nutrition/meals/history?patient_id={patient_id}&limit=3&offset=0", headers=headers
         )
         assert response.status_code == 200
         assert len(response.json()) == 3
@@ -236,7 +237,7 @@ class TestGetMealHistory:
     def test_history_filters_by_start_date(self, client, db_session):
         """Meals before start_date must be excluded."""
         from datetime import datetime, timezone
-        patient_id = _create_patient(db_session)
+        user, patient_id = _create_user_and_patient(db_session)
 
         # Create meal directly in DB with a specific timestamp
         old_meal = MealLogModel(
@@ -258,7 +259,8 @@ class TestGetMealHistory:
 
         response = client.get(
             f"/api/v1/nutrition/meals/history?patient_id={patient_id}"
-            f"&start_date=2026-01-01T00:00:00Z"
+            f"&start_date=2026-01-01T00:00:00Z",
+            headers=_get_auth_headers(client, user),
         )
         assert response.status_code == 200
         meals = response.json()
@@ -268,7 +270,7 @@ class TestGetMealHistory:
     def test_history_filters_by_end_date(self, client, db_session):
         """Meals after end_date must be excluded."""
         from datetime import datetime, timezone
-        patient_id = _create_patient(db_session)
+        user, patient_id = _create_user_and_patient(db_session)
 
         old_meal = MealLogModel(
             patient_id=patient_id,
@@ -289,7 +291,8 @@ class TestGetMealHistory:
 
         response = client.get(
             f"/api/v1/nutrition/meals/history?patient_id={patient_id}"
-            f"&end_date=2025-12-31T23:59:59Z"
+            f"&end_date=2025-12-31T23:59:59Z",
+            headers=_get_auth_headers(client, user),
         )
         assert response.status_code == 200
         meals = response.json()
@@ -0,0 +1,50 @@
+"""
+PasswordHasher: bcrypt on a bounded pool, with queue-depth accounting.
+"""
+import asyncio
+import threading
+
+from src.infrastructure.security.password_hasher import PasswordHasher, verify_password_sync
+
+
+def test_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(max_workers=2)
+
+    async def run():
+        hashed = await hasher.hash("s3cret!")
+        return hashed, await hasher.verify("s3cret!", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        hashed, ok, bad = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert ok and not bad
+    assert verify_password_sync("s3cret!", hashed)
+    assert hasher.stats()["completed"] == 3
+
+
+def test_excess_requests_wait_in_queue():
+    hasher = PasswordHasher(max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(_):
+        started.set()
+        release.wait(5)
+        return True
+
+    async def run():
+        tasks = [asyncio.ensure_future(hasher._submit(blocking, i)) for i in range(3)]
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        snapshot = hasher.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    try:
+        snapshot = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert snapshot["in_flight"] == 1
+    assert snapshot["queue_depth"] == 2
+    assert hasher.stats() == {"workers": 1, "queue_depth": 0, "in_flight": 0, "completed": 3}
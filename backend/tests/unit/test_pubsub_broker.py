@@ -0,0 +1,118 @@
+"""
+In-process broker fan-out and the PostgreSQL backend's local fallbacks (no server needed).
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.infrastructure.pubsub import broker as broker_module
+from src.infrastructure.pubsub.broker import PG_NOTIFY_CHANNEL, InProcessBroker, PostgresBroker, get_broker
+
+
+def test_delivers_to_every_subscriber_of_the_channel():
+    async def scenario():
+        broker = InProcessBroker()
+        a, b, other = broker.subscribe("glucose:1"), broker.subscribe("glucose:1"), broker.subscribe("glucose:2")
+
+        assert broker.deliver("glucose:1", "x") == 2
+        return await a.get(1), await b.get(1), await other.get(0.01)
+
+    assert asyncio.run(scenario()) == ("x", "x", None)
+
+
+def test_waiting_subscriber_wakes_on_publish():
+    async def scenario():
+        broker = InProcessBroker()
+        async with broker.subscribe("c") as subscription:
+            waiting = asyncio.ensure_future(subscription.get(5))
+            await asyncio.sleep(0)
+            await broker.publish("c", "hello")
+            return await waiting
+
+    assert asyncio.run(scenario()) == "hello"
+
+
+def test_slow_subscriber_keeps_the_newest_messages():
+    async def scenario():
+        broker = InProcessBroker(max_pending=3)
+        subscription = broker.subscribe("c")
+        for i in range(5):
+            broker.deliver("c", str(i))
+        return [await subscription.get(0.01) for _ in range(4)]
+
+    assert asyncio.run(scenario()) == ["2", "3", "4", None]
+
+
+def test_closing_unsubscribes():
+    async def scenario():
+        broker = InProcessBroker()
+        async with broker.subscribe("c"):
+            assert broker.subscriber_count() == 1
+        return broker.subscriber_count(), broker.deliver("c", "lost"), broker._channels
+
+    assert asyncio.run(scenario()) == (0, 0, {})
+
+
+def test_postgres_notification_is_delivered_locally():
+    async def scenario():
+        broker = PostgresBroker("postgresql://unused")
+        subscription = broker.subscribe("glucose:1")
+        broker._on_notify(None, 1, PG_NOTIFY_CHANNEL, json.dumps({"channel": "glucose:1", "message": "m"}))
+        return await subscription.get(1)
+
+    assert asyncio.run(scenario()) == "m"
+
+
+@pytest.mark.parametrize("message", ["small", "x" * 9000])
+def test_postgres_publish_falls_back_to_local_delivery(message):
+    """Not connected, or payload over the NOTIFY limit: this worker's subscribers still get it."""
+    class Connected:
+        executed = []
+
+        async def execute(self, *args):
+            self.executed.append(args)
+
+    async def scenario():
+        broker = PostgresBroker("postgresql://unused")
+        if len(message) > 8000:
+            broker._conn = Connected()
+        subscription = broker.subscribe("c")
+        await broker.publish("c", message)
+        return await subscription.get(1)
+
+    assert asyncio.run(scenario()) == message
+    assert Connected.executed == []
+
+
+def test_get_broker_selects_the_backend(monkeypatch):
+    try:
+        monkeypatch.setenv("PUBSUB_BACKEND", "postgres")
+        get_broker.cache_clear()
+        assert isinstance(get_broker(), PostgresBroker)
+
+        monkeypatch.setenv("PUBSUB_BACKEND", "kafka")
+        get_broker.cache_clear()
+        with pytest.raises(ValueError):
+            get_broker()
+    finally:
+        get_broker.cache_clear()
+
+
+@pytest.mark.parametrize("web_concurrency, logged", [("4", True), ("1", False), ("", False)])
+def test_memory_backend_with_several_workers_is_reported(monkeypatch, caplog, web_concurrency, logged):
+    try:
+        monkeypatch.setenv("PUBSUB_BACKEND", "memory")
+        monkeypatch.setenv("WEB_CONCURRENCY", web_concurrency)
+        get_broker.cache_clear()
+        with caplog.at_level("ERROR", logger=broker_module.__name__):
+            assert isinstance(get_broker(), InProcessBroker)
+    finally:
+        get_broker.cache_clear()
+
+    assert ("PUBSUB_BACKEND=postgres" in caplog.text) == logged
+
+
+def test_asyncpg_dsn_drops_the_sqlalchemy_driver():
+    url = "postgresql+psycopg2://app:s3cret@db:5432/diabeaty"
+    assert broker_module._asyncpg_dsn(url) == "postgresql://app:s3cret@db:5432/diabeaty"
@@ -0,0 +1,138 @@
+"""
+N+1 detection: statement fingerprints, origin stacks, the query budget and the dev middleware.
+"""
+import asyncio
+import logging
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.infrastructure.api import query_inspector
+from src.infrastructure.api.query_inspector import (
+    QueryBudgetExceeded,
+    QueryInspectorMiddleware,
+    fingerprint,
+)
+from src.infrastructure.db.models import HealthProfileModel, PatientModel, UserModel
+from src.infrastructure.db.xp_repository import AsyncXPRepository, XPRepository
+
+
+@pytest.fixture
+def patients(db_session):
+    user = UserModel(email=f"n1_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    for i in range(4):
+        patient = PatientModel(guardian_id=user.id, display_name=f"Kid {i}", role="DEPENDENT")
+        db_session.add(patient)
+        db_session.flush()
+        db_session.add(HealthProfileModel(patient_id=patient.id, diabetes_type="T1"))
+    db_session.commit()
+    db_session.expire_all()
+    return user
+
+
+class TestFingerprint:
+    def test_literals_and_parameters_are_normalized(self):
+        assert fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'O''Brien'") == \
+            fingerprint("SELECT *  FROM t\nWHERE id = 7 AND name = 'x'") == \
+            "SELECT * FROM t WHERE id = ? AND name = ?"
+
+    @pytest.mark.parametrize("bind", ["?", "%s", "%(id_1)s", ":id_1", "$1"])
+    def test_bind_styles(self, bind):
+        assert fingerprint(f"SELECT a FROM t WHERE id = {bind}") == "SELECT a FROM t WHERE id = ?"
+
+    def test_in_and_values_lists_collapse(self):
+        assert fingerprint("SELECT a FROM t WHERE id IN (?, ?, ?)") == fingerprint("SELECT a FROM t WHERE id IN (?)")
+        assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == \
+            "INSERT INTO t (a, b) VALUES (...)"
+
+    def test_identifiers_and_casts_are_kept(self):
+        assert fingerprint("SELECT t1.a FROM t1 WHERE t1.id = %(id)s::uuid") == "SELECT t1.a FROM t1 WHERE t1.id = ?::uuid"
+        assert fingerprint("SELECT a FROM t1") != fingerprint("SELECT a FROM t2")
+
+
+class TestQueryBudget:
+    def test_lazy_load_in_a_loop_is_flagged(self, db_session, patients, query_budget):
+        with pytest.raises(QueryBudgetExceeded, match="4x SELECT health_profiles"):
+            with query_budget():
+                for patient in db_session.scalars(select(PatientModel).where(PatientModel.guardian_id == patients.id)):
+                    patient.health_profile.diabetes_type
+
+    def test_reports_the_repository_call_stack(self, db_session, patients, query_budget):
+        repo = XPRepository(db_session)
+        with pytest.raises(QueryBudgetExceeded) as failure:
+            with query_budget():
+                for _ in range(3):
+                    repo.get_user_total_xp(patients.id)
+
+        message = str(failure.value)
+        assert "3x SELECT" in message
+        assert "xp_repository.py" in message and "in get_user_total_xp" in message
+
+    def test_reports_the_async_repository_call_stack(self, async_session_factory, patients, query_budget):
+        # The ORM runs in a child greenlet; the repository frame is on the awaiting parent
+        async def main():
+            async with async_session_factory() as session:
+                repo = AsyncXPRepository(session)
+                for _ in range(3):
+                    await repo.get_user_total_xp(patients.id)
+
+        with pytest.raises(QueryBudgetExceeded) as failure:
+            with query_budget():
+                asyncio.run(main())
+
+        assert "xp_repository.py" in str(failure.value)
+        assert "in get_user_total_xp" in str(failure.value)
+
+    def test_statement_budget(self, db_session, patients, query_budget):
+        with pytest.raises(QueryBudgetExceeded, match="2 statements, budget is 1"):
+            with query_budget(max_queries=1):
+                db_session.scalars(select(PatientModel)).all()
+                db_session.scalars(select(HealthProfileModel)).all()
+
+    def test_within_budget(self, db_session, patients, query_budget):
+        with query_budget(max_queries=1, max_repeats=1) as recorder:
+            db_session.scalars(select(PatientModel)).all()
+        assert recorder.count == 1
+        assert recorder.repeated(max_repeats=1) == []
+
+    def test_errors_inside_the_block_are_not_masked(self, query_budget):
+        with pytest.raises(KeyError):
+            with query_budget(max_queries=0):
+                raise KeyError("boom")
+
+
+class TestQueryInspectorMiddleware:
+    @pytest.fixture
+    def inspected_client(self, engine, db_session):
+        app = FastAPI()
+        app.add_middleware(QueryInspectorMiddleware, max_repeats=2)
+
+        def get_session():
+            yield db_session
+
+        @app.get("/patients/{guardian_id}")
+        def list_profiles(guardian_id: UUID, db: Session = Depends(get_session)):
+            patients = db.scalars(select(PatientModel).where(PatientModel.guardian_id == guardian_id)).all()
+            return [p.health_profile.diabetes_type for p in patients]
+
+        query_inspector.attach(engine)
+        try:
+            yield TestClient(app)
+        finally:
+            query_inspector.detach(engine)
+
+    def test_flags_n_plus_one_request(self, inspected_client, patients, caplog):
+        with caplog.at_level(logging.WARNING, logger=query_inspector.__name__):
+            resp = inspected_client.get(f"/patients/{patients.id.hex}")
+
+        assert resp.status_code == 200
+        assert resp.headers["X-Query-Count"] == "5"
+        [warning] = caplog.records
+        assert "N+1 in GET /patients/" in warning.getMessage()
+        assert "4x SELECT health_profiles" in warning.getMessage()
@@ -0,0 +1,84 @@
+"""
+STARTUP_MODE: schema verification against the Alembic head, and the startup metric.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+
+from src.infrastructure.db.schema import (
+    SchemaMismatchError,
+    StartupMode,
+    expected_heads,
+    prepare_schema,
+    startup_mode_from_env,
+)
+from src.main import app
+
+
+@pytest.fixture
+def blank_engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _stamp(engine, revision):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+class TestStartupMode:
+    def test_defaults_to_verify(self, monkeypatch):
+        monkeypatch.delenv("STARTUP_MODE", raising=False)
+        assert startup_mode_from_env() is StartupMode.VERIFY
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("STARTUP_MODE", " None ")
+        assert startup_mode_from_env() is StartupMode.NONE
+
+    def test_unknown_mode_is_rejected(self, monkeypatch):
+        monkeypatch.setenv("STARTUP_MODE", "create_all")
+        with pytest.raises(ValueError):
+            startup_mode_from_env()
+
+
+class TestPrepareSchema:
+    def test_verify_passes_at_head(self, blank_engine):
+        (head,) = expected_heads()
+        _stamp(blank_engine, head)
+        prepare_schema(blank_engine, StartupMode.VERIFY)
+
+    def test_verify_fails_on_unmigrated_database(self, blank_engine):
+        with pytest.raises(SchemaMismatchError, match="no revision"):
+            prepare_schema(blank_engine, StartupMode.VERIFY)
+
+    def test_verify_fails_behind_head(self, blank_engine):
+        _stamp(blank_engine, "016")
+        with pytest.raises(SchemaMismatchError, match="016"):
+            prepare_schema(blank_engine, StartupMode.VERIFY)
+
+    def test_migrate_creates_tables_on_sqlite(self, blank_engine):
+        prepare_schema(blank_engine, StartupMode.MIGRATE)
+        assert "glucose_measurements" in inspect(blank_engine).get_table_names()
+
+    def test_none_touches_nothing(self, blank_engine):
+        prepare_schema(blank_engine, StartupMode.NONE)
+        assert inspect(blank_engine).get_table_names() == []
+
+
+def test_startup_metric_endpoint(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.delattr(app.state, "startup", raising=False)
+    assert client.get("/health/startup").status_code == 404
+
+    startup = {"mode": "verify", "schema_seconds": 0.002, "catalog_seconds": 0.05, "total_seconds": 0.06}
+    monkeypatch.setattr(app.state, "startup", startup, raising=False)
+    assert client.get("/health/startup").json() == startup
+
+
+def test_expected_heads_match_alembic():
+    from alembic.script import ScriptDirectory
+    from src.infrastructure.db.schema import _alembic_config
+
+    assert expected_heads() == frozenset(ScriptDirectory.from_config(_alembic_config()).get_heads())
@@ -0,0 +1,92 @@
+"""
+Materialized XP balance: add_xp keeps user_xp_balance in sync with the
+ledger, the summary reads it by primary key, and reconciliation repairs drift.
+"""
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.db.models import UserModel, UserXPBalanceModel, XPTransactionModel
+from src.infrastructure.db.xp_repository import XPRepository
+
+
+@pytest.fixture
+def user(db_session):
+    user = UserModel(email=f"xp_{uuid4().hex[:6]}@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+class TestXPBalance:
+    def test_add_xp_updates_balance(self, db_session, user):
+        repo = XPRepository(db_session)
+        repo.add_xp(user.id, 10, "meal_logged", "Comida registrada")
+        repo.add_xp(user.id, 25, "daily_login", "Login")
+        repo.add_xp(user.id, -5, "manual_adjustment", "Ajuste")
+
+        balance = db_session.get(UserXPBalanceModel, user.id)
+        assert balance.total_xp == 30
+        assert repo.get_user_total_xp(user.id) == repo.get_ledger_total_xp(user.id) == 30
+
+    def test_user_without_xp_has_zero(self, db_session, user):
+        assert XPRepository(db_session).get_user_total_xp(user.id) == 0
+
+    def test_total_is_single_primary_key_read(self, db_session, user, count_statements):
+        repo = XPRepository(db_session)
+        for _ in range(5):
+            repo.add_xp(user.id, 10, "meal_logged", "Comida registrada")
+        user_id = user.id  # load the expired user outside the counted block
+
+        with count_statements() as counter:
+            assert repo.get_user_total_xp(user_id) == 50
+        assert counter.count == 1
+
+
+class TestReconcileBalances:
+    def test_reports_and_fixes_drift(self, db_session, user):
+        repo = XPRepository(db_session)
+        repo.add_xp(user.id, 100, "meal_logged", "Comida registrada")
+        # Ledger row written behind the repository's back
+        db_session.add(XPTransactionModel(user_id=user.id, amount=40, reason="manual_adjustment", description="Legacy"))
+        db_session.commit()
+
+        [drift] = repo.reconcile_balances(fix=False)
+        assert (drift.user_id, drift.stored_total, drift.ledger_total, drift.drift) == (user.id, 100, 140, -40)
+        assert repo.get_user_total_xp(user.id) == 100  # dry run leaves it untouched
+
+        repo.reconcile_balances(fix=True)
+        assert repo.get_user_total_xp(user.id) == 140
+        assert repo.reconcile_balances(fix=False) == []
+
+    def test_missing_balance_row_is_rebuilt(self, db_session, user):
+        db_session.add(XPTransactionModel(user_id=user.id, amount=75, reason="daily_login", description="Legacy"))
+        db_session.commit()
+        repo = XPRepository(db_session)
+
+        [drift] = repo.reconcile_balances()
+        assert drift.stored_total is None
+        assert repo.get_user_total_xp(user.id) == 75
+
+    def test_fix_locks_balances_before_reading_the_ledger(self, db_session, user, monkeypatch):
+        """On PostgreSQL: an add_xp committing during the run cannot be overwritten."""
+        repo = XPRepository(db_session)
+        repo.add_xp(user.id, 10, "meal_logged", "Comida registrada")
+        monkeypatch.setattr(db_session.get_bind().dialect, "name", "postgresql")
+        executed = []
+        execute = db_session.execute
+
+        def record(stmt, *args, **kwargs):
+            executed.append(str(stmt))
+            if executed[-1].startswith("LOCK TABLE"):
+                return None  # not on SQLite
+            return execute(stmt, *args, **kwargs)
+
+        monkeypatch.setattr(db_session, "execute", record)
+
+        repo.reconcile_balances(fix=False)
+        assert not [s for s in executed if s.startswith("LOCK")]
+        executed.clear()
+
+        repo.reconcile_balances(fix=True)
+        assert executed[0] == "LOCK TABLE user_xp_balance IN SHARE ROW EXCLUSIVE MODE"
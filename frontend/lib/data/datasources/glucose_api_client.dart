@@ -22,5 +22,7 @@ abstract class GlucoseApiClient {
     @Query('offset') int offset,
     @Query('start_date') int? startDate,
     @Query('end_date') int? endDate,
+    // 'notes' to receive the decrypted notes (the API omits them otherwise)
+    @Query('include') String? include,
   );
 }
@@ -57,6 +57,7 @@ class _GlucoseApiClient implements GlucoseApiClient {
     int offset,
     int? startDate,
     int? endDate,
+    String? include,
   ) async {
     final _extra = <String, dynamic>{};
     final queryParameters = <String, dynamic>{
@@ -65,6 +66,7 @@ class _GlucoseApiClient implements GlucoseApiClient {
       r'offset': offset,
       r'start_date': startDate,
       r'end_date': endDate,
+      r'include': include,
     };
     queryParameters.removeWhere((k, v) => v == null);
     final _headers = <String, dynamic>{};
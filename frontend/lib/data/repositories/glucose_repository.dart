@@ -32,6 +32,8 @@ class GlucoseRepository {
       offset,
       startDate?.millisecondsSinceEpoch,
       endDate?.millisecondsSinceEpoch,
+      // The history screen shows notes
+      'notes',
     );
   }
 }